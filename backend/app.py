@@ -1,20 +1,34 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
+import asyncio
+import threading
 from contextlib import asynccontextmanager
-from apscheduler.schedulers.background import BackgroundScheduler
-from openai import OpenAI
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 # Load environment variables FIRST to ensure they are available for singletons
 load_dotenv()
 
 # --- APScheduler Background Tasks ---
-scheduler = BackgroundScheduler()
+# AsyncIO scheduler: the field state jobs use Motor on the app's event loop;
+# plain functions (WhatsApp briefing) still run in its thread pool.
+scheduler = AsyncIOScheduler()
+
+# Startup tasks; the event loop only keeps weak references to tasks
+background_tasks = set()
+
+
+def _finish_background_task(task: asyncio.Task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background task {task.get_name()} failed: {task.exception()!r}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize NVIDIA Client globally on app state
+    from openai import OpenAI
     NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY", "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")
     app.state.nvidia_client = OpenAI(
         base_url="https://integrate.api.nvidia.com/v1",
@@ -23,15 +37,33 @@ async def lifespan(app: FastAPI):
     # Initialize 40-RPM cache shield globally
     app.state.ai_reasoning_cache = {}
     
+    # Load ML models in the background; auth and ingestion serve meanwhile
+    # and /ready reports progress. Model routes load on demand if called first.
+    from services.ai_pipeline_service import ai_pipeline
+    threading.Thread(target=ai_pipeline.warm_up, name="model-warmup", daemon=True).start()
+    
     # Start background scheduler
     scheduler.start()
     from services.whatsapp_worker import schedule_whatsapp_briefings
     schedule_whatsapp_briefings(scheduler)
+    from services.field_state import schedule_field_state_precompute
+    schedule_field_state_precompute(scheduler)
+    from services.weather_history import schedule_weather_history_backfill
+    schedule_weather_history_backfill(scheduler)
+    
+    # Resolve farmer locations once so request paths skip geocoding
+    from services.geocode_cache import prewarm_geocode_cache
+    task = asyncio.create_task(prewarm_geocode_cache(), name="geocode-prewarm")
+    background_tasks.add(task)
+    task.add_done_callback(_finish_background_task)
     
     yield
     scheduler.shutdown()
+    from services.inference_executor import inference_executor
+    inference_executor.shutdown()
 
-from routes import auth, farmers, fields, sensors, ai, weather, advisories, community, market, dashboard, actions, webhook
+from services.inference_executor import InferenceOverloadedError, InferenceTimeoutError
+from routes import auth, farmers, fields, sensors, ai, weather, advisories, community, market, dashboard, actions, webhook, admin
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -71,6 +103,17 @@ app.include_router(community.router, prefix="/api/community", tags=["Community"]
 app.include_router(market.router, prefix="/api/market", tags=["Market"])
 app.include_router(actions.router, prefix="/api/action", tags=["Actions"])
 app.include_router(webhook.router, prefix="/api/webhook", tags=["Webhook"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+
+
+@app.exception_handler(InferenceOverloadedError)
+async def inference_overloaded_handler(request: Request, exc: InferenceOverloadedError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(InferenceTimeoutError)
+async def inference_timeout_handler(request: Request, exc: InferenceTimeoutError):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
 
 
 @app.get("/health")
@@ -79,6 +122,35 @@ async def health_check():
     return {"status": "healthy", "service": "agricultural-api"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: per-model load state, 503 until every model is loaded"""
+    from services.ai_pipeline_service import ai_pipeline
+    ready = ai_pipeline.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "model_version": ai_pipeline.model_version,
+            "models": ai_pipeline.model_state,
+            "reload": ai_pipeline.model_reload
+        }
+    )
+
+
+@app.get("/metrics/inference")
+async def inference_metrics():
+    """Bi-LSTM micro-batcher fill, prediction cache hit rates and inference executor load"""
+    from services.ai_pipeline_service import ai_pipeline
+    from services.prediction_cache import prediction_cache
+    from services.inference_executor import inference_executor
+    return {
+        "irrigation_lstm": ai_pipeline.irrigation_batcher.metrics(),
+        "prediction_cache": prediction_cache.metrics(),
+        "executor": inference_executor.metrics()
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
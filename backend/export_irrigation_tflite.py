@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Export ml_models/irrigation_lstm.h5 to ml_models/irrigation_lstm.tflite
+and check numeric parity against Keras.
+
+The LSTM layers are rebuilt with unroll=True (14 fixed time steps) so the
+converter emits plain TFLite builtins with a (None, 14, 9) float32
+signature instead of TensorList ops that would need the TF Select runtime.
+
+Usage (from backend/):
+    python export_irrigation_tflite.py            # export + parity check
+    python export_irrigation_tflite.py --check    # parity check only
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from services.irrigation_runtime import (
+    IRRIGATION_TFLITE_FILE, TFLiteIrrigationModel, load_keras_irrigation_model
+)
+
+MODEL_DIR = Path(__file__).resolve().parent / "ml_models"
+PARITY_SAMPLES = 512
+# Raw logits reach 1e4 and float32 accumulation order differs between
+# runtimes (more so at large batch), so compare relative to the output scale
+PARITY_RTOL = 1e-3
+# Feature scales of [Temp, Humidity, SoilMoisture, ET0, ETc, Stage, Type, FieldSize, Light]
+FEATURE_SCALE = np.array([45, 100, 1, 10, 10, 4, 4, 20, 1], dtype=np.float32)
+
+
+def _unrolled_copy(model):
+    def unroll(config):
+        if isinstance(config, dict):
+            if config.get("class_name") in ("LSTM", "GRU", "SimpleRNN"):
+                config["config"]["unroll"] = True
+            for value in config.values():
+                unroll(value)
+        elif isinstance(config, list):
+            for value in config:
+                unroll(value)
+
+    config = model.get_config()
+    unroll(config)
+    unrolled = model.__class__.from_config(config)
+    unrolled.set_weights(model.get_weights())
+    return unrolled
+
+
+def export_tflite(keras_model, output_path: Path) -> None:
+    import tensorflow as tf
+
+    with tempfile.TemporaryDirectory() as saved_model_dir:
+        _unrolled_copy(keras_model).export(
+            saved_model_dir,
+            format="tf_saved_model",
+            input_signature=[tf.TensorSpec([None, 14, 9], tf.float32, name="input_layer")],
+            verbose=False
+        )
+        tflite_model = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir).convert()
+
+    output_path.write_bytes(tflite_model)
+    print(f"Wrote {output_path} ({len(tflite_model) / 1024:.0f} KB)")
+
+
+def check_parity(keras_model, tflite_path: Path) -> bool:
+    rng = np.random.default_rng(14)
+    inputs = (rng.random((PARITY_SAMPLES, 14, 9)) * FEATURE_SCALE).astype(np.float32)
+    tflite_model = TFLiteIrrigationModel(tflite_path)
+
+    ok = True
+    for batch_size in (1, 7, PARITY_SAMPLES):
+        expected = keras_model.predict(inputs[:batch_size], verbose=0)
+        actual = tflite_model.predict(inputs[:batch_size])
+        rel_err = float(np.max(np.abs(actual - expected)) / max(float(np.max(np.abs(expected))), 1.0))
+
+        # Same decision as AIPipelineService: sigmoid of the class-1 logit > 0.5
+        same_decision = np.array_equal(expected[:, 1] > 0, actual[:, 1] > 0)
+        passed = rel_err <= PARITY_RTOL and same_decision
+        ok = ok and passed
+        print(f"batch={batch_size:4d} max_rel_err={rel_err:.2e} same_decisions={same_decision} {'OK' if passed else 'FAIL'}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--check", action="store_true", help="only run the parity check")
+    args = parser.parse_args()
+
+    keras_model = load_keras_irrigation_model(MODEL_DIR)
+    tflite_path = MODEL_DIR / IRRIGATION_TFLITE_FILE
+    if not args.check:
+        export_tflite(keras_model, tflite_path)
+    return 0 if check_parity(keras_model, tflite_path) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
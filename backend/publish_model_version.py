@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Publish the model files in a directory as a new registry version.
+
+Copies the known model files (pickles, irrigation_lstm.h5 and the TFLite
+export if present) into ml_models/registry/<version>/ with a manifest of
+checksums, feature order and encoder classes. The running API switches
+to it via POST /api/admin/models/<version>/promote, or at the next start
+when --activate is given.
+
+Usage (from backend/):
+    python publish_model_version.py 2026-10-19.1 --source path/to/retrained --description "Kharif retrain"
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from services.ai_pipeline_service import MODEL_FEATURES, MODEL_FILES
+from services.irrigation_runtime import IRRIGATION_KERAS_FILE
+from services.model_registry import MODEL_DIR, model_registry
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("version", help="version name (letters, digits, '.', '_', '-')")
+    parser.add_argument("--source", type=Path, default=MODEL_DIR, help="directory with the model files")
+    parser.add_argument("--description", default="")
+    parser.add_argument("--activate", action="store_true", help="make it the active version for the next start")
+    args = parser.parse_args()
+
+    files = [f for f in MODEL_FILES if (args.source / f).is_file()]
+    skipped = sorted(set(MODEL_FILES) - set(files))
+    if IRRIGATION_KERAS_FILE not in files:
+        print(f"{IRRIGATION_KERAS_FILE} not found in {args.source}")
+        return 1
+
+    try:
+        manifest = model_registry.publish(args.version, args.source, files, MODEL_FEATURES, args.description)
+    except ValueError as e:
+        print(e)
+        return 1
+
+    print(f"Published {args.version}: {len(manifest['files'])} files")
+    if skipped:
+        print(f"Not in source, not published: {', '.join(skipped)}")
+    if args.activate:
+        model_registry.set_active(args.version)
+        print(f"{args.version} is the active version.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
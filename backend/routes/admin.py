@@ -0,0 +1,67 @@
+"""
+Model administration routes: list, promote and roll back model versions.
+
+Protected by the MODEL_ADMIN_TOKEN environment variable, sent as the
+X-Admin-Token header. The routes are disabled when it is not set.
+"""
+
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from services.ai_pipeline_service import ai_pipeline
+from services.model_registry import model_registry
+
+router = APIRouter()
+
+
+def require_admin_token(x_admin_token: str = Header(None)) -> None:
+    """Dependency: reject requests without the configured admin token"""
+    expected = os.getenv("MODEL_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model administration is disabled (MODEL_ADMIN_TOKEN not set)"
+        )
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+def _start(version: str, rollback: bool = False) -> dict:
+    try:
+        ai_pipeline.start_promotion(version, rollback=rollback)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return {"status": "loading", "version": version, "active_version": ai_pipeline.model_version}
+
+
+@router.get("/models", dependencies=[Depends(require_admin_token)])
+async def list_model_versions():
+    """Published model versions, the active one and the last promotion's status"""
+    return {
+        "active_version": ai_pipeline.model_version,
+        "versions": model_registry.versions(),
+        "history": model_registry.history(),
+        "reload": ai_pipeline.model_reload
+    }
+
+
+@router.post("/models/rollback", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin_token)])
+async def rollback_model_version():
+    """Reload the previously active version in the background and swap back to it"""
+    previous = model_registry.previous_version()
+    if previous is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No previous model version to roll back to")
+    return _start(previous, rollback=True)
+
+
+@router.post("/models/{version}/promote", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin_token)])
+async def promote_model_version(version: str):
+    """
+    Verify a published version, load it in the background and swap it in
+    once every model loaded. Poll GET /models (or /ready) for the outcome.
+    """
+    return _start(version)
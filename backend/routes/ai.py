@@ -14,11 +14,11 @@ from routes.advisories import get_advisory_history
 from services.storage import load_json, save_json
 from services.ai_pipeline_service import ai_pipeline
 from services.reasoning_layer import reasoning_agri_assistant
-from services.agronomic_engine import enrich_telemetry_history
+from services.field_state import get_field_state
+from services.inference_executor import inference_executor, SHAP_TIMEOUT_SECONDS
+from services.geocode_cache import stored_user_coordinates
 from utils.field_validation import get_field_or_404
 from utils.helpers import get_timestamp
-import datetime
-import numpy as np
 import asyncio
 import json
 import time
@@ -92,9 +92,10 @@ async def ai_chat(
     }
     
     # 2. Get high-quality agronomic state (instead of CSV fallback)
-    history_last_14, cumulative_gdd, predicted_stage = await enrich_telemetry_history(
-        field, farmer_location
-    )
+    stored_lat, stored_lon = stored_user_coordinates(farmer_user)
+    state = await get_field_state(field, farmer_location, stored_lat, stored_lon)
+    history_last_14 = state["history"]
+    predicted_stage = state["predicted_stage"]
     
     # Prepare dummy state for history if empty
     if not history_last_14:
@@ -117,32 +118,9 @@ async def ai_chat(
     # 2.5 Optional ML Enrichment
     ml_insights = ""
     if history_last_14:
-        current_day = history_last_14[-1]
-        feature_sequence = [
-            ai_pipeline.construct_feature_vector(
-                day.get("t_avg", 25), day.get("humidity", 60), day.get("soil_moisture", 50),
-                day.get("et0", 4), day.get("etc", 4), day.get("stage", predicted_stage),
-                field.crop, field.area_acres, day.get("solar_radiation", 15) * 1000
-            ) for day in history_last_14[-14:]
-        ]
-        while len(feature_sequence) < 14:
-            feature_sequence.insert(0, feature_sequence[0])
-            
-        lstm_input = np.array(feature_sequence)
-        irr_prob, irrigation_needed, final_lstm_input = ai_pipeline.predict_irrigation(lstm_input)
-        
-        now = datetime.datetime.now()
-        season = "Kharif" if 6 <= now.month <= 10 else "Rabi"
-        temp = current_day.get("t_avg", 25)
-        humidity = current_day.get("humidity", 60)
-        
-        disease_risk, pest_input = ai_pipeline.predict_pests(
-            field.crop, predicted_stage, season, temp, humidity
-        )
-        
-        nut_pred, nutrient_input = ai_pipeline.predict_nutrients(
-            field.crop, predicted_stage, field.area_acres
-        )
+        irr_prob = state["irr_prob"]
+        disease_risk = state["disease_risk"]
+        nut_pred = state["nut_pred"]
         
         ml_insights = f"""
     ML Pipeline Live Predictions:
@@ -252,40 +230,19 @@ async def get_ai_reasoning(
     pref_language = farmer_user.get("preferred_language", "en") if farmer_user else "en"
     
     # Get transparency ML data
-    history_last_14, cumulative_gdd, predicted_stage = await enrich_telemetry_history(
-        field, farmer_location
-    )
-    if not history_last_14:
+    stored_lat, stored_lon = stored_user_coordinates(farmer_user)
+    state = await get_field_state(field, farmer_location, stored_lat, stored_lon)
+    if not state["history"]:
         raise HTTPException(status_code=404, detail="No sensor history available for AI reasoning.")
         
     # Get ML predictions
-    current_day = history_last_14[-1]
-    feature_sequence = [
-        ai_pipeline.construct_feature_vector(
-            day.get("t_avg", 25), day.get("humidity", 60), day.get("soil_moisture", 50),
-            day.get("et0", 4), day.get("etc", 4), day.get("stage", predicted_stage),
-            field.crop, field.area_acres, day.get("solar_radiation", 15) * 1000
-        ) for day in history_last_14[-14:]
-    ]
-    # Pad if needed
-    while len(feature_sequence) < 14:
-        feature_sequence.insert(0, feature_sequence[0])
-        
-    lstm_input = np.array(feature_sequence)
-    irr_prob, irrigation_needed, final_lstm_input = ai_pipeline.predict_irrigation(lstm_input)
-    
-    now = datetime.datetime.now()
-    season = "Kharif" if 6 <= now.month <= 10 else "Rabi"
+    predicted_stage = state["predicted_stage"]
+    current_day = state["current_day"]
     temp = current_day.get("t_avg", 25)
     humidity = current_day.get("humidity", 60)
-    
-    disease_risk, pest_input = ai_pipeline.predict_pests(
-        field.crop, predicted_stage, season, temp, humidity
-    )
-    
-    nut_pred, nutrient_input = ai_pipeline.predict_nutrients(
-        field.crop, predicted_stage, field.area_acres
-    )
+    irr_prob = state["irr_prob"]
+    disease_risk = state["disease_risk"]
+    nut_pred = state["nut_pred"]
 
     raw_ml_data = {
         "crop": field.crop,
@@ -396,56 +353,38 @@ async def get_transparency_data(
     lon: Optional[float] = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
-    from services.agronomic_engine import enrich_telemetry_history
     field = get_field_or_404(field_id, current_user["user_id"])
     
     users_data = load_json("users.json")
     farmer_user = next((u for u in users_data.get("users", []) if u.get("user_id") == current_user["user_id"]), None)
     farmer_location = farmer_user.get("location", "") if farmer_user else ""
+    if lat is None or lon is None:
+        lat, lon = stored_user_coordinates(farmer_user)
     
-    history_last_14, cumulative_gdd, predicted_stage = await enrich_telemetry_history(
-        field, farmer_location, lat=lat, lon=lon
-    )
+    state = await get_field_state(field, farmer_location, lat, lon)
     
-    if len(history_last_14) == 0:
+    if not state["history"]:
         raise HTTPException(status_code=404, detail="No sensor history available for transparency calculation.")
         
-    while len(history_last_14) < 14:
-        history_last_14.insert(0, history_last_14[0])
-        
-    feature_sequence = []
-    for day in history_last_14:
-        fv = ai_pipeline.construct_feature_vector(
-            day.get("t_avg", 25), day.get("humidity", 60), day.get("soil_moisture", 50),
-            day.get("et0", 4), day.get("etc", 4), day.get("stage", predicted_stage),
-            field.crop, field.area_acres, day.get("solar_radiation", 15) * 1000
-        )
-        feature_sequence.append(fv)
-        
-    lstm_input = np.array(feature_sequence)
-    irr_prob, irrigation_needed, final_lstm_input = ai_pipeline.predict_irrigation(lstm_input)
-    
-    current_day = history_last_14[-1]
-    
-    from datetime import datetime
-    now = datetime.now()
-    season = "Kharif" if 6 <= now.month <= 10 else "Rabi"
+    cumulative_gdd = state["cumulative_gdd"]
+    predicted_stage = state["predicted_stage"]
+    current_day = state["current_day"]
     temp = current_day.get("t_avg", 25)
     humidity = current_day.get("humidity", 60)
-    
-    disease_risk, pest_input = ai_pipeline.predict_pests(
-        field.crop, predicted_stage, season, temp, humidity
-    )
-    
-    nut_pred, nutrient_input = ai_pipeline.predict_nutrients(
-        field.crop, predicted_stage, field.area_acres
-    )
-    
-    irrigation_shap, pest_shap, nutrient_shap, spraying_shap = ai_pipeline.get_shap_drivers(
+    irr_prob = state["irr_prob"]
+    nut_pred = state["nut_pred"]
+    final_lstm_input = state["lstm_input"]
+    pest_input = state["pest_input"]
+    nutrient_input = state["nutrient_input"]
+    
+    # SHAP runs for seconds; keep it off the event loop
+    irrigation_shap, pest_shap, nutrient_shap, spraying_shap = await inference_executor.run(
+        ai_pipeline.get_shap_drivers,
         final_lstm_input, 
         pest_input, 
         nutrient_input=nutrient_input,
-        spray_context={"wind_speed": current_day.get("wind_speed", 0), "temp": temp, "humidity": humidity}
+        spray_context={"wind_speed": current_day.get("wind_speed", 0), "temp": temp, "humidity": humidity},
+        timeout=SHAP_TIMEOUT_SECONDS
     )
     
     return TransparencyData(
@@ -1,21 +1,49 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import timedelta
+from typing import Optional
 import uuid
 
 from models.schemas import UserCreate, UserLogin, UserResponse, Token, UserUpdate
 from services.auth_service import hash_password, verify_password, create_access_token, verify_token
 from services.storage import load_json, save_json
+from services.geocode_cache import geocode_user_locations
 
 router = APIRouter()
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
     Dependency to get current authenticated user from JWT token
     """
-    token = credentials.credentials
+    return _get_user_from_token(credentials.credentials)
+
+
+def get_current_user_for_stream(
+    token: Optional[str] = Query(None, description="JWT for clients that cannot set headers (EventSource)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> dict:
+    """
+    Dependency for streaming endpoints: accepts the JWT from the
+    Authorization header or, for browser EventSource, a `token` query param
+    """
+    if credentials is not None:
+        return _get_user_from_token(credentials.credentials)
+    if token:
+        return _get_user_from_token(token)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _get_user_from_token(token: str) -> dict:
+    """
+    Resolve a JWT to the stored user record, raising 401 if invalid
+    """
     payload = verify_token(token)
     
     if payload is None:
@@ -47,7 +75,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate):
+async def signup(user_data: UserCreate, background_tasks: BackgroundTasks):
     """
     Create a new user account
     
@@ -102,6 +130,9 @@ async def signup(user_data: UserCreate):
     users_data["users"] = users
     save_json("users.json", users_data)
     
+    # Store the farm coordinates on the user in the background
+    background_tasks.add_task(geocode_user_locations, [user_id])
+    
     # Create access token
     access_token = create_access_token(data={"sub": user_id})
     
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status, UploadFile, File
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import FileResponse
 import os
@@ -9,6 +9,7 @@ from pathlib import Path
 from models.schemas import UserResponse, UserUpdate
 from routes.auth import get_current_user
 from services.storage import load_json, save_json
+from services.geocode_cache import clear_user_coordinates, geocode_user_locations
 
 router = APIRouter()
 security = HTTPBearer()
@@ -34,6 +35,7 @@ async def get_farmer_profile(current_user: dict = Depends(get_current_user)):
 @router.put("/me", response_model=UserResponse)
 async def update_farmer_profile(
     user_update: UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -60,6 +62,12 @@ async def update_farmer_profile(
     
     # Update fields if provided
     update_data = user_update.dict(exclude_unset=True)
+    location_changed = (
+        update_data.get("location") is not None
+        and update_data["location"] != users[user_index].get("location")
+    )
+    if location_changed:
+        clear_user_coordinates(users[user_index])
     for key, value in update_data.items():
         if value is not None:
             if key == "farming_type":
@@ -72,6 +80,9 @@ async def update_farmer_profile(
     users_data["users"] = users
     save_json("users.json", users_data)
     
+    if location_changed:
+        background_tasks.add_task(geocode_user_locations, [current_user["user_id"]])
+    
     # Return updated user
     updated_user = users[user_index]
     return UserResponse(
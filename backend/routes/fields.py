@@ -5,6 +5,8 @@ import uuid
 from models.schemas import FieldCreate, FieldUpdate, FieldResponse
 from routes.auth import get_current_user
 from services.storage import load_json, save_json
+from services.agronomic_engine import invalidate_gdd_checkpoints
+from services.field_state_store import delete_field_state
 from utils.field_validation import get_field_or_404, get_farmer_field_ids
 
 router = APIRouter()
@@ -110,6 +112,7 @@ async def update_field(
             break
     
     # Update fields if provided
+    previous = dict(fields[field_index])
     update_data = field_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         if value is not None:
@@ -118,6 +121,10 @@ async def update_field(
     fields_data["fields"] = fields
     save_json("fields.json", fields_data)
     
+    # Cumulative GDD checkpoints depend on crop, sowing date and sensor node
+    if any(previous.get(k) != fields[field_index].get(k) for k in ("crop", "sowing_date", "sensor_node_id")):
+        await invalidate_gdd_checkpoints(field_id=field_id)
+    
     return FieldResponse(**fields[field_index])
 
 
@@ -147,6 +154,8 @@ async def delete_field(
     
     fields_data["fields"] = fields
     save_json("fields.json", fields_data)
+    await invalidate_gdd_checkpoints(field_id=field_id)
+    await delete_field_state(field_id)
     
     return None
 
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from routes.auth import get_current_user
 from services.market_service import get_market_price, load_market_prices
 from services.profit_service import calculate_expected_profit
-from services.agronomic_engine import enrich_telemetry_history
+from services.agronomic_engine import compute_telemetry_history
+from services.geocode_cache import stored_user_coordinates
 from services.storage import load_json
 from models.schemas import MarketPrice, ProfitEstimation, MarketAdvisory
 from typing import List
@@ -90,7 +91,8 @@ async def get_market_advisory(
         # 1. Fetch Agronomic Context (GDD)
         cumulative_gdd = 800.0 # Default fallback
         try:
-            _, gdd, _ = await enrich_telemetry_history(field, farmer_location)
+            stored_lat, stored_lon = stored_user_coordinates(user)
+            gdd = (await compute_telemetry_history(field, farmer_location, stored_lat, stored_lon))["cumulative_gdd"]
             cumulative_gdd = gdd
         except Exception as agronomic_err:
             print(f"Agronomic fetch failed for advisory: {agronomic_err}")
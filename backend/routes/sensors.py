@@ -1,17 +1,50 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, status
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, Optional
 from datetime import datetime
+import asyncio
 
 from models.schemas import SensorDataCreate, SensorDataResponse, AggregatedSensorData
-from routes.auth import get_current_user
+from routes.auth import get_current_user, get_current_user_for_stream
 from services.storage import load_json
-from utils.helpers import parse_time_range, get_timestamp
+from utils.helpers import parse_time_range, parse_time_window, get_timestamp
 from utils.field_validation import get_field_or_404
 from services.ingestion import validate_and_ingest
 from services.database import sensor_raw_collection, daily_telemetry_collection
+from services.sensor_cache import last_value_cache
+from services.rolling_aggregates import rolling_aggregates, ROLLING_WINDOWS
+from services.live_updates import sensor_event_hub
+from services.downsampling import (
+    SENSOR_METRICS, build_bucket_pipeline, lttb_downsample, validate_resolution
+)
+from services.sensor_export import (
+    EXPORT_FORMATS, EXPORT_BATCH_SIZE, resolve_export_columns, stream_sensor_export
+)
 
 router = APIRouter()
 
+# Upper bound on raw rows pulled into memory for LTTB selection
+LTTB_MAX_SOURCE_ROWS = 100000
+
+# Idle interval after which a comment is sent to keep SSE connections open
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _to_sensor_response(row: dict) -> SensorDataResponse:
+    """Map a SensorRaw document (or bucket average) to the API schema"""
+    wifi_rssi = row.get("wifi_rssi")
+    return SensorDataResponse(
+        timestamp=row.get("timestamp", ""),
+        air_temp=float(row.get("air_temp") or 0),
+        air_humidity=float(row.get("air_humidity") or 0),
+        soil_temp=float(row.get("soil_temp") or 0),
+        soil_moisture=float(row.get("soil_moisture") or 0),
+        light_lux=float(row.get("light_lux") or 0),
+        wind_speed=float(row.get("wind_speed") or 0.0),
+        battery_v=row.get("battery_v"),
+        wifi_rssi=int(round(wifi_rssi)) if wifi_rssi is not None else None
+    )
+
 
 @router.post("/sensor-data", status_code=status.HTTP_201_CREATED)
 async def receive_sensor_data(sensor_data: SensorDataCreate):
@@ -65,21 +98,47 @@ async def receive_sensor_data(sensor_data: SensorDataCreate):
     }
 
 
+@router.get("/fields/sensors/current", response_model=Dict[str, Optional[SensorDataResponse]])
+async def get_all_current_sensor_readings(
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the latest sensor readings for every field of the current farmer
+    
+    - Returns a mapping of field_id -> latest reading (null if the node has no data)
+    - Served from the last-value cache; misses are fetched in one MongoDB query
+    """
+    fields_data = load_json("fields.json")
+    farmer_fields = [
+        field for field in fields_data.get("fields", [])
+        if field.get("farmer_id") == current_user["user_id"]
+    ]
+    
+    node_ids = [f["sensor_node_id"] for f in farmer_fields if f.get("sensor_node_id")]
+    latest_by_node = await last_value_cache.get_many_or_load(node_ids)
+    
+    readings = {}
+    for field in farmer_fields:
+        latest_row = latest_by_node.get(field.get("sensor_node_id"))
+        readings[field["field_id"]] = _to_sensor_response(latest_row) if latest_row else None
+    
+    return readings
+
+
 @router.get("/fields/{field_id}/sensors/current", response_model=SensorDataResponse)
 async def get_current_sensor_readings(
     field_id: str,
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get the latest sensor readings from MongoDB
+    Get the latest sensor readings
+    
+    - Served from the in-memory last-value cache fed by ingestion
+    - Falls back to MongoDB on a cold cache
     """
     field = get_field_or_404(field_id, current_user["user_id"])
     
-    # Get latest reading from Raw Collection
-    latest_row = await sensor_raw_collection.find_one(
-        {"sensor_node_id": field.sensor_node_id},
-        sort=[("timestamp", -1)]
-    )
+    latest_row = await last_value_cache.get_or_load(field.sensor_node_id)
     
     if latest_row is None:
         raise HTTPException(
@@ -87,16 +146,49 @@ async def get_current_sensor_readings(
             detail="No sensor data found for this field"
         )
     
-    return SensorDataResponse(
-        timestamp=latest_row.get("timestamp", ""),
-        air_temp=float(latest_row.get("air_temp", 0)),
-        air_humidity=float(latest_row.get("air_humidity", 0)),
-        soil_temp=float(latest_row.get("soil_temp", 0)),
-        soil_moisture=float(latest_row.get("soil_moisture", 0)),
-        light_lux=float(latest_row.get("light_lux", 0)),
-        wind_speed=float(latest_row.get("wind_speed", 0.0)),
-        battery_v=latest_row.get("battery_v"),
-        wifi_rssi=latest_row.get("wifi_rssi")
+    return _to_sensor_response(latest_row)
+
+
+@router.get("/fields/{field_id}/sensors/stream")
+async def stream_sensor_readings(
+    field_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user_for_stream)
+):
+    """
+    Server-Sent Events stream of accepted readings for a field
+    
+    - Sends the latest known reading first, then each new reading as `event: reading`
+    - Browsers can pass the JWT as a `token` query param (EventSource cannot set headers)
+    """
+    field = get_field_or_404(field_id, current_user["user_id"])
+    node_id = field.sensor_node_id
+    queue = sensor_event_hub.subscribe(node_id)
+    
+    def _format_event(reading: dict) -> str:
+        return f"event: reading\ndata: {_to_sensor_response(reading).model_dump_json()}\n\n"
+    
+    async def event_stream():
+        try:
+            latest = last_value_cache.get(node_id)
+            if latest:
+                yield _format_event(latest)
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    reading = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_event(reading)
+        finally:
+            sensor_event_hub.unsubscribe(node_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
@@ -104,36 +196,103 @@ async def get_current_sensor_readings(
 async def get_historical_sensor_data(
     field_id: str,
     range: str = Query("24h", description="Time range: 24h, 7d, or 30d"),
+    start: Optional[str] = Query(None, description="ISO start time; overrides range"),
+    end: Optional[str] = Query(None, description="ISO end time; defaults to now"),
+    resolution: str = Query("raw", description="raw, bucket (time-bucket averages) or lttb"),
+    max_points: int = Query(500, ge=10, le=5000, description="Maximum points for bucket/lttb"),
+    metric: str = Query("soil_moisture", description="Series that drives LTTB point selection"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get historical sensor data for a field from MongoDB
+    
+    - **raw**: individual readings (capped at 1000)
+    - **bucket**: averages over `max_points` equal-count time buckets, computed in MongoDB
+    - **lttb**: `max_points` readings selected with Largest-Triangle-Three-Buckets
     """
     field = get_field_or_404(field_id, current_user["user_id"])
     
-    start_time, end_time = parse_time_range(range)
+    resolution_error = validate_resolution(resolution)
+    if resolution_error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=resolution_error)
+    if metric not in SENSOR_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid metric '{metric}'. Use one of: {', '.join(SENSOR_METRICS)}"
+        )
+    
+    try:
+        start_time, end_time = parse_time_window(range, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    cursor = sensor_raw_collection.find({
+    match = {
         "sensor_node_id": field.sensor_node_id,
         "timestamp": {"$gte": start_time.isoformat(), "$lte": end_time.isoformat()}
-    }).sort("timestamp", 1)
-    
-    filtered_data = await cursor.to_list(length=1000)
-    
-    return [
-        SensorDataResponse(
-            timestamp=row.get("timestamp", ""),
-            air_temp=float(row.get("air_temp", 0)),
-            air_humidity=float(row.get("air_humidity", 0)),
-            soil_temp=float(row.get("soil_temp", 0)),
-            soil_moisture=float(row.get("soil_moisture", 0)),
-            light_lux=float(row.get("light_lux", 0)),
-            wind_speed=float(row.get("wind_speed", 0.0)),
-            battery_v=row.get("battery_v"),
-            wifi_rssi=row.get("wifi_rssi")
+    }
+    
+    if resolution == "bucket":
+        cursor = sensor_raw_collection.aggregate(build_bucket_pipeline(match, max_points))
+        filtered_data = await cursor.to_list(length=max_points)
+    elif resolution == "lttb":
+        projection = {"_id": 0, "timestamp": 1, **{m: 1 for m in SENSOR_METRICS}}
+        cursor = sensor_raw_collection.find(match, projection).sort("timestamp", 1)
+        raw_rows = await cursor.to_list(length=LTTB_MAX_SOURCE_ROWS)
+        filtered_data = lttb_downsample(raw_rows, max_points, metric)
+    else:
+        cursor = sensor_raw_collection.find(match).sort("timestamp", 1)
+        filtered_data = await cursor.to_list(length=1000)
+    
+    return [_to_sensor_response(row) for row in filtered_data]
+
+
+@router.get("/fields/{field_id}/sensors/export")
+async def export_sensor_data(
+    field_id: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns, e.g. air_temp,soil_moisture"),
+    start: Optional[str] = Query(None, description="ISO start time; omit for full history"),
+    end: Optional[str] = Query(None, description="ISO end time; defaults to now"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream full-resolution sensor history for a field as NDJSON or CSV
+    
+    - No row cap; rows are read from MongoDB in batches and written as they arrive
+    """
+    field = get_field_or_404(field_id, current_user["user_id"])
+    
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
         )
-        for row in filtered_data
-    ]
+    
+    try:
+        export_columns = resolve_export_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    query = {"sensor_node_id": field.sensor_node_id}
+    if start or end:
+        try:
+            start_time, end_time = parse_time_window("30d", start, end)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        time_filter = {"$lte": end_time.isoformat()}
+        if start:
+            time_filter["$gte"] = start_time.isoformat()
+        query["timestamp"] = time_filter
+    
+    projection = {"_id": 0, **{c: 1 for c in export_columns}}
+    cursor = sensor_raw_collection.find(query, projection).sort("timestamp", 1).batch_size(EXPORT_BATCH_SIZE)
+    
+    filename = f"{field.sensor_node_id}_sensor_history.{format}"
+    return StreamingResponse(
+        stream_sensor_export(cursor, format, export_columns),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/fields/{field_id}/sensors/aggregate", response_model=AggregatedSensorData)
@@ -143,10 +302,16 @@ async def get_aggregated_sensor_data(
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get aggregated sensor data from DailyTelemetry collection
+    Get aggregated sensor data for a time window
+    
+    - 24h/7d/30d are served from incrementally maintained rolling windows
     """
     field = get_field_or_404(field_id, current_user["user_id"])
     
+    if window in ROLLING_WINDOWS:
+        stats = await rolling_aggregates.get_window(field.sensor_node_id, window)
+        return AggregatedSensorData(**stats, window=window)
+    
     # We will compute basic min max avg on the fly from the raw collection or daily telemetry
     start_time, end_time = parse_time_range(window)
     
@@ -1,21 +1,137 @@
 from datetime import datetime, timedelta
 import asyncio
-from services.database import daily_telemetry_collection
-from services.weather_service import get_day_summary, get_coordinates
+import numpy as np
+from typing import Optional
+from pymongo import UpdateOne
+from services.database import daily_telemetry_collection, gdd_checkpoint_collection
+from services.weather_service import get_day_summary
+from services.geocode_cache import geocode_cache
+from services.weather_history import load_tile_temperatures, weather_tile
 from services.irrigation_logic import (
-    calculate_daily_gdd, calculate_et0, calculate_etc, estimate_stage
+    calculate_daily_gdd, calculate_et0, calculate_etc, estimate_stage,
+    calculate_daily_gdd_array, encode_crops
 )
 
-async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float = None, lon: float = None):
+
+# Concurrent OpenWeatherMap back-fill for days without sensor data
+WEATHER_BACKFILL_CONCURRENCY = 5
+WEATHER_BACKFILL_DEADLINE_SECONDS = 15.0
+
+
+def _needs_weather_patch(day_record: Optional[dict]) -> bool:
+    """True if a day has no usable sensor aggregates"""
+    if not day_record or not day_record.get("daily_aggregates"):
+        return True
+    agg = day_record["daily_aggregates"]
+    return agg.get("t_avg") is None or agg.get("t_max") == -100
+
+
+async def fetch_missing_weather(lat: float, lon: float, dates: list) -> dict:
+    """
+    Fetch day summaries for several dates concurrently under a semaphore.
+    Days that fail or are not back within the deadline are left out, so
+    callers fall back to climatological defaults for them.
+    """
+    semaphore = asyncio.Semaphore(WEATHER_BACKFILL_CONCURRENCY)
+    
+    async def fetch(date_str):
+        async with semaphore:
+            try:
+                return date_str, await get_day_summary(lat, lon, date_str)
+            except Exception as e:
+                print(f"Weather patch failed for {date_str}: {e}")
+                return date_str, None
+            
+    tasks = [asyncio.create_task(fetch(d)) for d in dates]
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks, timeout=WEATHER_BACKFILL_DEADLINE_SECONDS)
+    for task in pending:
+        task.cancel()
+    if pending:
+        print(f"Weather patch deadline hit; {len(pending)} day(s) use climatological defaults")
+        
+    results = {}
+    for task in done:
+        date_str, summary = task.result()
+        if summary is not None:
+            results[date_str] = summary
+    return results
+
+
+async def load_gdd_checkpoint(field, before_date: str, tile: str) -> Optional[dict]:
+    """
+    Latest cumulative-GDD checkpoint for a field strictly before a date.
+    Checkpoints written for a different crop, sowing date or weather tile
+    (the farmer's location changed) are ignored.
+    """
+    return await gdd_checkpoint_collection.find_one(
+        {
+            "field_id": field.field_id,
+            "crop": field.crop,
+            "sowing_date": field.sowing_date,
+            "tile": tile,
+            "date": {"$lt": before_date}
+        },
+        sort=[("date", -1)]
+    )
+
+
+async def save_gdd_checkpoint(field, date_str: str, cumulative_gdd: float, stage: str, tile: str):
+    """
+    Persist cumulative GDD and stage at the end of date_str for a field,
+    computed from the temperatures of weather tile tile.
+    """
+    await gdd_checkpoint_collection.update_one(
+        {"field_id": field.field_id, "date": date_str},
+        {"$set": {
+            "field_id": field.field_id,
+            "sensor_node_id": field.sensor_node_id,
+            "crop": field.crop,
+            "sowing_date": field.sowing_date,
+            "tile": tile,
+            "date": date_str,
+            "cumulative_gdd": cumulative_gdd,
+            "stage": stage
+        }},
+        upsert=True
+    )
+
+
+async def invalidate_gdd_checkpoints(field_id: str = None, sensor_node_id: str = None, from_date: str = None):
+    """
+    Drop checkpoints for a field or sensor node, optionally only those at or
+    after from_date (a revised past day invalidates everything after it).
     """
-    Phase 3: The Agronomic Math Engine
+    query = {}
+    if field_id:
+        query["field_id"] = field_id
+    if sensor_node_id:
+        query["sensor_node_id"] = sensor_node_id
+    if not query:
+        return
+    if from_date:
+        query["date"] = {"$gte": from_date}
+    await gdd_checkpoint_collection.delete_many(query)
+
+async def compute_telemetry_history(field: dict, farmer_location: str, lat: float = None, lon: float = None) -> dict:
+    """
+    Phase 3: The Agronomic Math Engine (read-only)
     1. Spatio-Temporal Fusion: Query daily history since Sowing Date. 
-       If missing, fetch from OpenWeatherMap.
+       Window days without sensor data are fetched from OpenWeatherMap;
+       pre-window days come from the local weather history store only.
     2. Phenology & GDD Math: Calculate cumulative GDD to find stage.
+       Days before the 14-day window resume from the latest GDD checkpoint.
     3. Evapotranspiration Math: ET0, Kc, ETc.
-    4. Save to DailyTelemetry collection.
     
-    Returns structured 14-day history for Bi-LSTM.
+    Writes nothing; DailyTelemetry updates and the GDD checkpoint are
+    returned for persist_telemetry_history(). Outbound reads are an intended
+    exception: the day summaries above (the Bi-LSTM needs their humidity
+    and wind; bounded by WEATHER_BACKFILL_DEADLINE_SECONDS) and geocoding
+    when no coordinates are passed.
+    
+    Returns dictionary with history (structured 14 days for Bi-LSTM),
+    cumulative_gdd, stage, pending_writes and checkpoint.
     """
     
     node_id = field.sensor_node_id
@@ -33,7 +149,7 @@ async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float
     resolved_lat = lat
     resolved_lon = lon
     if not lat or not lon:
-        coords = await get_coordinates(farmer_location)
+        coords = await geocode_cache.resolve(farmer_location)
         if coords:
             resolved_lat = coords["lat"]
             resolved_lon = coords["lon"]
@@ -47,45 +163,85 @@ async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float
     
     history_last_14 = []
     
+    # 1. Resume pre-window GDD from the latest checkpoint instead of sowing day
+    window_start = end_date - timedelta(days=13)
+    window_start_str = window_start.strftime("%Y-%m-%d")
+    tile = weather_tile(resolved_lat, resolved_lon)
+    checkpoint = await load_gdd_checkpoint(field, window_start_str, tile)
+    if checkpoint and checkpoint["date"] >= start_date.strftime("%Y-%m-%d"):
+        cumulative_gdd = checkpoint["cumulative_gdd"]
+        current_date = datetime.strptime(checkpoint["date"], "%Y-%m-%d") + timedelta(days=1)
+        
+    # Fast-forward remaining ancient dates from the local weather history store
+    # (one range query; 32/22 for days the back-fill has not reached yet)
+    pre_window_temps = await load_tile_temperatures(
+        resolved_lat, resolved_lon, current_date.strftime("%Y-%m-%d"),
+        (window_start - timedelta(days=1)).strftime("%Y-%m-%d")
+    )
+    new_checkpoint = None
+    pre_window_days = max((window_start.date() - current_date.date()).days, 0)
+    if pre_window_days > 0:
+        temps = np.array([
+            pre_window_temps.get((current_date + timedelta(days=i)).strftime("%Y-%m-%d"), (32.0, 22.0))
+            for i in range(pre_window_days)
+        ])
+        daily_gdd = calculate_daily_gdd_array(temps[:, 0], temps[:, 1], encode_crops(crop)[0])
+        # cumsum adds in day order, matching the scalar running total exactly
+        cumulative_gdd = float(np.cumsum(np.concatenate(([cumulative_gdd], daily_gdd)))[-1])
+        current_date += timedelta(days=pre_window_days)
+        
+        pre_window_stage, _ = estimate_stage(crop, cumulative_gdd)
+        new_checkpoint = {
+            "date": (current_date - timedelta(days=1)).strftime("%Y-%m-%d"),
+            "cumulative_gdd": cumulative_gdd,
+            "stage": pre_window_stage,
+            "tile": tile
+        }
+    
+    # 2. Fetch the crucial last 14 days in a single round-trip
+    window_cursor = daily_telemetry_collection.find(
+        {
+            "sensor_node_id": node_id,
+            "date": {"$gte": window_start_str, "$lte": end_date.strftime("%Y-%m-%d")}
+        },
+        {"_id": 0, "date": 1, "daily_aggregates": 1, "agronomic_data": 1}
+    )
+    window_records = {doc["date"]: doc for doc in await window_cursor.to_list(length=14)}
+    pending_writes = []
+    
+    # Back-fill days without sensor data from OpenWeatherMap, all at once
+    missing_dates = []
+    day = current_date
+    while day <= end_date:
+        day_str = day.strftime("%Y-%m-%d")
+        if _needs_weather_patch(window_records.get(day_str)):
+            missing_dates.append(day_str)
+        day += timedelta(days=1)
+    weather_by_date = await fetch_missing_weather(resolved_lat, resolved_lon, missing_dates)
+    
     while current_date <= end_date:
         date_str = current_date.strftime("%Y-%m-%d")
-        days_diff_from_now = (end_date.date() - current_date.date()).days
         
-        # 1. Fast-forward ancient dates to eliminate 100+ MongoDB network requests
-        if days_diff_from_now >= 14:
-            t_max, t_min = 32.0, 22.0
-            daily_gdd = calculate_daily_gdd(t_max, t_min, crop)
-            cumulative_gdd += daily_gdd
-            current_date += timedelta(days=1)
-            continue
-            
-        # 2. Spatio-Temporal Fusion for the crucial last 14 days
-        day_record = await daily_telemetry_collection.find_one({"sensor_node_id": node_id, "date": date_str})
+        # Spatio-Temporal Fusion for the crucial last 14 days
+        day_record = window_records.get(date_str)
         
-        needs_weather_patch = False
+        # Climatological defaults, used when neither sensors nor weather API have the day
         t_max, t_min, t_avg = 30.0, 20.0, 25.0
         humidity, wind, lux, moisture = 60.0, 2.0, 15.0, 50.0 # lux in thousands as approx radiation
         
-        if day_record and day_record.get("daily_aggregates"):
+        if not _needs_weather_patch(day_record):
             agg = day_record["daily_aggregates"]
-            if agg.get("t_avg") is None or agg.get("t_max") == -100:
-                needs_weather_patch = True
-            else:
-                t_max = agg.get("t_max", 30.0)
-                t_min = agg.get("t_min", 20.0)
-                t_avg = agg.get("t_avg", 25.0)
-                humidity = agg.get("humidity_avg", 60.0)
-                wind = agg.get("wind_speed_avg", 2.0)
-                moisture = agg.get("soil_moisture_avg", 50.0)
-                lux_val = agg.get("light_lux_avg", 15000.0)
-                lux = max(lux_val, 0) / 1000.0 # Approximation of solar radiation from lux
-        else:
-            needs_weather_patch = True
-            
-        if needs_weather_patch:
-            # Autonomously call OpenWeatherMap
+            t_max = agg.get("t_max", 30.0)
+            t_min = agg.get("t_min", 20.0)
+            t_avg = agg.get("t_avg", 25.0)
+            humidity = agg.get("humidity_avg", 60.0)
+            wind = agg.get("wind_speed_avg", 2.0)
+            moisture = agg.get("soil_moisture_avg", 50.0)
+            lux_val = agg.get("light_lux_avg", 15000.0)
+            lux = max(lux_val, 0) / 1000.0 # Approximation of solar radiation from lux
+        elif date_str in weather_by_date:
+            weather_summary = weather_by_date[date_str]
             try:
-                weather_summary = await get_day_summary(resolved_lat, resolved_lon, date_str)
                 t_max = weather_summary.get("temperature", {}).get("max", 30.0)
                 t_min = weather_summary.get("temperature", {}).get("min", 20.0)
                 t_avg = (t_max + t_min) / 2
@@ -104,7 +260,7 @@ async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float
         et0 = calculate_et0(t_avg, t_max, t_min, humidity, wind, lux)
         etc, kc = calculate_etc(crop, stage, et0)
         
-        # 4. Save enriched data back to MongoDB safely
+        # 4. Queue enriched data for write-back only if it changed
         enriched_data = {
             "sensor_node_id": node_id,
             "date": date_str,
@@ -125,11 +281,13 @@ async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float
             }
         }
         
-        await daily_telemetry_collection.update_one(
-            {"sensor_node_id": node_id, "date": date_str},
-            {"$set": {"agronomic_data": enriched_data["agronomic_data"]}},
-            upsert=True
-        )
+        stored = (day_record or {}).get("agronomic_data")
+        if stored != enriched_data["agronomic_data"]:
+            pending_writes.append(UpdateOne(
+                {"sensor_node_id": node_id, "date": date_str},
+                {"$set": {"agronomic_data": enriched_data["agronomic_data"]}},
+                upsert=True
+            ))
         
         # Collect last 14 days features
         days_diff = (end_date.date() - current_date.date()).days
@@ -138,5 +296,38 @@ async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float
             
         current_date += timedelta(days=1)
         
-    return history_last_14, cumulative_gdd, stage
+    return {
+        "history": history_last_14,
+        "cumulative_gdd": cumulative_gdd,
+        "stage": stage,
+        "pending_writes": pending_writes,
+        "checkpoint": new_checkpoint
+    }
+
+
+async def persist_telemetry_history(field, result: dict):
+    """
+    Phase 3, step 4: Save a compute_telemetry_history() result to the
+    DailyTelemetry collection and store its GDD checkpoint.
+    Reached only from the scheduled field state precompute, through
+    enrich_telemetry_history(); request handlers use the compute step alone.
+    """
+    if result["pending_writes"]:
+        await daily_telemetry_collection.bulk_write(result["pending_writes"], ordered=False)
+    checkpoint = result["checkpoint"]
+    if checkpoint:
+        await save_gdd_checkpoint(
+            field, checkpoint["date"], checkpoint["cumulative_gdd"], checkpoint["stage"], checkpoint["tile"]
+        )
+
+
+async def enrich_telemetry_history(field: dict, farmer_location: str, lat: float = None, lon: float = None):
+    """
+    Compute and persist a field's agronomic history.
+    
+    Returns structured 14-day history for Bi-LSTM, cumulative GDD and stage.
+    """
+    result = await compute_telemetry_history(field, farmer_location, lat, lon)
+    await persist_telemetry_history(field, result)
+    return result["history"], result["cumulative_gdd"], result["stage"]
 
@@ -2,69 +2,316 @@ import numpy as np
 import joblib
 import json
 import os
-import tensorflow as tf
-from tensorflow.keras.models import load_model
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from services.models.spraying_rules import SprayingDecisionEngine
 from services.market_integration import MarketIntegrationModule
-from services.shap_explainer import XAIExplainer
+from services.micro_batcher import MicroBatcher
+from services.irrigation_runtime import (
+    IRRIGATION_KERAS_FILE, IRRIGATION_TFLITE_FILE, load_irrigation_model, load_keras_irrigation_model
+)
+from services.prediction_cache import prediction_cache
+from services.encoder_tables import EncoderTable
+from services.compiled_forest import CompiledForest
+from services.model_registry import file_sha256, model_registry
+from services.inference_executor import inference_executor
 import requests
 
-# Handle cross-version Keras saved model issues
-try:
-    tf.keras.config.enable_unsafe_deserialization() 
-except AttributeError:
-    pass
+# Bi-LSTM micro-batching: concurrent requests within the latency window share one forward pass
+LSTM_BATCH_MAX_SIZE = int(os.getenv("LSTM_BATCH_MAX_SIZE", "32"))
+LSTM_BATCH_MAX_LATENCY_MS = float(os.getenv("LSTM_BATCH_MAX_LATENCY_MS", "5"))
+# Tree models: "compiled" evaluates flattened NumPy node arrays, "sklearn" the pickled estimators
+FOREST_BACKEND = os.getenv("FOREST_BACKEND", "compiled").lower()
+
+# Pickled artifacts: attribute -> file in the model directory
+JOBLIB_ARTIFACTS = {
+    "nutrient_model": "nutrient_rf_model.pkl",
+    "pest_model": "pest_rf_model.pkl",
+    # Encoders (compiled into EncoderTable lookups when loaded)
+    "nut_crop_le": "crop_le.pkl",
+    "nut_stage_le": "stage_le.pkl",
+    "pest_crop_le": "pest_crop_le.pkl",
+    "pest_stage_le": "pest_stage_le.pkl",
+    "pest_season_le": "pest_season_le.pkl",
+    "pest_label_le": "pest_label_le.pkl",
+    # Phenology Model (GDD based)
+    "gdd_model": "gdd_stage_model.pkl",
+    "gdd_crop_le": "gdd_crop_le.pkl",
+    "gdd_stage_le": "gdd_stage_le.pkl",
+}
+# Load order for warm_up(): small pickles first so the RF paths are ready
+# while TensorFlow is still importing
+ARTIFACTS = list(JOBLIB_ARTIFACTS) + ["irrigation_model", "xai_explainer"]
+ENCODER_ARTIFACTS = {name for name in JOBLIB_ARTIFACTS if name.endswith("_le")}
+# Tree models served through a predictor attribute; the sklearn estimator stays for SHAP
+FOREST_ARTIFACTS = {"nutrient_model": "nutrient_forest", "pest_model": "pest_forest", "gdd_model": "gdd_forest"}
+# Code fed to the models for a crop/stage/season their encoder never saw
+UNKNOWN_CATEGORY_CODE = 0
+# Attributes set by a loader of another name
+ATTRIBUTE_ARTIFACT = {"irrigation_runtime": "irrigation_model"}
+ATTRIBUTE_ARTIFACT.update({predictor: model for model, predictor in FOREST_ARTIFACTS.items()})
+# Files a published model version may contain
+MODEL_FILES = list(JOBLIB_ARTIFACTS.values()) + [IRRIGATION_KERAS_FILE, IRRIGATION_TFLITE_FILE]
+
+# Column order of each model's input, as built below; checked against version manifests
+MODEL_FEATURES = {
+    "irrigation_model": ["Temp", "Humidity", "SoilMoisture", "ET0", "ETc", "Stage", "Type", "FieldSize", "Light"],
+    "pest_model": ["Crop_Type", "Crop_Stage", "Season", "Temperature", "Humidity"],
+    "nutrient_model": ["Crop_Type", "Crop_Stage", "Field_Size"],
+    "gdd_model": ["Crop_Type", "Cumulative_GDD"],
+}
+
+
+class ModelBundle:
+    """
+    One model version's artifacts. Nothing is loaded in __init__:
+    importing TensorFlow/SHAP and unpickling the forests takes seconds.
+    Each artifact loads on first attribute access, or earlier through
+    warm_up().
+    """
+
+    def __init__(self, version: str, model_dir: Path, manifest: Optional[dict], background_data_lstm: np.ndarray):
+        self.version = version
+        self.model_dir = model_dir
+        self.manifest = manifest
+        self.background_data_lstm = background_data_lstm
+
+        # Per-artifact load state for /ready: pending | loading | ready | failed.
+        # version is the loaded file's checksum and is part of prediction cache keys.
+        self.model_state = {
+            name: {"state": "pending", "version": None, "load_ms": None, "error": None} for name in ARTIFACTS
+        }
+        self._load_locks = {name: threading.Lock() for name in ARTIFACTS}
+
+    def __getattr__(self, name):
+        # Only reached when the attribute is not set yet, i.e. not loaded
+        artifact = ATTRIBUTE_ARTIFACT.get(name, name)
+        if artifact not in ARTIFACTS or name.startswith("_"):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self._load(artifact)
+        return self.__dict__[name]
+
+    def _load(self, artifact: str):
+        with self._load_locks[artifact]:
+            if self.model_state[artifact]["state"] == "ready":
+                return
+            state = self.model_state[artifact]
+            state.update(state="loading", error=None)
+            started = time.perf_counter()
+            try:
+                if artifact in ENCODER_ARTIFACTS:
+                    version = self._checksum(JOBLIB_ARTIFACTS[artifact])
+                    encoder = joblib.load(self.model_dir / JOBLIB_ARTIFACTS[artifact])
+                    self.__dict__[artifact] = EncoderTable.from_encoder(encoder)
+                elif artifact in JOBLIB_ARTIFACTS:
+                    version = self._checksum(JOBLIB_ARTIFACTS[artifact])
+                    self.__dict__[artifact] = joblib.load(self.model_dir / JOBLIB_ARTIFACTS[artifact])
+                    if artifact in FOREST_ARTIFACTS:
+                        self.__dict__[FOREST_ARTIFACTS[artifact]] = self._forest_predictor(self.__dict__[artifact])
+                elif artifact == "irrigation_model":
+                    # IRRIGATION_RUNTIME=tflite serves the exported model; Keras stays the default
+                    self.__dict__["irrigation_model"], self.__dict__["irrigation_runtime"] = \
+                        load_irrigation_model(self.model_dir)
+                    model_file = IRRIGATION_TFLITE_FILE if self.irrigation_runtime == "tflite" else IRRIGATION_KERAS_FILE
+                    version = f"{self.irrigation_runtime}:{self._checksum(model_file)}"
+                elif artifact == "xai_explainer":
+                    # Imports SHAP; the TFLite runtime gets its Keras model on first explanation
+                    from services.shap_explainer import XAIExplainer
+                    self.__dict__["xai_explainer"] = XAIExplainer(
+                        lstm_model=self.irrigation_model if self.irrigation_runtime == "keras" else None,
+                        rf_nutrient_model=self.nutrient_model,
+                        rf_pest_model=self.pest_model,
+                        background_data_lstm=self.background_data_lstm
+                    )
+                    version = None
+            except Exception as e:
+                state.update(state="failed", error=str(e))
+                raise
+            state.update(state="ready", version=version, load_ms=round((time.perf_counter() - started) * 1000, 1))
+
+    def _checksum(self, file_name: str) -> str:
+        """
+        Content hash of a model file, checked against the manifest if any.
+
+        Raises:
+            ValueError: the file differs from the one the manifest recorded
+        """
+        checksum = file_sha256(self.model_dir / file_name)
+        expected = (self.manifest or {}).get("files", {}).get(file_name, {}).get("sha256")
+        if expected and checksum != expected:
+            raise ValueError(f"{file_name}: checksum does not match manifest of version {self.version}")
+        return checksum[:16]
+
+    @staticmethod
+    def _forest_predictor(model):
+        if FOREST_BACKEND != "compiled":
+            return model
+        try:
+            return CompiledForest.from_sklearn(model)
+        except TypeError as e:
+            print(f"{e}; predicting with scikit-learn.")
+            return model
+
+    def explainer(self):
+        """
+        The XAIExplainer with its Bi-LSTM attached. The TFLite runtime has
+        no gradients, so its Keras model is loaded here on first use, under
+        the explainer's load lock so concurrent requests load it once.
+        """
+        xai_explainer = self.xai_explainer
+        if xai_explainer.lstm_model is None:
+            with self._load_locks["xai_explainer"]:
+                if xai_explainer.lstm_model is None:
+                    xai_explainer.set_lstm_model(load_keras_irrigation_model(self.model_dir), self.background_data_lstm)
+        return xai_explainer
+
+    def cache_version(self, artifact: str) -> str:
+        """Loaded version of an artifact for prediction cache keys (loads it if needed)"""
+        if self.model_state[artifact]["state"] != "ready":
+            self._load(artifact)
+        return self.model_state[artifact]["version"]
+
+    def loaded_version(self, artifact: str) -> Optional[str]:
+        """cache_version() if the artifact is already loaded, else None; never loads"""
+        state = self.model_state[artifact]
+        return state["version"] if state["state"] == "ready" else None
+
+    def warm_up(self):
+        """Load every artifact (blocking)"""
+        for artifact in ARTIFACTS:
+            try:
+                self._load(artifact)
+            except Exception as e:
+                print(f"Failed to load {artifact} ({self.version}): {e}")
+        ready = sum(s["state"] == "ready" for s in self.model_state.values())
+        print(f"Model version {self.version}: {ready}/{len(ARTIFACTS)} models loaded.")
+
+    def is_ready(self) -> bool:
+        return all(s["state"] == "ready" for s in self.model_state.values())
+
 
 class AIPipelineService:
+    """
+    Serves the active ModelBundle. A new version is loaded completely in
+    the background and then swapped in with a single reference assignment;
+    every prediction reads self.bundle once, so a request never mixes two
+    versions and in-flight requests finish on the version they started with.
+    """
+
     def __init__(self):
         self.base_dir = Path(__file__).resolve().parent.parent
-        self.model_dir = self.base_dir / "ml_models"
-        
-        # Load AI Models
-        print("Loading trained models for AI Pipeline Service...")
-        self.irrigation_model = load_model(self.model_dir / 'irrigation_lstm.h5', compile=False)
-        self.nutrient_model = joblib.load(self.model_dir / 'nutrient_rf_model.pkl')
-        self.pest_model = joblib.load(self.model_dir / 'pest_rf_model.pkl')
-        
-        # Encoders
-        self.nut_crop_le = joblib.load(self.model_dir / 'crop_le.pkl')
-        self.nut_stage_le = joblib.load(self.model_dir / 'stage_le.pkl')
-        self.pest_crop_le = joblib.load(self.model_dir / 'pest_crop_le.pkl')
-        self.pest_stage_le = joblib.load(self.model_dir / 'pest_stage_le.pkl')
-        self.pest_season_le = joblib.load(self.model_dir / 'pest_season_le.pkl')
-        self.pest_label_le = joblib.load(self.model_dir / 'pest_label_le.pkl')
-        
-        # Phenology Model (GDD based)
-        self.gdd_model = joblib.load(self.model_dir / 'gdd_stage_model.pkl')
-        self.gdd_crop_le = joblib.load(self.model_dir / 'gdd_crop_le.pkl')
-        self.gdd_stage_le = joblib.load(self.model_dir / 'gdd_stage_le.pkl')
+        self.registry = model_registry
+
+        # SHAP background data shape should match input
+        self.background_data_lstm = np.random.rand(100, 14, 9) 
+        version = self.registry.active_version()
+        self.bundle = self._new_bundle(version, self.registry.manifest(version))
+        # Background version promotion status, for the admin API and /ready
+        self.model_reload = {"state": "idle", "version": None, "error": None, "finished_at": None}
+        self._reload_lock = threading.Lock()
         
         self.spraying_engine = SprayingDecisionEngine()
-        
-        # SHAP Explainer
-        # background data shape should match input
-        background_data_lstm = np.random.rand(100, 14, 9) 
-        self.xai_explainer = XAIExplainer(
-            lstm_model=self.irrigation_model,
-            rf_nutrient_model=self.nutrient_model,
-            rf_pest_model=self.pest_model,
-            background_data_lstm=background_data_lstm
+        self.irrigation_batcher = MicroBatcher(
+            self._predict_irrigation_rows,
+            max_batch_size=LSTM_BATCH_MAX_SIZE,
+            max_latency_ms=LSTM_BATCH_MAX_LATENCY_MS,
+            name="irrigation_lstm",
+            runner=inference_executor.run
         )
         
-        
         # OpenRouter Initialization
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY") or "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"
         self.openrouter_url = "https://openrouter.ai/api/v1/chat/completions"
         # Revert to the previously-working Gemini free-tier model.
         self.model_name = "google/gemini-2.0-flash-exp:free"
 
+    def __getattr__(self, name):
+        # Model artifacts (ai_pipeline.pest_model, ...) resolve on the active bundle
+        if (name in ARTIFACTS or name in ATTRIBUTE_ARTIFACT) and "bundle" in self.__dict__:
+            return getattr(self.__dict__["bundle"], name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _new_bundle(self, version: str, manifest: Optional[dict]) -> ModelBundle:
+        return ModelBundle(version, self.registry.version_dir(version), manifest, self.background_data_lstm)
+
+    @property
+    def model_version(self) -> str:
+        return self.bundle.version
+
+    @property
+    def model_state(self):
+        return self.bundle.model_state
+
+    @property
+    def model_dir(self) -> Path:
+        return self.bundle.model_dir
+
+    def warm_up(self):
+        """Load every artifact of the active version (blocking); run from a background thread at startup"""
+        print(f"Loading trained models for AI Pipeline Service (version {self.model_version})...")
+        self.bundle.warm_up()
+
+    def is_ready(self) -> bool:
+        return self.bundle.is_ready()
+
+    # --- Version promotion ---
+
+    def start_promotion(self, version: str, rollback: bool = False) -> None:
+        """
+        Verify a version and load it in a background thread.
+
+        Raises:
+            ValueError: unknown version or failed manifest verification
+            RuntimeError: another promotion is still loading
+        """
+        manifest = self.registry.verify(version, MODEL_FEATURES)
+        if not self._reload_lock.acquire(blocking=False):
+            raise RuntimeError(f"Model version {self.model_reload['version']} is still loading")
+        self.model_reload.update(state="loading", version=version, error=None, finished_at=None)
+        threading.Thread(
+            target=self._promote, args=(version, manifest, rollback), name="model-promote", daemon=True
+        ).start()
+
+    def _promote(self, version: str, manifest: Optional[dict], rollback: bool) -> None:
+        try:
+            bundle = self._new_bundle(version, manifest)
+            bundle.warm_up()
+            # Never swap in a version that serves less than the current one
+            lost = [
+                name for name in ARTIFACTS
+                if bundle.model_state[name]["state"] != "ready" and self.bundle.model_state[name]["state"] == "ready"
+            ]
+            if lost:
+                raise ValueError("Failed to load " + ", ".join(
+                    f"{name} ({bundle.model_state[name]['error']})" for name in lost
+                ))
+            self.bundle = bundle
+            self.registry.set_active(version, rollback=rollback)
+            self.model_reload.update(state="ready")
+            print(f"Model version {version} is now active.")
+        except Exception as e:
+            print(f"Model version {version} was not activated: {e}")
+            self.model_reload.update(state="failed", error=str(e))
+        finally:
+            self.model_reload["finished_at"] = datetime.now().isoformat()
+            self._reload_lock.release()
+
+    # --- Predictions ---
+
     def predict_stage(self, crop_name: str, cumulative_gdd: float):
+        m = self.bundle
+        gdd_crop_enc = m.gdd_crop_le.encode(crop_name)
+        if gdd_crop_enc is None:
+            return "Vegetative"
         try:
-            gdd_crop_enc = self.gdd_crop_le.transform([crop_name])[0]
             gdd_input = np.array([[gdd_crop_enc, cumulative_gdd]])
-            predicted_stage_idx = self.gdd_model.predict(gdd_input)[0]
-            return self.gdd_stage_le.inverse_transform([predicted_stage_idx])[0]
+            return prediction_cache.get_or_compute(
+                "gdd_model", m.cache_version("gdd_model"), gdd_input,
+                lambda: m.gdd_stage_le.decode(m.gdd_forest.predict(gdd_input)[0])
+            )
         except Exception as e:
             print(f"Phenology prediction error: {e}")
             return "Vegetative"
@@ -78,58 +325,105 @@ class AIPipelineService:
             lstm_input = historical_features.reshape(1, 14, 9)
         else:
             lstm_input = historical_features
-            
-        # Ensure input is a pure NumPy float32 array and pass it as a named dict to avoid Keras UserWarnings
-        clean_input = np.array(lstm_input, dtype=np.float32)
-        irrigation_pred = self.irrigation_model.predict({"input_layer": clean_input}, verbose=0)
+
+        irr_prob, irrigation_needed = self.predict_irrigation_batch(lstm_input)[0]
+        return irr_prob, irrigation_needed, lstm_input
+
+    @staticmethod
+    def _score_irrigation(m: ModelBundle, clean_input: np.ndarray):
+        """One model call over (N, 14, 9) float32 -> list of (irr_prob, irrigation_needed)"""
+        # Pass the input as a named dict to avoid Keras UserWarnings
+        irrigation_pred = m.irrigation_model.predict({"input_layer": clean_input}, verbose=0)
         # Handle Logit Explosion: Apply Sigmoid to squish raw math between 0 and 1
-        if irrigation_pred.shape[1] > 1:
-            raw_logit = float(irrigation_pred[0][1])
-        else:
-            raw_logit = float(irrigation_pred[0][0])
-            
-        irr_prob = 1 / (1 + np.exp(-raw_logit))
-        
+        raw_logits = irrigation_pred[:, 1] if irrigation_pred.shape[1] > 1 else irrigation_pred[:, 0]
+        irr_probs = 1 / (1 + np.exp(-raw_logits.astype(np.float64)))
+
         # Decision: If prob > 0.5 OR Soil Moisture (feature index 2) is very low (< 30)
-        current_soil_moisture = lstm_input[0, -1, 2]
-        irrigation_needed = bool(irr_prob > 0.5 or current_soil_moisture < 0.3)
-        return irr_prob, irrigation_needed, lstm_input
+        current_soil_moisture = clean_input[:, -1, 2]
+        return [
+            (float(prob), bool(prob > 0.5 or moisture < 0.3))
+            for prob, moisture in zip(irr_probs, current_soil_moisture)
+        ]
+
+    def predict_irrigation_batch(self, historical_features: np.ndarray):
+        """
+        Input: historical_features: (N, 14, 9), one sequence per field
+        Returns: list of (irr_prob, irrigation_needed); cache misses share a single model call
+        """
+        m = self.bundle
+        clean_input = np.array(historical_features, dtype=np.float32)
+        version = m.cache_version("irrigation_model")
+        keys = [prediction_cache.key("irrigation_model", version, sequence) for sequence in clean_input]
+        results = [prediction_cache.get(key) for key in keys]
+
+        missing = [i for i, (hit, _) in enumerate(results) if not hit]
+        if missing:
+            for i, value in zip(missing, self._score_irrigation(m, clean_input[missing])):
+                prediction_cache.put(keys[i], value)
+                results[i] = (True, value)
+        return [value for _, value in results]
+
+    def _predict_irrigation_rows(self, sequences):
+        """Micro-batcher callback: list of (14, 9) sequences -> predict_irrigation-style tuples"""
+        m = self.bundle
+        batch = np.stack([np.asarray(seq).reshape(14, 9) for seq in sequences]).astype(np.float32)
+        version = m.cache_version("irrigation_model")
+        rows = []
+        for i, value in enumerate(self._score_irrigation(m, batch)):
+            prediction_cache.put(prediction_cache.key("irrigation_model", version, batch[i]), value)
+            rows.append((*value, batch[i:i + 1]))
+        return rows
+
+    async def predict_irrigation_async(self, historical_features: np.ndarray):
+        """
+        predict_irrigation for request handlers. Cached windows return
+        immediately; misses are queued into the micro-batcher so concurrent
+        requests share one batched forward pass. Runs on the event loop, so
+        the cache is only consulted once the model has loaded; before that
+        the batcher loads it on the inference executor.
+        """
+        version = self.bundle.loaded_version("irrigation_model")
+        if version is not None:
+            sequence = np.asarray(historical_features, dtype=np.float32).reshape(14, 9)
+            hit, value = prediction_cache.get(prediction_cache.key("irrigation_model", version, sequence))
+            if hit:
+                return (*value, sequence.reshape(1, 14, 9))
+        return await self.irrigation_batcher.submit(historical_features)
 
     def predict_nutrients(self, crop_name: str, stage: str, field_size_acres: float):
-        try:
-            nut_crop_enc = self.nut_crop_le.transform([crop_name])[0]
-            nut_stage_enc = self.nut_stage_le.transform([stage])[0]
-        except ValueError:
-            nut_crop_enc, nut_stage_enc = 0, 0 # Fallback
+        m = self.bundle
+        nut_crop_enc = m.nut_crop_le.encode(crop_name)
+        nut_stage_enc = m.nut_stage_le.encode(stage)
+        if nut_crop_enc is None or nut_stage_enc is None:
+            nut_crop_enc, nut_stage_enc = UNKNOWN_CATEGORY_CODE, UNKNOWN_CATEGORY_CODE # Fallback
         nut_input = np.array([[nut_crop_enc, nut_stage_enc, field_size_acres]])
-        return self.nutrient_model.predict(nut_input)[0], nut_input
+        nut_pred = prediction_cache.get_or_compute(
+            "nutrient_model", m.cache_version("nutrient_model"), nut_input,
+            lambda: m.nutrient_forest.predict(nut_input)[0]
+        )
+        return nut_pred, nut_input
 
     def predict_pests(self, crop_name: str, stage: str, season: str, temp: float, humidity: float):
-        try:
-            pest_crop_enc = self.pest_crop_le.transform([crop_name])[0]
-            pest_stage_enc = self.pest_stage_le.transform([stage])[0]
-            pest_season_enc = self.pest_season_le.transform([season])[0]
-        except ValueError:
-             pest_crop_enc, pest_stage_enc, pest_season_enc = 0, 0, 0
+        m = self.bundle
+        pest_crop_enc = m.pest_crop_le.encode(crop_name)
+        pest_stage_enc = m.pest_stage_le.encode(stage)
+        pest_season_enc = m.pest_season_le.encode(season)
+        if None in (pest_crop_enc, pest_stage_enc, pest_season_enc):
+            pest_crop_enc = pest_stage_enc = pest_season_enc = UNKNOWN_CATEGORY_CODE
         pest_input = np.array([[pest_crop_enc, pest_stage_enc, pest_season_enc, temp, humidity]])
-        pest_pred_idx = self.pest_model.predict(pest_input)[0]
-        disease_risk = self.pest_label_le.inverse_transform([pest_pred_idx])[0]
+        disease_risk = prediction_cache.get_or_compute(
+            "pest_model", m.cache_version("pest_model"), pest_input,
+            lambda: m.pest_label_le.decode(m.pest_forest.predict(pest_input)[0])
+        )
         return disease_risk, pest_input
 
     def construct_feature_vector(self, temp, humidity, soil_moisture, et0, etc, stage, crop_name, field_size, light):
-        # Encoders were likely trained on Capitalized names
-        crop_name_cap = crop_name.capitalize()
-        stage_cap = stage.capitalize()
-        try:
-            crop_enc = self.nut_crop_le.transform([crop_name_cap])[0]
-            stage_enc = self.nut_stage_le.transform([stage_cap])[0]
-        except:
-            try:
-                # Try lowercase if capitalize fails
-                crop_enc = self.nut_crop_le.transform([crop_name.lower()])[0]
-                stage_enc = self.nut_stage_le.transform([stage.lower()])[0]
-            except:
-                crop_enc, stage_enc = 0, 0
+        m = self.bundle
+        # Encoder tables match names case-insensitively
+        crop_enc = m.nut_crop_le.encode(crop_name)
+        stage_enc = m.nut_stage_le.encode(stage)
+        if crop_enc is None or stage_enc is None:
+            crop_enc, stage_enc = UNKNOWN_CATEGORY_CODE, UNKNOWN_CATEGORY_CODE
             
         return [
             temp, humidity, soil_moisture / 100.0, 
@@ -138,16 +432,13 @@ class AIPipelineService:
         ]
 
     def get_shap_drivers(self, lstm_input, pest_input, nutrient_input=None, spray_context=None):
-        lstm_features = ["Temp", "Humidity", "SoilMoisture", "ET0", "ETc", "Stage", "Type", "FieldSize", "Light"]
-        pest_features = ["Crop_Type", "Crop_Stage", "Season", "Temperature", "Humidity"]
-        nut_features = ["Crop_Type", "Crop_Stage", "Field_Size"]
-        
-        irrigation_shap = self.xai_explainer.extract_top_features_lstm(lstm_input, lstm_features)
-        pest_shap = self.xai_explainer.extract_top_features_rf('pest', pest_input, pest_features)
+        xai_explainer = self.bundle.explainer()
+        irrigation_shap = xai_explainer.extract_top_features_lstm(lstm_input, MODEL_FEATURES["irrigation_model"])
+        pest_shap = xai_explainer.extract_top_features_rf('pest', pest_input, MODEL_FEATURES["pest_model"])
         
         nutrient_shap = {}
         if nutrient_input is not None:
-            nutrient_shap = self.xai_explainer.extract_top_features_rf('nutrient', nutrient_input, nut_features)
+            nutrient_shap = xai_explainer.extract_top_features_rf('nutrient', nutrient_input, MODEL_FEATURES["nutrient_model"])
             
         spraying_shap = {}
         if spray_context:
@@ -0,0 +1,123 @@
+"""
+Compiled Tree Ensembles
+
+Flattens fitted scikit-learn decision trees and random forests (classifier
+or regressor) into concatenated NumPy node arrays and evaluates all trees
+for all rows with one vectorised descent per depth level. sklearn's
+predict on a single row spends milliseconds on input validation and
+joblib dispatch across the estimators; the arrays need none of that.
+
+Results equal sklearn's: inputs are cast to float32 as sklearn's tree code
+does, per-tree class probabilities are normalised the same way and tree
+outputs are accumulated in estimator order before averaging.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+
+class CompiledForest:
+    """
+    predict / predict_proba over flattened trees. Leaves point to
+    themselves, so descending max_depth levels lands every row on a leaf.
+    """
+
+    def __init__(self, trees: List, classes: Optional[np.ndarray], single_tree: bool, n_features_in: int):
+        """
+        Args:
+            trees: Fitted sklearn Tree objects (estimator.tree_)
+            classes: classes_ of a classifier, None for a regressor
+            single_tree: True for a bare DecisionTree* (no averaging, argmax on raw counts)
+            n_features_in: Number of input columns the model was fitted on
+        """
+        self.classes_ = classes
+        self.is_classifier = classes is not None
+        self.single_tree = single_tree
+        self.n_features_in_ = n_features_in
+        self.n_trees = len(trees)
+        self.n_outputs = trees[0].value.shape[1]
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1]
+
+        features, thresholds, lefts, rights, values = [], [], [], [], []
+        for offset, tree in zip(offsets[:-1], trees):
+            index = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, index, tree.children_left + offset))
+            rights.append(np.where(is_leaf, index, tree.children_right + offset))
+            values.append(tree.value)
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        # (nodes, n_outputs, n_classes or 1)
+        self.value = np.concatenate(values).astype(np.float64)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledForest":
+        """
+        Raises:
+            TypeError: model is not a fitted tree or forest of trees
+        """
+        if hasattr(model, "tree_"):
+            estimators, single_tree = [model], True
+        elif hasattr(model, "estimators_") and all(hasattr(e, "tree_") for e in np.ravel(model.estimators_)):
+            estimators, single_tree = list(model.estimators_), False
+        else:
+            raise TypeError(f"Cannot compile {type(model).__name__}: not a decision tree or random forest")
+
+        classes = getattr(model, "classes_", None)
+        if classes is not None and getattr(model, "n_outputs_", 1) != 1:
+            raise TypeError("Multi-output classifiers are not supported")
+        return cls([e.tree_ for e in estimators], classes, single_tree, model.n_features_in_)
+
+    def _leaves(self, X) -> np.ndarray:
+        """Leaf node index per (row, tree)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, model expects {self.n_features_in_}")
+
+        rows = np.arange(len(X))[:, None]
+        node = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def _tree_probas(self, leaves: np.ndarray) -> np.ndarray:
+        # (rows, trees, classes), each tree's leaf distribution normalised to 1
+        counts = self.value[leaves][:, :, 0, :]
+        normalizer = counts.sum(axis=2, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        return counts / normalizer
+
+    def _average(self, per_tree: np.ndarray) -> np.ndarray:
+        # Running sum in estimator order like sklearn (np.sum may add pairwise
+        # and differ in the last bit), then the mean
+        return np.cumsum(per_tree, axis=1)[:, -1] / self.n_trees
+
+    def predict_proba(self, X) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._average(self._tree_probas(self._leaves(X)))
+
+    def predict(self, X) -> np.ndarray:
+        leaves = self._leaves(X)
+        if self.is_classifier:
+            if self.single_tree:
+                scores = self.value[leaves][:, 0, 0, :]
+            else:
+                scores = self._average(self._tree_probas(leaves))
+            return self.classes_.take(np.argmax(scores, axis=1), axis=0)
+
+        outputs = self.value[leaves][..., 0]  # (rows, trees, n_outputs)
+        prediction = outputs[:, 0] if self.single_tree else self._average(outputs)
+        return prediction.ravel() if self.n_outputs == 1 else prediction
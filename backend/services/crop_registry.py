@@ -0,0 +1,125 @@
+"""
+Crop Parameter Registry
+
+Base temperatures, GDD stage bands and crop coefficients for every
+supported crop, loaded from data/crop_registry.json and compiled into
+NumPy lookup tables. Stage and Kc lookups run over whole GDD series with
+np.searchsorted instead of per-day loops over threshold tuples.
+
+Crop codes are the alphabetical index of the crop name, the same order
+scikit-learn's LabelEncoder uses, so the codes of crops the ML models know
+equal their encoder codes. Stage codes index the registry's agronomic
+stages; ml_stage_codes() maps them onto the ML encoders' stage labels.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.storage import load_json
+
+
+CROP_REGISTRY_FILE = "crop_registry.json"
+UNKNOWN_CODE = -1
+
+
+class CropRegistry:
+    """
+    Compiled crop parameters. Every table has a trailing default entry so
+    UNKNOWN_CODE (-1) indexes the defaults without special-casing.
+    """
+
+    def __init__(self, spec: dict):
+        crops = spec.get("crops", {})
+        self.crops: List[str] = sorted(crops)
+        self.stages: List[str] = list(spec.get("stages", {}))
+        self.ml_stages: List[str] = sorted(spec.get("ml_stages", []))
+        self.crop_codes: Dict[str, int] = {name: code for code, name in enumerate(self.crops)}
+        self.stage_codes: Dict[str, int] = {name: code for code, name in enumerate(self.stages)}
+
+        default_kc = spec.get("default_kc", 1.0)
+        self.base_temps = np.array(
+            [crops[c]["base_temp"] for c in self.crops] + [spec.get("default_base_temp", 10)],
+            dtype=np.float64
+        )
+        self.kc_table = np.full((len(self.crops) + 1, len(self.stages) + 1), default_kc, dtype=np.float64)
+
+        # Per crop: band lower bounds, upper bounds and stage code of each band
+        self._lowers: List[np.ndarray] = []
+        self._uppers: List[np.ndarray] = []
+        self._band_stages: List[np.ndarray] = []
+        for code, name in enumerate(self.crops):
+            bands = sorted(crops[name]["gdd_stages"])
+            self._lowers.append(np.array([b[0] for b in bands], dtype=np.float64))
+            self._uppers.append(np.array([b[1] for b in bands], dtype=np.float64))
+            self._band_stages.append(np.array([self.stage_codes[b[2]] for b in bands]))
+            for stage, kc in crops[name].get("kc", {}).items():
+                self.kc_table[code, self.stage_codes[stage]] = kc
+
+        ml_index = {name: code for code, name in enumerate(self.ml_stages)}
+        self._ml_stage_table = np.array(
+            [ml_index.get(spec["stages"][s].get("ml_stage"), UNKNOWN_CODE) for s in self.stages] + [UNKNOWN_CODE]
+        )
+
+    @classmethod
+    def from_file(cls, file_name: str = CROP_REGISTRY_FILE) -> "CropRegistry":
+        return cls(load_json(file_name))
+
+    # --- Codes ---
+
+    def crop_code(self, crop: Optional[str]) -> int:
+        """Integer code for a crop name (case-insensitive), UNKNOWN_CODE if unsupported"""
+        return self.crop_codes.get(str(crop).lower(), UNKNOWN_CODE)
+
+    def stage_code(self, stage: Optional[str]) -> int:
+        """Integer code for an agronomic stage name, UNKNOWN_CODE if unknown"""
+        return self.stage_codes.get(str(stage).lower(), UNKNOWN_CODE)
+
+    def encode_crops(self, crops) -> np.ndarray:
+        return np.array([self.crop_code(c) for c in np.atleast_1d(crops)])
+
+    def encode_stages(self, stages) -> np.ndarray:
+        return np.array([self.stage_code(s) for s in np.atleast_1d(stages)])
+
+    def stage_name(self, code: int) -> str:
+        return self.stages[code] if 0 <= code < len(self.stages) else "unknown"
+
+    def ml_stage_codes(self, stage_codes) -> np.ndarray:
+        """Agronomic stage codes -> ML encoder stage codes (UNKNOWN_CODE if unmapped)"""
+        return self._ml_stage_table[np.asarray(stage_codes)]
+
+    # --- Lookups ---
+
+    def base_temp(self, crop_codes) -> np.ndarray:
+        return self.base_temps[np.asarray(crop_codes)]
+
+    def kc(self, crop_codes, stage_codes) -> np.ndarray:
+        return self.kc_table[np.asarray(crop_codes), np.asarray(stage_codes)]
+
+    def stage_codes_for(self, crop_code: int, cumulative_gdd) -> np.ndarray:
+        """
+        Stage code for each value of a cumulative GDD series of one crop.
+        Values outside every band (or an unknown crop) give UNKNOWN_CODE.
+        """
+        gdd = np.asarray(cumulative_gdd, dtype=np.float64)
+        if crop_code == UNKNOWN_CODE:
+            return np.full(gdd.shape, UNKNOWN_CODE)
+
+        lowers, uppers = self._lowers[crop_code], self._uppers[crop_code]
+        band = np.searchsorted(uppers, gdd, side="right")
+        inside = (band < len(uppers)) & (gdd >= lowers[np.minimum(band, len(uppers) - 1)])
+        return np.where(inside, self._band_stages[crop_code][np.minimum(band, len(uppers) - 1)], UNKNOWN_CODE)
+
+    def thresholds(self, crop: str) -> List[Tuple[float, float, str]]:
+        """(lower, upper, stage) bands for a crop, as in the data file"""
+        code = self.crop_code(crop)
+        if code == UNKNOWN_CODE:
+            return []
+        return [
+            (lo, hi, self.stages[s]) for lo, hi, s in
+            zip(self._lowers[code].tolist(), self._uppers[code].tolist(), self._band_stages[code].tolist())
+        ]
+
+
+# Global registry instance
+crop_registry = CropRegistry.from_file()
@@ -14,6 +14,9 @@ db = client[DB_NAME]
 # Collections
 daily_telemetry_collection = db["DailyTelemetry"]
 sensor_raw_collection = db["SensorRaw"]
+gdd_checkpoint_collection = db["GddCheckpoints"]
+field_state_collection = db["FieldState"]
+weather_history_collection = db["WeatherHistory"]
 
 async def get_db():
     return db
@@ -0,0 +1,126 @@
+"""
+Sensor Series Downsampling
+
+Server-side reduction of raw sensor history for charting.
+Supports MongoDB time-bucket averages and Largest-Triangle-Three-Buckets
+(LTTB) point selection, so long ranges load a few hundred points.
+"""
+
+from typing import List, Dict, Optional
+from utils.helpers import parse_datetime
+
+
+# Numeric sensor columns that can be averaged or downsampled
+SENSOR_METRICS = [
+    "air_temp",
+    "air_humidity",
+    "soil_temp",
+    "soil_moisture",
+    "light_lux",
+    "wind_speed",
+    "battery_v",
+    "wifi_rssi"
+]
+
+RESOLUTIONS = ("raw", "bucket", "lttb")
+
+
+def build_bucket_pipeline(match: Dict, max_points: int) -> List[Dict]:
+    """
+    Build an aggregation pipeline that averages readings into time buckets
+
+    Args:
+        match: MongoDB match filter (node and timestamp range)
+        max_points: Number of buckets to produce
+
+    Returns:
+        Aggregation pipeline; each output document has the bucket's first
+        timestamp and the average of every sensor metric
+    """
+    output = {"timestamp": {"$min": "$timestamp"}}
+    for metric in SENSOR_METRICS:
+        output[metric] = {"$avg": f"${metric}"}
+
+    return [
+        {"$match": match},
+        {"$bucketAuto": {
+            "groupBy": "$timestamp",
+            "buckets": max_points,
+            "output": output
+        }},
+        {"$project": {"_id": 0}}
+    ]
+
+
+def _row_x(row: Dict, index: int) -> float:
+    """Timestamp of a row as epoch seconds, falling back to its index"""
+    parsed = parse_datetime(str(row.get("timestamp", "")))
+    return parsed.timestamp() if parsed else float(index)
+
+
+def _row_y(row: Dict, metric: str) -> float:
+    value = row.get(metric)
+    try:
+        return float(value) if value is not None else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def lttb_downsample(rows: List[Dict], threshold: int, metric: str = "soil_moisture") -> List[Dict]:
+    """
+    Downsample readings with Largest-Triangle-Three-Buckets
+
+    Point selection is driven by one metric; the selected rows are returned
+    whole so every series in the chart stays aligned on the same timestamps.
+
+    Args:
+        rows: Readings sorted by timestamp ascending
+        threshold: Maximum number of rows to return
+        metric: Sensor column used to pick visually significant points
+
+    Returns:
+        Subset of rows (first and last always kept)
+    """
+    n = len(rows)
+    if threshold >= n or threshold < 3:
+        return rows
+
+    xs = [_row_x(row, i) for i, row in enumerate(rows)]
+    ys = [_row_y(row, metric) for row in rows]
+
+    sampled = [rows[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average point of the next bucket acts as the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # Pick the point in the current bucket forming the largest triangle
+        start = int(i * bucket_size) + 1
+        stop = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        max_area = -1.0
+        chosen = start
+        for j in range(start, stop):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                chosen = j
+
+        sampled.append(rows[chosen])
+        a = chosen
+
+    sampled.append(rows[-1])
+    return sampled
+
+
+def validate_resolution(resolution: str) -> Optional[str]:
+    """Return an error message if the resolution is unsupported"""
+    if resolution not in RESOLUTIONS:
+        return f"Invalid resolution '{resolution}'. Use one of: {', '.join(RESOLUTIONS)}"
+    return None
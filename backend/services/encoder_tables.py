@@ -0,0 +1,45 @@
+"""
+Compiled Label Encoder Tables
+
+The fitted scikit-learn LabelEncoders in ml_models/ are compiled into
+plain dict / list lookups when they are loaded. LabelEncoder.transform on
+a one-element list spends far longer validating its input than looking
+the label up, and the feature builders call it for every sequence step.
+
+Lookups are case-insensitive ("rice", "RICE" and "Rice" are one label);
+unknown labels return the caller's default instead of raising.
+"""
+
+from typing import Dict, List, Optional
+
+
+class EncoderTable:
+    """
+    Label <-> code lookup equivalent to a fitted LabelEncoder.
+    """
+
+    def __init__(self, classes):
+        self.classes_: List[str] = [str(c) for c in classes]
+        self._codes: Dict[str, int] = {label.lower(): code for code, label in enumerate(self.classes_)}
+        if len(self._codes) != len(self.classes_):
+            raise ValueError(f"Labels differ only by case: {self.classes_}")
+
+    @classmethod
+    def from_encoder(cls, encoder) -> "EncoderTable":
+        return cls(encoder.classes_)
+
+    def encode(self, label, default: Optional[int] = None) -> Optional[int]:
+        """Code of a label (any case), or default if the encoder never saw it"""
+        if label is None:
+            return default
+        return self._codes.get(str(label).strip().lower(), default)
+
+    def decode(self, code) -> str:
+        """Label of a code produced by the model (LabelEncoder.inverse_transform)"""
+        return self.classes_[int(code)]
+
+    def __contains__(self, label) -> bool:
+        return self.encode(label) is not None
+
+    def __len__(self) -> int:
+        return len(self.classes_)
@@ -0,0 +1,311 @@
+"""
+Per-Field Agronomic & ML State
+
+Shared computation behind the dashboard, reasoning, transparency and chat
+endpoints: 14-day agronomic history from the engine plus the Bi-LSTM
+irrigation, RF nutrient and RF pest predictions.
+
+Concurrent requests for the same field and data version are coalesced
+through a single-flight layer, so a page that fires all tabs at once runs
+the engine and models only once. A scheduled batch job materializes the
+state and dashboard cards for every field into the FieldState collection.
+"""
+
+import json
+import numpy as np
+from datetime import datetime
+from typing import List, Optional
+
+from models.schemas import FieldResponse
+from services.agronomic_engine import compute_telemetry_history, enrich_telemetry_history
+from services.ai_pipeline_service import ai_pipeline
+from services.database import field_state_collection
+from services.field_state_store import field_state_version, is_fresh, reset_stale_marks, save_field_state
+from services.geocode_cache import stored_user_coordinates
+from services.inference_executor import inference_executor
+from services.market_integration import MarketIntegrationModule
+from services.sensor_cache import last_value_cache
+from services.single_flight import SingleFlight
+from services.storage import load_json
+from services.ui_mapper import format_dashboard_json
+from utils.helpers import get_timestamp
+
+
+FIELD_STATE_NIGHTLY_HOUR = 2            # Full recompute at 02:00
+FIELD_STATE_REFRESH_MINUTES = 15        # Incremental pass over stale fields
+
+field_state_flight = SingleFlight()
+
+
+def current_season(now: Optional[datetime] = None) -> str:
+    """Season approximation used by the pest model"""
+    now = now or datetime.now()
+    return "Kharif" if 6 <= now.month <= 10 else "Rabi"
+
+
+def field_data_version(field, lat: Optional[float] = None, lon: Optional[float] = None) -> str:
+    """
+    Key identifying the inputs of a field's state: field settings, location,
+    the day, and the newest sensor reading seen by this process.
+    """
+    latest = last_value_cache.get(field.sensor_node_id) or {}
+    return "|".join(str(part) for part in (
+        field.field_id, field_state_version(field, lat, lon), latest.get("timestamp", "")
+    ))
+
+
+def build_lstm_sequence(field, history: List[dict], predicted_stage: str) -> np.ndarray:
+    """
+    (14, 9) Bi-LSTM input for a field's history; shorter histories are padded
+    by duplicating the oldest known day backward. Encodes through the label
+    encoders, which may load on first use: call it on the inference executor.
+    """
+    padded_history = list(history[-14:])
+    while len(padded_history) < 14:
+        padded_history.insert(0, padded_history[0])
+
+    return np.array([
+        ai_pipeline.construct_feature_vector(
+            day.get("t_avg", 25), day.get("humidity", 60), day.get("soil_moisture", 50),
+            day.get("et0", 4), day.get("etc", 4), day.get("stage", predicted_stage),
+            field.crop, field.area_acres, day.get("solar_radiation", 15) * 1000 # Convert back to lux for the model
+        ) for day in padded_history
+    ])
+
+
+def _predict_rf(field, state: dict) -> None:
+    """Add the RF pest and nutrient outputs for the state's current day"""
+    current_day = state["history"][-1]
+    season = current_season()
+    disease_risk, pest_input = ai_pipeline.predict_pests(
+        field.crop, state["predicted_stage"], season,
+        current_day.get("t_avg", 25), current_day.get("humidity", 60)
+    )
+    nut_pred, nutrient_input = ai_pipeline.predict_nutrients(
+        field.crop, state["predicted_stage"], field.area_acres
+    )
+    state.update({
+        "current_day": current_day,
+        "season": season,
+        "disease_risk": disease_risk,
+        "pest_input": pest_input,
+        "nut_pred": nut_pred,
+        "nutrient_input": nutrient_input
+    })
+
+
+async def compute_field_state(field, farmer_location: str, lat: Optional[float] = None, lon: Optional[float] = None) -> dict:
+    """
+    Run the agronomic engine (read-only) and all three models for a field.
+
+    Returns:
+        Dictionary with history, cumulative_gdd, predicted_stage and, when
+        history exists, the model outputs and their raw inputs (for SHAP)
+    """
+    engine = await compute_telemetry_history(field, farmer_location, lat, lon)
+    history_last_14 = engine["history"]
+    predicted_stage = engine["stage"]
+    state = {
+        "history": history_last_14,
+        "cumulative_gdd": engine["cumulative_gdd"],
+        "predicted_stage": predicted_stage
+    }
+    if not history_last_14:
+        return state
+
+    sequence = await inference_executor.run(build_lstm_sequence, field, history_last_14, predicted_stage)
+    irr_prob, irrigation_needed, lstm_input = await ai_pipeline.predict_irrigation_async(sequence)
+    state.update({
+        "irr_prob": irr_prob,
+        "irrigation_needed": irrigation_needed,
+        "lstm_input": lstm_input
+    })
+    await inference_executor.run(_predict_rf, field, state)
+    return state
+
+
+async def get_field_state(field, farmer_location: str, lat: Optional[float] = None, lon: Optional[float] = None) -> dict:
+    """
+    Field state with concurrent callers coalesced per field and data version.
+    The returned dictionary is shared between callers and must not be mutated.
+    """
+    key = field_data_version(field, lat, lon)
+    return await field_state_flight.do(
+        key, lambda: compute_field_state(field, farmer_location, lat, lon)
+    )
+
+
+def build_dashboard_payload(field, farmer_location: str, state: dict) -> dict:
+    """
+    Phase 5 & 6: Map a field state to dashboard cards plus market economics.
+    """
+    cumulative_gdd = state["cumulative_gdd"]
+    predicted_stage = state["predicted_stage"]
+
+    if not state["history"]:
+        # Emergency empty state if DB is completely empty and Weather API failed
+        return format_dashboard_json(
+            0, False, 0, 0, 0, [0,0,0], "Unknown", field.crop, field.area_acres,
+            "Normal", 25, 60, "Safe", 5
+        )
+
+    irr_prob = state["irr_prob"]
+    irrigation_needed = state["irrigation_needed"]
+    nut_pred = state["nut_pred"]
+    disease_risk = state["disease_risk"]
+
+    # Get current day logic bounds
+    current_day = state["current_day"]
+    temp = current_day.get("t_avg", 25)
+    humidity = current_day.get("humidity", 60)
+    wind_speed = current_day.get("wind_speed", 5.0)
+
+    # Spraying rule evaluation
+    spray_decision = ai_pipeline.spraying_engine.evaluate(wind_speed, humidity, temp)
+
+    # Irrigation Amount Math (ETc - Effective Rain)
+    curr_etc = current_day.get("etc", 0)
+    curr_sm = current_day.get("soil_moisture", 50)
+    # Simple rule: if needed, supply the ETc lost. (Assuming no rain for simple 0ms response).
+    irr_amount_mm = curr_etc if irrigation_needed else 0
+
+    # Phase 5: Python Dictionary Mapper
+    ui_response_payload = format_dashboard_json(
+        irr_prob, irrigation_needed, curr_etc, curr_sm, irr_amount_mm,
+        nut_pred, predicted_stage, field.crop, field.area_acres,
+        disease_risk, temp, humidity, spray_decision, wind_speed
+    )
+
+    # Phase 6: Market Intelligence Sync & Economics
+    try:
+        market_module = MarketIntegrationModule()
+        # Extract district from location string (e.g., "Coimbatore, Tamil Nadu")
+        district = farmer_location.split(',')[0].strip() if farmer_location else None
+
+        market_forecast = market_module.get_price_forecast(field.crop, district)
+        market_economics = market_module.calculate_economics(
+            field.crop,
+            field.area_acres,
+            cumulative_gdd,
+            market_forecast
+        )
+
+        # Merge market results into UI response
+        ui_response_payload = format_dashboard_json(
+            irr_prob, irrigation_needed, curr_etc, curr_sm, irr_amount_mm,
+            nut_pred, predicted_stage, field.crop, field.area_acres,
+            disease_risk, temp, humidity, spray_decision, wind_speed,
+            market_data=market_economics
+        )
+
+        # Add to transparency section
+        ui_response_payload["market_forecast"] = market_forecast
+        ui_response_payload["economics"] = market_economics
+    except Exception as e:
+        print(f"Market Integration skip: {e}")
+
+    # Extra context for transparency
+    ui_response_payload["cumulative_gdd"] = cumulative_gdd
+    return ui_response_payload
+
+
+def _to_document(value):
+    """JSON round-trip that turns NumPy scalars/arrays into plain BSON-safe values"""
+    def default(obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        raise TypeError(f"Not serializable: {type(obj).__name__}")
+    return json.loads(json.dumps(value, default=default))
+
+
+def _predict_all(jobs: list) -> None:
+    # One Bi-LSTM call for every field, then the per-field RF models
+    sequences = np.stack([
+        build_lstm_sequence(field, state["history"], state["predicted_stage"])
+        for field, _, _, state in jobs
+    ])
+    for (field, _, _, state), (irr_prob, irrigation_needed) in zip(
+        jobs, ai_pipeline.predict_irrigation_batch(sequences)
+    ):
+        state["irr_prob"] = irr_prob
+        state["irrigation_needed"] = irrigation_needed
+        _predict_rf(field, state)
+
+
+async def precompute_field_states(only_stale: bool = False) -> int:
+    """
+    Materialize history, predictions and dashboard cards for every field.
+
+    The engine runs per field (it is I/O bound); the Bi-LSTM runs once for
+    all fields as a single (N, 14, 9) batch.
+
+    Args:
+        only_stale: Skip fields whose stored state is still fresh
+
+    Returns:
+        Number of fields recomputed
+    """
+    reset_stale_marks()
+    started_at = get_timestamp()
+    fields = [FieldResponse(**f) for f in load_json("fields.json").get("fields", [])]
+    users = {u.get("user_id"): u for u in load_json("users.json").get("users", [])}
+
+    stored = {}
+    if only_stale:
+        cursor = field_state_collection.find({}, {"field_id": 1, "version": 1, "computed_at": 1, "stale_at": 1})
+        stored = {doc["field_id"]: doc async for doc in cursor}
+
+    jobs = []
+    for field in fields:
+        farmer_user = users.get(field.farmer_id)
+        farmer_location = farmer_user.get("location", "") if farmer_user else ""
+        lat, lon = stored_user_coordinates(farmer_user)
+        version = field_state_version(field, lat, lon)
+        if only_stale and is_fresh(stored.get(field.field_id), version):
+            continue
+
+        try:
+            history, cumulative_gdd, predicted_stage = await enrich_telemetry_history(
+                field, farmer_location, lat, lon
+            )
+        except Exception as e:
+            print(f"Field state precompute failed for {field.field_id}: {e}")
+            continue
+        jobs.append((field, farmer_location, version, {
+            "history": history,
+            "cumulative_gdd": cumulative_gdd,
+            "predicted_stage": predicted_stage
+        }))
+
+    with_history = [job for job in jobs if job[3]["history"]]
+    if with_history:
+        # One executor call for the whole pass; background job, so no timeout
+        await inference_executor.run(_predict_all, with_history, timeout=None)
+
+    for field, farmer_location, version, state in jobs:
+        document = {
+            key: state[key] for key in (
+                "history", "cumulative_gdd", "predicted_stage",
+                "irr_prob", "irrigation_needed", "disease_risk", "nut_pred"
+            ) if key in state
+        }
+        document["dashboard"] = build_dashboard_payload(field, farmer_location, state)
+        await save_field_state(field, version, started_at, _to_document(document))
+
+    print(f"Precomputed field state for {len(jobs)} field(s).")
+    return len(jobs)
+
+
+async def refresh_stale_field_states() -> int:
+    """Incremental pass: recompute fields with new data, new settings or no state yet"""
+    return await precompute_field_states(only_stale=True)
+
+
+def schedule_field_state_precompute(scheduler):
+    # Full nightly rebuild, plus frequent incremental refresh of stale fields
+    scheduler.add_job(precompute_field_states, 'cron', hour=FIELD_STATE_NIGHTLY_HOUR, minute=0)
+    scheduler.add_job(refresh_stale_field_states, 'interval', minutes=FIELD_STATE_REFRESH_MINUTES)
+    print(f"Scheduled field state precompute at {FIELD_STATE_NIGHTLY_HOUR:02d}:00 daily "
+          f"and every {FIELD_STATE_REFRESH_MINUTES} minutes for stale fields.")
@@ -0,0 +1,97 @@
+"""
+Materialized Field State Store
+
+Precomputed per-field dashboard state in the FieldState collection. The
+scheduler writes it; ingestion marks it stale; the dashboard serves it
+when it is fresh and was computed for the field's current settings.
+"""
+
+from datetime import datetime
+from typing import Optional, Set
+
+from services.ai_pipeline_service import ai_pipeline
+from services.database import field_state_collection
+from utils.helpers import get_timestamp
+
+
+# Sensor nodes whose states were marked stale since the last precompute pass;
+# ingestion skips the write for them, so each node costs one write per pass
+_stale_nodes: Set[str] = set()
+
+
+def field_state_version(field, lat: Optional[float] = None, lon: Optional[float] = None) -> str:
+    """
+    Identity of the inputs a precomputed state was built from: field
+    settings, location, the day (history windows roll over at midnight)
+    and the active model version.
+    """
+    return "|".join(str(part) for part in (
+        field.crop, field.sowing_date, field.area_acres, field.sensor_node_id,
+        lat, lon, datetime.now().strftime("%Y-%m-%d"), ai_pipeline.model_version
+    ))
+
+
+def is_fresh(doc: Optional[dict], version: str) -> bool:
+    """True if a stored state matches version and no reading arrived after it was computed"""
+    if not doc or doc.get("version") != version:
+        return False
+    return doc.get("stale_at", "") <= doc.get("computed_at", "")
+
+
+async def load_fresh_field_state(field, lat: Optional[float] = None, lon: Optional[float] = None) -> Optional[dict]:
+    """
+    Get a field's precomputed state if it is still valid.
+
+    Returns:
+        FieldState document, or None if missing, stale or for other settings
+    """
+    doc = await field_state_collection.find_one({"field_id": field.field_id}, {"_id": 0})
+    return doc if is_fresh(doc, field_state_version(field, lat, lon)) else None
+
+
+async def save_field_state(field, version: str, computed_at: str, state: dict) -> None:
+    """
+    Upsert a field's precomputed state.
+
+    Args:
+        field: Field the state belongs to
+        version: field_state_version() the state was computed for
+        computed_at: Timestamp taken before the computation started, so
+            readings ingested meanwhile still mark it stale
+        state: JSON-serializable state (history, predictions, dashboard)
+    """
+    await field_state_collection.update_one(
+        {"field_id": field.field_id},
+        {"$set": {
+            **state,
+            "field_id": field.field_id,
+            "sensor_node_id": field.sensor_node_id,
+            "version": version,
+            "computed_at": computed_at
+        }},
+        upsert=True
+    )
+
+
+async def mark_field_states_stale(sensor_node_id: str) -> None:
+    """Flag every field state fed by a sensor node for recomputation (once per precompute pass)"""
+    if sensor_node_id in _stale_nodes:
+        return
+    await field_state_collection.update_many(
+        {"sensor_node_id": sensor_node_id},
+        {"$set": {"stale_at": get_timestamp()}}
+    )
+    _stale_nodes.add(sensor_node_id)
+
+
+def reset_stale_marks() -> None:
+    """
+    Start of a precompute pass: call before taking its computed_at, so any
+    reading from then on marks the states it saves stale again.
+    """
+    _stale_nodes.clear()
+
+
+async def delete_field_state(field_id: str) -> None:
+    """Remove a field's precomputed state"""
+    await field_state_collection.delete_many({"field_id": field_id})
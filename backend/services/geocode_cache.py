@@ -0,0 +1,175 @@
+"""
+Persistent Geocoding Cache
+
+File-backed cache in front of the OpenWeather geocoding API, keyed by the
+normalized location string. Farmer locations almost never change, so hits
+are kept for months; names the API has no match for are cached briefly to
+avoid hammering it. Timeouts, HTTP errors and a missing API key are not
+cached, so the next request retries.
+"""
+
+import time
+from typing import Dict, Iterable, Optional, Tuple, Any
+
+from services.storage import load_json, save_json
+from services.weather_service import lookup_coordinates
+
+
+GEOCODE_CACHE_FILE = "geocode_cache.json"
+GEOCODE_TTL_SECONDS = 90 * 86400        # 90 days
+GEOCODE_NEGATIVE_TTL_SECONDS = 86400    # 1 day
+
+
+def normalize_location(location: str) -> str:
+    """Case- and whitespace-insensitive cache key for a location string"""
+    return " ".join((location or "").lower().replace(",", ", ").split())
+
+
+class GeocodeCache:
+    """
+    Location string -> coordinates, persisted to data/geocode_cache.json.
+    """
+
+    def __init__(self):
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = load_json(GEOCODE_CACHE_FILE).get("entries", {})
+        return self._entries
+
+    def _save(self) -> None:
+        save_json(GEOCODE_CACHE_FILE, {"entries": self._load()})
+
+    def get(self, location: str) -> Tuple[bool, Optional[Dict[str, float]]]:
+        """
+        Look up a location.
+
+        Args:
+            location: Location string as entered by the farmer
+
+        Returns:
+            Tuple of (hit, coordinates); a hit with None coordinates is a
+            cached negative result
+        """
+        entry = self._load().get(normalize_location(location))
+        if not entry:
+            return False, None
+
+        ttl = GEOCODE_TTL_SECONDS if entry.get("coords") else GEOCODE_NEGATIVE_TTL_SECONDS
+        if time.time() - entry.get("cached_at", 0) > ttl:
+            return False, None
+
+        return True, entry.get("coords")
+
+    def set(self, location: str, coords: Optional[Dict[str, float]]) -> None:
+        """
+        Store a geocoding result (None for not found) and persist it.
+
+        Args:
+            location: Location string as entered by the farmer
+            coords: {"lat", "lon", "name"} or None
+        """
+        self._load()[normalize_location(location)] = {
+            "coords": coords,
+            "cached_at": time.time()
+        }
+        self._save()
+
+    async def resolve(self, location: str) -> Optional[Dict[str, float]]:
+        """
+        Get coordinates for a location, calling the geocoding API on a miss.
+
+        Args:
+            location: Location string as entered by the farmer
+
+        Returns:
+            {"lat", "lon", "name"} or None if the location cannot be resolved
+        """
+        if not location:
+            return None
+
+        hit, coords = self.get(location)
+        if hit:
+            return coords
+
+        try:
+            coords = await lookup_coordinates(location)
+        except Exception as e:
+            print(f"Geocoding error for {location}: {e}")
+            return None
+        self.set(location, coords)
+        return coords
+
+
+# Global cache instance
+geocode_cache = GeocodeCache()
+
+
+def stored_user_coordinates(user: Optional[dict]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Coordinates saved on a user record, if they still match the user's location.
+
+    Args:
+        user: User record from users.json
+
+    Returns:
+        Tuple of (lat, lon), or (None, None) if not stored or stale
+    """
+    if not user or user.get("geocoded_location") != user.get("location"):
+        return None, None
+    return user.get("latitude"), user.get("longitude")
+
+
+def clear_user_coordinates(user: dict) -> None:
+    """Drop stored coordinates from a user record (e.g. its location changed)"""
+    for key in ("latitude", "longitude", "geocoded_location"):
+        user.pop(key, None)
+
+
+async def geocode_user_locations(user_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Resolve farmer locations and store the coordinates on the user records
+    so request paths need no geocoding call.
+
+    Args:
+        user_ids: Users to geocode (default: every user without coordinates)
+
+    Returns:
+        Number of users whose coordinates were stored
+    """
+    wanted = set(user_ids) if user_ids is not None else None
+    users = load_json("users.json").get("users", [])
+    resolved = {}
+
+    for user in users:
+        location = user.get("location")
+        if wanted is not None and user.get("user_id") not in wanted:
+            continue
+        if not location or stored_user_coordinates(user) != (None, None):
+            continue
+        try:
+            coords = await geocode_cache.resolve(location)
+        except Exception as e:
+            print(f"Geocode pre-warm failed for {location}: {e}")
+            continue
+        if coords:
+            resolved[user.get("user_id")] = (location, coords)
+
+    if resolved:
+        # Re-read so users created or edited while geocoding are not overwritten
+        users_data = load_json("users.json")
+        for user in users_data.get("users", []):
+            location, coords = resolved.get(user.get("user_id"), (None, None))
+            if coords and user.get("location") == location:
+                user["latitude"] = coords["lat"]
+                user["longitude"] = coords["lon"]
+                user["geocoded_location"] = location
+        save_json("users.json", users_data)
+    return len(resolved)
+
+
+async def prewarm_geocode_cache() -> None:
+    """Geocode every farmer location at startup"""
+    await geocode_user_locations()
+    print(f"Geocode cache pre-warmed for {len(load_json('users.json').get('users', []))} user(s).")
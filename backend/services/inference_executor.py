@@ -0,0 +1,133 @@
+"""
+Inference Executor
+
+Dedicated thread pool for CPU-bound model work (Bi-LSTM batches, forest
+predictions, SHAP explanations) so request handlers await it instead of
+blocking the event loop that also serves auth and sensor ingestion.
+
+TensorFlow, NumPy and the SHAP kernels release the GIL, so threads run in
+parallel; TensorFlow's own thread pools are capped (INFERENCE_TF_THREADS)
+so the workers do not oversubscribe the CPU. A process pool would need
+every model loaded once per worker, TensorFlow included.
+
+Work beyond INFERENCE_WORKERS running + INFERENCE_MAX_QUEUE waiting is
+rejected immediately, and callers stop waiting after a per-call timeout.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "64"))
+INFERENCE_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "30"))
+SHAP_TIMEOUT_SECONDS = float(os.getenv("SHAP_TIMEOUT_SECONDS", "60"))
+
+
+class InferenceOverloadedError(RuntimeError):
+    """The executor's queue is full; the caller should retry later"""
+
+
+class InferenceTimeoutError(TimeoutError):
+    """The caller stopped waiting for an inference call"""
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool with per-call timeouts.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_WORKERS, max_queue: int = INFERENCE_MAX_QUEUE,
+                 timeout_seconds: float = INFERENCE_TIMEOUT_SECONDS):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = self.max_workers + max(0, max_queue)
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._max_pending_seen = 0
+
+    def _timed(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._busy_seconds += time.perf_counter() - started
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = -1, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool and await its result.
+
+        Args:
+            timeout: Seconds to wait; -1 uses the executor default, None waits indefinitely
+
+        Raises:
+            InferenceOverloadedError: too much work is already queued
+            InferenceTimeoutError: no result within the timeout (a call that
+                already started keeps its worker until it finishes)
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise InferenceOverloadedError(
+                    f"Inference queue is full ({self._pending} calls pending); try again shortly"
+                )
+            self._pending += 1
+            self._max_pending_seen = max(self._max_pending_seen, self._pending)
+
+        future = self._pool.submit(self._timed, fn, args, kwargs)
+        future.add_done_callback(self._release)
+
+        if timeout == -1:
+            timeout = self.timeout_seconds
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # Drops the call if it has not started yet
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise InferenceTimeoutError(f"{getattr(fn, '__name__', 'inference')} timed out after {timeout}s")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and outcome counters since startup"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "max_pending_seen": self._max_pending_seen,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "busy_seconds": round(self._busy_seconds, 3)
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global inference executor instance
+inference_executor = InferenceExecutor()
@@ -1,6 +1,10 @@
 import numpy as np
 from datetime import datetime
 from services.database import sensor_raw_collection, daily_telemetry_collection
+from services.sensor_cache import last_value_cache
+from services.rolling_aggregates import rolling_aggregates
+from services.live_updates import sensor_event_hub
+from services.field_state_store import mark_field_states_stale
 import asyncio
 
 async def validate_and_ingest(sensor_data: dict):
@@ -62,9 +66,13 @@ async def validate_and_ingest(sensor_data: dict):
 
     # 2. Insert Valid Data exactly as received
     await sensor_raw_collection.insert_one(sensor_data)
+    last_value_cache.update(sensor_data)
+    rolling_aggregates.add_reading(sensor_data)
+    sensor_event_hub.publish(sensor_data)
     
     # 3. Temporal Aggregation (Update DailyTelemetry)
     await update_daily_aggregation(sensor_data)
+    await mark_field_states_stale(node_id)
     
     # 4. Emergency Thresholds (Proactive Twilio Alerts)
     moisture = float(sensor_data.get("soil_moisture", 50))
@@ -165,3 +173,8 @@ async def update_daily_aggregation(sensor_data: dict):
         {"$set": day_record},
         upsert=True
     )
+    
+    # A late reading revises a past day: cumulative GDD checkpoints from that day on are stale
+    if date_str < datetime.now().strftime("%Y-%m-%d"):
+        from services.agronomic_engine import invalidate_gdd_checkpoints
+        await invalidate_gdd_checkpoints(sensor_node_id=node_id, from_date=date_str)
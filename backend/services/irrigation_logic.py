@@ -1,61 +1,29 @@
 import math
+import numpy as np
+
+from services.crop_registry import crop_registry, UNKNOWN_CODE
 
 # ==========================================================
-# 1️⃣ BASE TEMPERATURES (°C)
+# 1️⃣-3️⃣ CROP PARAMETERS
 # ==========================================================
+# Base temperatures (°C), GDD stage thresholds and crop coefficients (Kc)
+# live in data/crop_registry.json; these dict views are kept for callers.
 BASE_TEMP = {
-    "rice": 10,
-    "wheat": 5,
-    "groundnut": 10,
-    "sugarcane": 12
+    crop: float(crop_registry.base_temps[code]) for crop, code in crop_registry.crop_codes.items()
 }
 
-# ==========================================================
-# 2️⃣ GDD THRESHOLDS
-# ==========================================================
-GDD_THRESHOLDS = {
-    "rice": [
-        (0, 300, "initial"),
-        (300, 900, "vegetative"),
-        (900, 1200, "flowering"),
-        (1200, 2000, "maturity")
-    ],
-    "wheat": [
-        (0, 200, "initial"),
-        (200, 800, "vegetative"),
-        (800, 1100, "flowering"),
-        (1100, 1800, "maturity")
-    ],
-    "groundnut": [
-        (0, 250, "initial"),
-        (250, 700, "vegetative"),
-        (700, 1100, "flowering"),
-        (1100, 1600, "maturity")
-    ],
-    "sugarcane": [
-        (0, 500, "initial"),
-        (500, 2000, "vegetative"),
-        (2000, 4000, "grand_growth"),
-        (4000, 6000, "maturity")
-    ]
-}
+GDD_THRESHOLDS = {crop: crop_registry.thresholds(crop) for crop in crop_registry.crops}
 
-# ==========================================================
-# 3️⃣ CROP COEFFICIENTS (Kc)
-# ==========================================================
 KC_VALUES = {
-    "rice": {"initial": 1.05, "vegetative": 1.10, "flowering": 1.20, "maturity": 0.90},
-    "wheat": {"initial": 0.70, "vegetative": 1.05, "flowering": 1.15, "maturity": 0.80},
-    "groundnut": {"initial": 0.60, "vegetative": 0.95, "flowering": 1.10, "maturity": 0.85},
-    "sugarcane": {"initial": 0.40, "vegetative": 1.00, "flowering": 1.25, "maturity": 1.15}
+    crop: {stage: float(crop_registry.kc(code, crop_registry.stage_code(stage))) for _, _, stage in GDD_THRESHOLDS[crop]}
+    for crop, code in crop_registry.crop_codes.items()
 }
 
 # ==========================================================
 # 4️⃣ DAILY GDD CALCULATION
 # ==========================================================
 def calculate_daily_gdd(tmax, tmin, crop):
-    crop = crop.lower()
-    base_temp = BASE_TEMP.get(crop, 10) # Default to 10 if crop not found
+    base_temp = float(crop_registry.base_temp(crop_registry.crop_code(crop))) # Registry default if crop not found
 
     # Limit unrealistic values
     tmax = min(tmax, 45)
@@ -85,18 +53,12 @@ def calculate_cumulative_gdd(weather_history, crop):
 # 6️⃣ STAGE ESTIMATION
 # ==========================================================
 def estimate_stage(crop, cumulative_gdd):
-    crop = crop.lower()
-    
-    thresholds = GDD_THRESHOLDS.get(crop)
-    if not thresholds:
+    stage_code = int(crop_registry.stage_codes_for(crop_registry.crop_code(crop), cumulative_gdd))
+    if stage_code == UNKNOWN_CODE:
         return "unknown", 50
 
-    for lower, upper, stage in thresholds:
-        if lower <= cumulative_gdd < upper:
-            confidence = 85
-            return stage, confidence
-
-    return "unknown", 50
+    confidence = 85
+    return crop_registry.stage_name(stage_code), confidence
 
 
 # ==========================================================
@@ -143,16 +105,132 @@ def calculate_et0(
 # 8️⃣ ETc CALCULATION
 # ==========================================================
 def calculate_etc(crop, stage, et0):
-    crop = crop.lower()
-    stage = stage.lower()
-    
-    crop_kc = KC_VALUES.get(crop, {})
-    kc = crop_kc.get(stage, 1.0) # Default to 1.0 if not found
+    kc = float(crop_registry.kc(crop_registry.crop_code(crop), crop_registry.stage_code(stage))) # Registry default if not found
     
     etc = et0 * kc
     return round(etc, 2), kc
 
 
+# ==========================================================
+# 8️⃣➕ ARRAY KERNELS (NumPy)
+# ==========================================================
+# Same math as the scalar functions above, over whole seasons or many
+# fields at once. Crops and stages are passed as integer registry codes;
+# UNKNOWN_CODE (-1) takes the registry defaults.
+CROP_CODES = crop_registry.crop_codes
+STAGE_CODES = crop_registry.stage_codes
+
+
+def encode_crops(crops):
+    """Crop name(s) -> integer code array (UNKNOWN_CODE if not supported)"""
+    return crop_registry.encode_crops(crops)
+
+
+def encode_stages(stages):
+    """Stage name(s) -> integer code array (UNKNOWN_CODE if not supported)"""
+    return crop_registry.encode_stages(stages)
+
+
+def estimate_stage_array(crop_code, cumulative_gdd):
+    """
+    Vectorized estimate_stage over a cumulative GDD series of one crop.
+
+    Returns:
+        Array of stage codes (UNKNOWN_CODE outside every band)
+    """
+    return crop_registry.stage_codes_for(crop_code, cumulative_gdd)
+
+
+def _as_float_array(values, default):
+    """float64 array with None/NaN replaced by the scalar version's default"""
+    arr = np.array(values, dtype=np.float64)
+    return np.where(np.isnan(arr), default, arr)
+
+
+def calculate_daily_gdd_array(tmax, tmin, crop_codes):
+    """
+    Vectorized calculate_daily_gdd.
+
+    Args:
+        tmax, tmin: Arrays of daily temperatures (°C)
+        crop_codes: Crop code per element, or a single code for all
+
+    Returns:
+        Array of daily GDD
+    """
+    base_temp = crop_registry.base_temp(crop_codes)
+    tmax = np.minimum(np.asarray(tmax, dtype=np.float64), 45)
+    tmin = np.maximum(np.asarray(tmin, dtype=np.float64), 0)
+
+    avg_temp = (tmax + tmin) / 2
+    return np.maximum(avg_temp - base_temp, 0)
+
+
+def calculate_et0_array(
+    temp_avg,
+    temp_max,
+    temp_min,
+    humidity,
+    wind_speed,
+    solar_radiation,
+    altitude=100,
+    decimals=2
+):
+    """
+    Vectorized FAO-56 calculate_et0. Missing values (None/NaN) take the
+    scalar version's defaults.
+
+    Args:
+        decimals: Rounding as in the scalar version; None for unrounded ET0
+
+    Returns:
+        Array of ET0 (mm/day)
+    """
+    temp_avg = _as_float_array(temp_avg, 30.0)
+    temp_max = _as_float_array(temp_max, 35.0)
+    temp_min = _as_float_array(temp_min, 25.0)
+    humidity = _as_float_array(humidity, 60.0)
+    wind_speed = _as_float_array(wind_speed, 2.0)
+    solar_radiation = _as_float_array(solar_radiation, 15.0)
+
+    es = 0.6108 * np.exp((17.27 * temp_avg) / (temp_avg + 237.3))
+    ea = es * (humidity / 100)
+
+    delta = (4098 * es) / ((temp_avg + 237.3) ** 2)
+    gamma = 0.665e-3 * (101.3 * ((293 - 0.0065 * altitude) / 293) ** 5.26)
+
+    Rn = solar_radiation * 0.77
+    G = 0
+
+    et0 = (
+        (0.408 * delta * (Rn - G) +
+         gamma * (900 / (temp_avg + 273)) *
+         wind_speed * (es - ea))
+        /
+        (delta + gamma * (1 + 0.34 * wind_speed))
+    )
+
+    et0 = np.maximum(et0, 0)
+    return et0 if decimals is None else np.round(et0, decimals)
+
+
+def calculate_etc_array(crop_codes, stage_codes, et0, decimals=2):
+    """
+    Vectorized calculate_etc.
+
+    Args:
+        crop_codes, stage_codes: Code per element (or single codes)
+        et0: Array of ET0 (mm/day)
+        decimals: Rounding as in the scalar version; None for unrounded ETc
+
+    Returns:
+        Tuple of (ETc array, Kc array)
+    """
+    kc = crop_registry.kc(crop_codes, stage_codes)
+    etc = np.asarray(et0, dtype=np.float64) * kc
+    return (etc if decimals is None else np.round(etc, decimals)), kc
+
+
 # ==========================================================
 # 9️⃣ EFFECTIVE RAINFALL
 # ==========================================================
@@ -0,0 +1,114 @@
+"""
+Irrigation Model Runtime Selection
+
+Serves the Bi-LSTM either through tf.keras (default) or through a TFLite
+interpreter running ml_models/irrigation_lstm.tflite, produced by
+export_irrigation_tflite.py. Select with IRRIGATION_RUNTIME=keras|tflite.
+
+The TFLite model has a fixed (None, 14, 9) float32 signature, so serving
+skips Keras' per-call data pipeline and tracing. The interpreter comes
+from the standalone LiteRT / tflite-runtime packages when installed, so
+the serving path does not need a full TensorFlow import.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+
+IRRIGATION_RUNTIME = os.getenv("IRRIGATION_RUNTIME", "keras").lower()
+IRRIGATION_KERAS_FILE = "irrigation_lstm.h5"
+IRRIGATION_TFLITE_FILE = "irrigation_lstm.tflite"
+# Threads per model call; the inference executor runs several calls at once
+INFERENCE_TF_THREADS = int(os.getenv("INFERENCE_TF_THREADS", "2"))
+
+
+def _tflite_interpreter_class():
+    """Lightest available TFLite interpreter implementation"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteIrrigationModel:
+    """
+    Keras-compatible predict() over a TFLite interpreter.
+    """
+
+    def __init__(self, model_path: Path, num_threads: int = INFERENCE_TF_THREADS):
+        interpreter_cls = _tflite_interpreter_class()
+        self.interpreter = interpreter_cls(model_path=str(model_path), num_threads=num_threads)
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = None
+        # One interpreter holds one set of tensors; invocations must not overlap
+        self._lock = threading.Lock()
+
+    def predict(self, inputs, verbose=0) -> np.ndarray:
+        """
+        Args:
+            inputs: (N, 14, 9) array, or {"input_layer": array} as passed to Keras
+
+        Returns:
+            (N, 2) raw model outputs
+        """
+        if isinstance(inputs, dict):
+            inputs = next(iter(inputs.values()))
+        batch = np.ascontiguousarray(inputs, dtype=np.float32)
+
+        with self._lock:
+            if batch.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input["index"], batch.shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = batch.shape[0]
+            self.interpreter.set_tensor(self._input["index"], batch)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self._output["index"]).copy()
+
+
+def load_keras_irrigation_model(model_dir: Path):
+    """The original tf.keras Bi-LSTM (also needed by the SHAP explainer)"""
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(INFERENCE_TF_THREADS)
+        tf.config.threading.set_inter_op_parallelism_threads(INFERENCE_TF_THREADS)
+    except RuntimeError:
+        # TensorFlow already initialized (e.g. a second model version); keeps its settings
+        pass
+    # Handle cross-version Keras saved model issues
+    try:
+        tf.keras.config.enable_unsafe_deserialization()
+    except AttributeError:
+        pass
+    return tf.keras.models.load_model(model_dir / IRRIGATION_KERAS_FILE, compile=False)
+
+
+def load_irrigation_model(model_dir: Path, runtime: str = IRRIGATION_RUNTIME):
+    """
+    Load the irrigation model for serving.
+
+    Args:
+        model_dir: Directory with the model artifacts
+        runtime: "keras" or "tflite"; tflite falls back to keras if the
+            exported model is missing
+
+    Returns:
+        Tuple of (model with a Keras-style predict(), runtime actually used)
+    """
+    if runtime == "tflite":
+        tflite_path = model_dir / IRRIGATION_TFLITE_FILE
+        if tflite_path.exists():
+            return TFLiteIrrigationModel(tflite_path), "tflite"
+        print(f"{IRRIGATION_TFLITE_FILE} not found (run export_irrigation_tflite.py); serving with Keras.")
+    return load_keras_irrigation_model(model_dir), "keras"
@@ -0,0 +1,84 @@
+"""
+Live Sensor Update Hub
+
+In-process pub/sub for accepted sensor readings. Ingestion publishes each
+reading; stream subscribers get their own bounded queue. A slow subscriber
+never blocks ingestion: when its queue is full the oldest reading is dropped.
+
+NOTE: In-process only. With multiple workers, a subscriber only sees
+readings ingested by the worker it is connected to.
+"""
+
+import asyncio
+from typing import Dict, Set, Any
+
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class SensorEventHub:
+    """
+    Fan-out of sensor readings to per-node subscriber queues.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, node_id: str) -> asyncio.Queue:
+        """
+        Register a subscriber for a sensor node.
+
+        Args:
+            node_id: Sensor node ID to follow
+
+        Returns:
+            Bounded queue that receives the node's readings
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(node_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, node_id: str, queue: asyncio.Queue) -> None:
+        """
+        Remove a subscriber queue.
+
+        Args:
+            node_id: Sensor node ID the queue was subscribed to
+            queue: Queue returned by subscribe()
+        """
+        queues = self._subscribers.get(node_id)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[node_id]
+
+    def publish(self, reading: Dict[str, Any]) -> None:
+        """
+        Deliver a reading to every subscriber of its node without blocking.
+
+        Args:
+            reading: Accepted sensor reading with sensor_node_id
+        """
+        queues = self._subscribers.get(reading.get("sensor_node_id"))
+        if not queues:
+            return
+
+        event = {k: v for k, v in reading.items() if k != "_id"}
+        for queue in queues:
+            if queue.full():
+                # Drop-oldest: the subscriber only cares about the freshest data
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(event)
+
+    def subscriber_count(self, node_id: str) -> int:
+        """Number of active subscribers for a node"""
+        return len(self._subscribers.get(node_id, ()))
+
+
+# Global hub instance
+sensor_event_hub = SensorEventHub()
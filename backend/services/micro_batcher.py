@@ -0,0 +1,123 @@
+"""
+Async Micro-Batcher
+
+Collects concurrent inference requests for a few milliseconds (or until
+the batch is full), runs one batched forward pass off the event loop and
+hands each awaiting coroutine its own result. Keras' per-call overhead
+dominates at batch size 1, so coalescing concurrent requests is close to free.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+class MicroBatcher:
+    """
+    Batches submit() calls into calls of batch_fn(items) -> results.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]], max_batch_size: int = 32,
+                 max_latency_ms: float = 5.0, name: str = "batcher",
+                 runner: Optional[Callable[..., Awaitable[Any]]] = None):
+        """
+        Args:
+            batch_fn: Blocking function mapping a list of items to a list of results (same order)
+            max_batch_size: Flush as soon as this many items are waiting
+            max_latency_ms: Flush this long after the first item of a batch arrived
+            name: Label used in logs and metrics
+            runner: Coroutine function runner(fn, items) executing a batch off
+                the event loop; defaults to the loop's default executor
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max(0.0, max_latency_ms) / 1000.0
+        self.name = name
+        self.runner = runner
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._batches = 0
+        self._items = 0
+        self._sizes: Counter = Counter()
+        self._max_wait_ms = 0.0
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one item and wait for its result from the next batch.
+
+        Raises:
+            Whatever batch_fn raised for the batch the item was in
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Callers that gave up while queued are dropped from the batch
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                continue
+            self._record(batch)
+
+            items = [item for item, _, _ in batch]
+            try:
+                if self.runner is not None:
+                    results = await self.runner(self.batch_fn, items)
+                else:
+                    results = await self._loop.run_in_executor(None, self.batch_fn, items)
+            except Exception as e:
+                print(f"{self.name}: batch of {len(items)} failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _record(self, batch: list) -> None:
+        now = time.perf_counter()
+        self._batches += 1
+        self._items += len(batch)
+        self._sizes[len(batch)] += 1
+        self._max_wait_ms = max(self._max_wait_ms, (now - batch[0][2]) * 1000)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batch fill statistics since startup"""
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "avg_fill_ratio": round(self._items / (self._batches * self.max_batch_size), 3) if self._batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._sizes.items())),
+            "max_queue_wait_ms": round(self._max_wait_ms, 2),
+            "queued": self._queue.qsize() if self._queue else 0
+        }
@@ -0,0 +1,228 @@
+"""
+Versioned Model Registry
+
+Published model sets live in ml_models/registry/<version>/, each with the
+same file layout as ml_models/ plus a manifest.json:
+
+    {
+        "version": "2026-10-19.1",
+        "created_at": "...",
+        "description": "...",
+        "files": {"pest_rf_model.pkl": {"sha256": "..."}, ...},
+        "features": {"pest_model": ["Crop_Type", ...], ...},
+        "encoders": {"crop_le.pkl": ["Cotton", ...], ...}
+    }
+
+registry/active.json points at the version being served and keeps the
+previously active versions for rollback. Installs without published
+versions serve the flat ml_models/ directory as version "legacy".
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import joblib
+
+
+MODEL_DIR = Path(__file__).resolve().parent.parent / "ml_models"
+MODEL_REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR", str(MODEL_DIR / "registry")))
+LEGACY_VERSION = "legacy"
+MANIFEST_FILE = "manifest.json"
+ACTIVE_FILE = "active.json"
+MAX_HISTORY = 20
+
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """
+    Published model versions and the active-version pointer.
+    """
+
+    def __init__(self, root: Path = MODEL_REGISTRY_DIR, legacy_dir: Path = MODEL_DIR):
+        self.root = Path(root)
+        self.legacy_dir = Path(legacy_dir)
+
+    def version_dir(self, version: str) -> Path:
+        """
+        Raises:
+            ValueError: version is not a valid version name
+        """
+        if version == LEGACY_VERSION:
+            return self.legacy_dir
+        if not _VERSION_PATTERN.match(version or ""):
+            raise ValueError(f"Invalid model version name: {version!r}")
+        return self.root / version
+
+    def exists(self, version: str) -> bool:
+        if version == LEGACY_VERSION:
+            return self.legacy_dir.is_dir()
+        return (self.version_dir(version) / MANIFEST_FILE).is_file()
+
+    def manifest(self, version: str) -> Optional[dict]:
+        """Manifest of a published version (None for legacy)"""
+        if version == LEGACY_VERSION:
+            return None
+        with open(self.version_dir(version) / MANIFEST_FILE) as f:
+            return json.load(f)
+
+    def versions(self) -> List[dict]:
+        """Published versions, oldest first, plus legacy"""
+        published = []
+        if self.root.is_dir():
+            for path in self.root.iterdir():
+                if (path / MANIFEST_FILE).is_file() and _VERSION_PATTERN.match(path.name):
+                    manifest = self.manifest(path.name)
+                    published.append({
+                        "version": path.name,
+                        "created_at": manifest.get("created_at"),
+                        "description": manifest.get("description", "")
+                    })
+        published.sort(key=lambda v: (v["created_at"] or "", v["version"]))
+        return [{"version": LEGACY_VERSION, "created_at": None, "description": "ml_models/ directory"}] + published
+
+    def verify(self, version: str, expected_features: Dict[str, List[str]]) -> Optional[dict]:
+        """
+        Check a version before loading it: files present with matching
+        checksums, feature order equal to what the service builds.
+
+        Returns:
+            The manifest (None for legacy)
+
+        Raises:
+            ValueError: describing every problem found
+        """
+        if not self.exists(version):
+            raise ValueError(f"Model version {version!r} not found")
+        manifest = self.manifest(version)
+        if manifest is None:
+            return None
+
+        problems = []
+        version_dir = self.version_dir(version)
+        for file_name, info in manifest.get("files", {}).items():
+            path = version_dir / file_name
+            if not path.is_file():
+                problems.append(f"{file_name}: missing")
+            elif file_sha256(path) != info.get("sha256"):
+                problems.append(f"{file_name}: checksum mismatch")
+        for model, features in manifest.get("features", {}).items():
+            if model in expected_features and features != expected_features[model]:
+                problems.append(f"{model}: feature order {features} != {expected_features[model]}")
+        if problems:
+            raise ValueError(f"Model version {version!r} failed verification: " + "; ".join(problems))
+        return manifest
+
+    # --- Active pointer ---
+
+    def _pointer(self) -> dict:
+        try:
+            with open(self.root / ACTIVE_FILE) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def active_version(self) -> str:
+        active = self._pointer().get("active")
+        return active if active and self.exists(active) else LEGACY_VERSION
+
+    def history(self) -> List[str]:
+        """Previously active versions, most recent last"""
+        return self._pointer().get("history", [])
+
+    def previous_version(self) -> Optional[str]:
+        available = [v for v in self.history() if self.exists(v)]
+        return available[-1] if available else None
+
+    def set_active(self, version: str, rollback: bool = False) -> None:
+        """
+        Point the registry at a version (atomic file replace).
+
+        Args:
+            version: Version now being served
+            rollback: Drop the version from history instead of pushing the
+                outgoing one, so repeated rollbacks walk further back
+        """
+        pointer = self._pointer()
+        current = pointer.get("active", LEGACY_VERSION)
+        history = pointer.get("history", [])
+        if rollback:
+            history = history[:-1] if history and history[-1] == version else history
+        elif current != version:
+            history = (history + [current])[-MAX_HISTORY:]
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(self.root / ACTIVE_FILE, {
+            "active": version,
+            "history": history,
+            "updated_at": datetime.now().isoformat()
+        })
+
+    # --- Publishing ---
+
+    def publish(self, version: str, source_dir: Path, files: Iterable[str],
+                features: Dict[str, List[str]], description: str = "") -> dict:
+        """
+        Copy model files into a new version directory with a manifest.
+        The directory appears atomically, fully written.
+
+        Raises:
+            ValueError: version exists or is invalid, or a file is missing
+        """
+        target = self.version_dir(version)
+        if version == LEGACY_VERSION or target.exists():
+            raise ValueError(f"Model version {version!r} already exists")
+        source_dir = Path(source_dir)
+        missing = [f for f in files if not (source_dir / f).is_file()]
+        if missing:
+            raise ValueError(f"Missing model files in {source_dir}: {', '.join(missing)}")
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.root, prefix=f".{version}."))
+        try:
+            manifest = {
+                "version": version,
+                "created_at": datetime.now().isoformat(),
+                "description": description,
+                "files": {},
+                "features": features,
+                "encoders": {}
+            }
+            for file_name in files:
+                shutil.copy2(source_dir / file_name, staging / file_name)
+                manifest["files"][file_name] = {"sha256": file_sha256(staging / file_name)}
+                if file_name.endswith("_le.pkl"):
+                    manifest["encoders"][file_name] = [str(c) for c in joblib.load(staging / file_name).classes_]
+            with open(staging / MANIFEST_FILE, "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return manifest
+
+
+# Global registry instance
+model_registry = ModelRegistry()
@@ -1,4 +1,18 @@
-from .irrigation_model import IrrigationModel
-from .nutrient_model import NutrientRecommendationModel
-from .pest_model import PestDiseasePredictionModel
-from .spraying_rules import SprayingDecisionEngine
+# Re-exports resolve on first access: the training classes pull in
+# TensorFlow / scikit-learn, which the rule engine import must not pay for.
+import importlib
+
+_EXPORTS = {
+    "IrrigationModel": ".irrigation_model",
+    "NutrientRecommendationModel": ".nutrient_model",
+    "PestDiseasePredictionModel": ".pest_model",
+    "SprayingDecisionEngine": ".spraying_rules",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
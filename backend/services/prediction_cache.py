@@ -0,0 +1,133 @@
+"""
+ML Prediction Cache
+
+Bounded LRU + TTL cache of model outputs keyed by the model, its loaded
+version and a hash of the quantized model input. The same field's 14-day
+window is scored by dashboard, chat, reasoning and transparency, and the
+nutrient / pest / phenology models see a handful of distinct rows, so
+repeated inference becomes a dictionary lookup.
+
+Inputs are rounded to PREDICTION_CACHE_DECIMALS before hashing, so rows
+differing only by float noise share an entry.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600"))
+PREDICTION_CACHE_DECIMALS = int(os.getenv("PREDICTION_CACHE_DECIMALS", "4"))
+
+
+def input_digest(model_input, decimals: int = PREDICTION_CACHE_DECIMALS) -> str:
+    """Hash of a numeric model input after rounding (shape included)"""
+    quantized = np.round(np.asarray(model_input, dtype=np.float64), decimals) + 0.0  # folds -0.0 into 0.0
+    digest = hashlib.blake2b(str(quantized.shape).encode(), digest_size=16)
+    digest.update(np.ascontiguousarray(quantized).tobytes())
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Thread-safe (inference runs in executor threads) LRU with per-entry expiry.
+    """
+
+    def __init__(self, max_entries: int = PREDICTION_CACHE_MAX_ENTRIES, ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def key(model: str, version: Optional[str], model_input) -> Tuple[str, str, str]:
+        return (model, version or "", input_digest(model_input))
+
+    def get(self, key: Tuple[str, str, str]) -> Tuple[bool, Any]:
+        """
+        Returns:
+            (True, value) on a hit, (False, None) on a miss or expired entry
+        """
+        model = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses[model] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits[model] += 1
+            return True, entry[1]
+
+    def put(self, key: Tuple[str, str, str], value: Any) -> None:
+        if isinstance(value, np.ndarray):
+            # Shared between callers; must not be modified in place
+            value.flags.writeable = False
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, model: str, version: Optional[str], model_input, compute: Callable[[], Any]) -> Any:
+        """
+        Cached result of compute() for this model version and input.
+        Exceptions from compute() propagate and are not cached.
+        """
+        key = self.key(model, version, model_input)
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self, model: Optional[str] = None) -> None:
+        """Drop every entry, or only those of one model"""
+        with self._lock:
+            if model is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == model]:
+                    del self._entries[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit rates per model since startup"""
+        with self._lock:
+            models = sorted(set(self._hits) | set(self._misses))
+            per_model = {}
+            for model in models:
+                lookups = self._hits[model] + self._misses[model]
+                per_model[model] = {
+                    "hits": self._hits[model],
+                    "misses": self._misses[model],
+                    "hit_rate": round(self._hits[model] / lookups, 3) if lookups else 0.0
+                }
+            hits, lookups = sum(self._hits.values()), sum(self._hits.values()) + sum(self._misses.values())
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "models": per_model
+            }
+
+
+# Global prediction cache instance
+prediction_cache = PredictionCache()
@@ -0,0 +1,277 @@
+"""
+Rolling-Window Sensor Aggregates
+
+Incrementally maintained min/max/avg per sensor node for the standard
+24h / 7d / 30d windows. Readings are folded into hour-level sub-buckets;
+each window keeps a sliding sum and count plus monotonic deques for
+min/max, so reads are O(1) and expiry is amortized O(1) per bucket.
+
+Windows are hour-aligned: a window covers the current (partial) hour and
+the preceding full hours up to its span.
+"""
+
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any
+
+from services.database import sensor_raw_collection
+from services.single_flight import SingleFlight
+from utils.helpers import parse_datetime
+
+
+BUCKET_SECONDS = 3600
+ROLLING_WINDOWS = {
+    "24h": 24 * 3600,
+    "7d": 7 * 86400,
+    "30d": 30 * 86400
+}
+ROLLING_METRICS = ["air_temp", "air_humidity", "soil_temp", "soil_moisture", "light_lux", "wind_speed"]
+_LONGEST_WINDOW = max(ROLLING_WINDOWS.values())
+
+
+def _bucket_start(dt: datetime) -> int:
+    """Epoch second of the hour bucket containing dt"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    ts = int(dt.timestamp())
+    return ts - ts % BUCKET_SECONDS
+
+
+class _WindowState:
+    """Sliding statistics for one window span across all metrics"""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.members: deque = deque()  # bucket starts currently inside the window
+        self.sums = {m: 0.0 for m in ROLLING_METRICS}
+        self.counts = {m: 0 for m in ROLLING_METRICS}
+        # Monotonic deques of (bucket_start, value): increasing for min, decreasing for max
+        self.min_q = {m: deque() for m in ROLLING_METRICS}
+        self.max_q = {m: deque() for m in ROLLING_METRICS}
+
+    def add(self, bucket: int, metric: str, total: float, count: int, low: float, high: float) -> None:
+        if not self.members or self.members[-1] != bucket:
+            self.members.append(bucket)
+        self.sums[metric] += total
+        self.counts[metric] += count
+
+        min_q = self.min_q[metric]
+        if not (min_q and min_q[-1][0] == bucket and min_q[-1][1] <= low):
+            while min_q and min_q[-1][1] >= low:
+                min_q.pop()
+            min_q.append((bucket, low))
+
+        max_q = self.max_q[metric]
+        if not (max_q and max_q[-1][0] == bucket and max_q[-1][1] >= high):
+            while max_q and max_q[-1][1] <= high:
+                max_q.pop()
+            max_q.append((bucket, high))
+
+    def expire(self, now_bucket: int, buckets: Dict[int, Dict[str, List[float]]]) -> None:
+        cutoff = now_bucket - self.span + BUCKET_SECONDS
+        while self.members and self.members[0] < cutoff:
+            old = self.members.popleft()
+            for metric, (total, count, _, _) in buckets.get(old, {}).items():
+                self.sums[metric] -= total
+                self.counts[metric] -= count
+        for metric in ROLLING_METRICS:
+            min_q, max_q = self.min_q[metric], self.max_q[metric]
+            while min_q and min_q[0][0] < cutoff:
+                min_q.popleft()
+            while max_q and max_q[0][0] < cutoff:
+                max_q.popleft()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for metric in ROLLING_METRICS:
+            count = self.counts[metric]
+            if count <= 0 or not self.min_q[metric]:
+                stats[metric] = {"min": 0, "max": 0, "avg": 0}
+                continue
+            stats[metric] = {
+                "min": self.min_q[metric][0][1],
+                "max": self.max_q[metric][0][1],
+                "avg": self.sums[metric] / count
+            }
+        return stats
+
+
+class _NodeStats:
+    """Hour buckets and window states for one sensor node"""
+
+    def __init__(self):
+        # bucket_start -> {metric: [sum, count, min, max]}, in ascending order
+        self.buckets: "OrderedDict[int, Dict[str, List[float]]]" = OrderedDict()
+        self.windows = {name: _WindowState(span) for name, span in ROLLING_WINDOWS.items()}
+        self.latest_bucket: Optional[int] = None
+
+    def add_bucket_totals(self, bucket: int, metric: str, total: float, count: int, low: float, high: float) -> None:
+        entry = self.buckets.setdefault(bucket, {})
+        if metric in entry:
+            cell = entry[metric]
+            cell[0] += total
+            cell[1] += count
+            cell[2] = min(cell[2], low)
+            cell[3] = max(cell[3], high)
+        else:
+            entry[metric] = [total, count, low, high]
+        for window in self.windows.values():
+            window.add(bucket, metric, total, count, low, high)
+        if self.latest_bucket is None or bucket > self.latest_bucket:
+            self.latest_bucket = bucket
+
+    def expire(self, now_bucket: int) -> None:
+        for window in self.windows.values():
+            window.expire(now_bucket, self.buckets)
+        cutoff = now_bucket - _LONGEST_WINDOW + BUCKET_SECONDS
+        while self.buckets:
+            oldest = next(iter(self.buckets))
+            if oldest >= cutoff:
+                break
+            self.buckets.popitem(last=False)
+
+
+class RollingAggregates:
+    """
+    Per-node rolling-window statistics, fed by ingestion and hydrated
+    from SensorRaw on first access.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, _NodeStats] = {}
+        self._loading: Dict[str, List[Dict[str, Any]]] = {}
+        # One hydration per node; concurrent first reads join it
+        self._hydration = SingleFlight()
+
+    def add_reading(self, reading: Dict[str, Any]) -> None:
+        """
+        Fold an accepted reading into its node's windows.
+
+        Nodes that have not been hydrated yet are skipped; hydration reads
+        the reading back from MongoDB. Out-of-order readings older than the
+        node's newest bucket invalidate the node so it rehydrates.
+
+        Args:
+            reading: Accepted sensor reading with sensor_node_id and timestamp
+        """
+        node_id = reading.get("sensor_node_id")
+        if node_id in self._loading:
+            self._loading[node_id].append(reading)
+            return
+
+        node = self._nodes.get(node_id)
+        if node is None:
+            return
+
+        dt = parse_datetime(str(reading.get("timestamp", "")))
+        if dt is None:
+            return
+        bucket = _bucket_start(dt)
+        if node.latest_bucket is not None and bucket < node.latest_bucket:
+            self.invalidate(node_id)
+            return
+
+        for metric in ROLLING_METRICS:
+            value = reading.get(metric)
+            if value is None:
+                continue
+            try:
+                value = float(value)
+            except (ValueError, TypeError):
+                continue
+            node.add_bucket_totals(bucket, metric, value, 1, value, value)
+
+    def invalidate(self, node_id: str) -> None:
+        """Drop a node's state so the next read rehydrates from MongoDB"""
+        self._nodes.pop(node_id, None)
+
+    async def get_window(self, node_id: str, window: str) -> Dict[str, Dict[str, float]]:
+        """
+        Get min/max/avg per metric for a standard window.
+
+        Args:
+            node_id: Sensor node ID
+            window: One of ROLLING_WINDOWS ("24h", "7d", "30d")
+
+        Returns:
+            {metric: {"min", "max", "avg"}}; zeros for metrics without data
+        """
+        node = self._nodes.get(node_id)
+        if node is None:
+            node = await self._hydration.do(node_id, lambda: self._hydrate(node_id))
+
+        node.expire(_bucket_start(datetime.now(timezone.utc)))
+        return node.windows[window].snapshot()
+
+    async def _hydrate(self, node_id: str) -> _NodeStats:
+        """Rebuild a node's hour buckets from the last 30 days of SensorRaw"""
+        self._loading[node_id] = []
+        try:
+            now = datetime.now(timezone.utc)
+            since = datetime.fromtimestamp(
+                _bucket_start(now) - _LONGEST_WINDOW + BUCKET_SECONDS, tz=timezone.utc
+            )
+
+            # Timestamps are stored as received, possibly with a UTC offset: parse
+            # them and group by UTC hour so hydration buckets like add_reading
+            group = {
+                "_id": {"$dateToString": {"format": "%Y-%m-%dT%H", "date": "$_ts"}},
+                "last_ts": {"$max": "$_ts"}
+            }
+            for metric in ROLLING_METRICS:
+                group[f"{metric}_sum"] = {"$sum": f"${metric}"}
+                group[f"{metric}_count"] = {"$sum": {"$cond": [{"$isNumber": f"${metric}"}, 1, 0]}}
+                group[f"{metric}_min"] = {"$min": f"${metric}"}
+                group[f"{metric}_max"] = {"$max": f"${metric}"}
+
+            cursor = sensor_raw_collection.aggregate([
+                # String prefilter widened by a day to cover offsets; exact cut on the parsed date
+                {"$match": {"sensor_node_id": node_id, "timestamp": {"$gte": (since - timedelta(days=1)).isoformat()}}},
+                {"$addFields": {"_ts": {"$dateFromString": {"dateString": "$timestamp", "onError": None}}}},
+                {"$match": {"_ts": {"$gte": since}}},
+                {"$group": group},
+                {"$sort": {"_id": 1}}
+            ])
+            rows = await cursor.to_list(length=None)
+
+            node = _NodeStats()
+            loaded_through = None
+            for row in rows:
+                try:
+                    hour = datetime.strptime(row["_id"], "%Y-%m-%dT%H").replace(tzinfo=timezone.utc)
+                except (TypeError, ValueError):
+                    continue
+                bucket = _bucket_start(hour)
+                for metric in ROLLING_METRICS:
+                    count = row.get(f"{metric}_count") or 0
+                    if count <= 0:
+                        continue
+                    node.add_bucket_totals(
+                        bucket, metric,
+                        float(row.get(f"{metric}_sum") or 0.0), int(count),
+                        float(row[f"{metric}_min"]), float(row[f"{metric}_max"])
+                    )
+                last_ts = row.get("last_ts")
+                if isinstance(last_ts, datetime):
+                    last_ts = last_ts.replace(tzinfo=timezone.utc) if last_ts.tzinfo is None else last_ts
+                    loaded_through = max(loaded_through, last_ts) if loaded_through else last_ts
+
+            self._nodes[node_id] = node
+        finally:
+            pending = self._loading.pop(node_id, [])
+
+        # Apply readings ingested while the aggregation was running
+        for reading in pending:
+            dt = parse_datetime(str(reading.get("timestamp", "")))
+            if dt is None:
+                continue
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            # MongoDB dates have millisecond precision
+            if loaded_through is None or dt.replace(microsecond=dt.microsecond // 1000 * 1000) > loaded_through:
+                self.add_reading(reading)
+        return node
+
+
+# Global instance
+rolling_aggregates = RollingAggregates()
@@ -0,0 +1,122 @@
+"""
+Sensor Last-Value Cache
+
+In-memory latest reading per sensor node, updated by the ingestion path
+so /sensors/current can be served without a MongoDB round-trip.
+"""
+
+from typing import Dict, List, Optional, Any
+from services.database import sensor_raw_collection
+
+
+class LastValueCache:
+    """
+    Latest accepted reading per sensor_node_id.
+    """
+
+    def __init__(self):
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+    def update(self, reading: Dict[str, Any]) -> None:
+        """
+        Store a reading if it is at least as new as the cached one.
+
+        Args:
+            reading: Accepted sensor reading (must include sensor_node_id and timestamp)
+        """
+        node_id = reading.get("sensor_node_id")
+        if not node_id:
+            return
+
+        current = self._latest.get(node_id)
+        if current and str(current.get("timestamp", "")) > str(reading.get("timestamp", "")):
+            # Late, out-of-order reading; keep the newer one
+            return
+
+        self._latest[node_id] = {k: v for k, v in reading.items() if k != "_id"}
+
+    def get(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached latest reading for a node.
+
+        Args:
+            node_id: Sensor node ID
+
+        Returns:
+            Latest reading if cached, None otherwise
+        """
+        return self._latest.get(node_id)
+
+    async def get_or_load(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest reading, falling back to MongoDB on a cold cache.
+
+        Args:
+            node_id: Sensor node ID
+
+        Returns:
+            Latest reading, or None if the node has never reported
+        """
+        cached = self._latest.get(node_id)
+        if cached is not None:
+            return cached
+
+        latest_row = await sensor_raw_collection.find_one(
+            {"sensor_node_id": node_id},
+            sort=[("timestamp", -1)]
+        )
+        if latest_row is None:
+            return None
+
+        self.update(latest_row)
+        return self._latest.get(node_id)
+
+    async def get_many_or_load(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latest readings for several nodes with at most one MongoDB query.
+
+        Cache misses are resolved together with a single $in + $group
+        aggregation and written back to the cache.
+
+        Args:
+            node_ids: Sensor node IDs
+
+        Returns:
+            Dictionary of node_id -> latest reading (nodes without data omitted)
+        """
+        results = {}
+        misses = []
+        for node_id in set(node_ids):
+            cached = self._latest.get(node_id)
+            if cached is not None:
+                results[node_id] = cached
+            else:
+                misses.append(node_id)
+
+        if misses:
+            cursor = sensor_raw_collection.aggregate([
+                {"$match": {"sensor_node_id": {"$in": misses}}},
+                {"$sort": {"sensor_node_id": 1, "timestamp": -1}},
+                {"$group": {"_id": "$sensor_node_id", "latest": {"$first": "$$ROOT"}}}
+            ])
+            for row in await cursor.to_list(length=len(misses)):
+                self.update(row["latest"])
+                results[row["_id"]] = self._latest.get(row["_id"])
+
+        return results
+
+    def clear(self, node_id: Optional[str] = None) -> None:
+        """
+        Clear cache entries.
+
+        Args:
+            node_id: If provided, clear only this node. Otherwise clear all.
+        """
+        if node_id:
+            self._latest.pop(node_id, None)
+        else:
+            self._latest.clear()
+
+
+# Global cache instance
+last_value_cache = LastValueCache()
@@ -0,0 +1,86 @@
+"""
+Sensor History Export
+
+Streams full-resolution SensorRaw history as NDJSON or CSV straight from
+a Motor cursor, so memory use stays constant regardless of the range.
+"""
+
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Optional
+
+from services.downsampling import SENSOR_METRICS
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+EXPORT_COLUMNS = ["timestamp", "sensor_node_id"] + SENSOR_METRICS
+
+# Documents fetched per round-trip and rows flushed per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+
+def resolve_export_columns(columns: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated column projection
+
+    Args:
+        columns: e.g. "air_temp,soil_moisture"; None exports every column
+
+    Returns:
+        Ordered column list, always starting with timestamp
+
+    Raises:
+        ValueError: If an unknown column is requested
+    """
+    if not columns:
+        return list(EXPORT_COLUMNS)
+
+    requested = [c.strip() for c in columns.split(",") if c.strip()]
+    unknown = [c for c in requested if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+
+    return ["timestamp"] + [c for c in requested if c != "timestamp"]
+
+
+async def stream_sensor_export(cursor, fmt: str, columns: List[str]) -> AsyncIterator[str]:
+    """
+    Serialize cursor documents to NDJSON or CSV in batched chunks
+
+    Args:
+        cursor: Motor cursor already projected to `columns` and sorted
+        fmt: "ndjson" or "csv"
+        columns: Columns to emit, in order
+
+    Yields:
+        Text chunks of up to EXPORT_BATCH_SIZE rows
+    """
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+
+    pending = 0
+    async for row in cursor:
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            record = {c: row.get(c) for c in columns}
+            buffer.write(json.dumps(record, default=str))
+            buffer.write("\n")
+
+        pending += 1
+        if pending >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    remainder = buffer.getvalue()
+    if remainder:
+        yield remainder
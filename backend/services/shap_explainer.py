@@ -11,9 +11,7 @@ class XAIExplainer:
         self.rf_pest_model = rf_pest_model
         
         self.lstm_explainer = None
-        if lstm_model is not None and background_data_lstm is not None:
-             # GradientExplainer is more stable for Recurrent layers in modern TF
-             self.lstm_explainer = shap.GradientExplainer(lstm_model, background_data_lstm)
+        self.set_lstm_model(lstm_model, background_data_lstm)
              
         self.rf_nutrient_explainer = None
         if rf_nutrient_model is not None:
@@ -25,6 +23,17 @@ class XAIExplainer:
         if rf_pest_model is not None:
              self.rf_pest_explainer = shap.TreeExplainer(rf_pest_model)
 
+    def set_lstm_model(self, lstm_model, background_data_lstm):
+        """
+        Attach the Keras LSTM after construction (the TFLite serving runtime
+        has no gradients, so the Keras model is loaded only for explanations).
+        """
+        if lstm_model is not None and background_data_lstm is not None:
+             # GradientExplainer is more stable for Recurrent layers in modern TF
+             self.lstm_explainer = shap.GradientExplainer(lstm_model, background_data_lstm)
+        # Set last: a non-None lstm_model means the explainer is ready
+        self.lstm_model = lstm_model
+
     def extract_top_features_lstm(self, input_data, feature_names):
         """
         Extract the top mathematically driving features from the LSTM model.
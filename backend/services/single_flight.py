@@ -0,0 +1,47 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent callers asking for the same key share one in-flight
+computation instead of each running it. The result is not cached once
+the computation finishes; the next call after that starts a new one.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Keyed de-duplication of concurrent coroutine calls.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for key, or join the run already in flight for key.
+
+        Args:
+            key: Identity of the computation (include a data version)
+            fn: Zero-argument coroutine factory
+
+        Returns:
+            The shared result; treat it as read-only
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # Shield so one caller disconnecting does not cancel the others' result
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def inflight_count(self) -> int:
+        """Number of computations currently running"""
+        return len(self._inflight)
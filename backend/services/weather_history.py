@@ -0,0 +1,166 @@
+"""
+Historical Daily Weather Store
+
+Daily max/min temperature per geo tile in the WeatherHistory collection.
+A background job back-fills it once from the OpenWeatherMap day summary
+API for every field's season; fields in the same tile share the rows. The
+agronomic engine reads pre-window days from here with one range query,
+so season-long GDD uses real temperatures with no network on the request path.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from models.schemas import FieldResponse
+from services.database import weather_history_collection
+from services.geocode_cache import geocode_cache, stored_user_coordinates
+from services.storage import load_json
+from services.weather_service import get_day_summary
+from utils.helpers import get_timestamp
+
+
+WEATHER_TILE_DEGREES = 0.25             # ~25 km; one set of API calls per tile
+WEATHER_HISTORY_CONCURRENCY = 5
+WEATHER_HISTORY_MAX_DAYS_PER_RUN = 500  # Spread large back-fills over runs (API quota)
+WEATHER_HISTORY_INTERVAL_HOURS = 6
+FALLBACK_LAT, FALLBACK_LON = 13.0827, 80.2707   # Chennai, as in the engine
+
+
+def weather_tile(lat: float, lon: float) -> str:
+    """Tile key for a coordinate: the tile's south-west corner"""
+    snap = lambda v: round((v // WEATHER_TILE_DEGREES) * WEATHER_TILE_DEGREES, 4)
+    return f"{snap(lat):.2f}_{snap(lon):.2f}"
+
+
+def tile_center(tile: str) -> Tuple[float, float]:
+    """Coordinate the tile's weather is fetched for"""
+    lat, lon = (float(v) for v in tile.split("_"))
+    half = WEATHER_TILE_DEGREES / 2
+    return lat + half, lon + half
+
+
+async def load_tile_temperatures(lat: float, lon: float, start_date: str, end_date: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Stored daily temperatures for a coordinate's tile over a date range.
+
+    Args:
+        lat, lon: Field coordinate
+        start_date, end_date: Inclusive YYYY-MM-DD bounds
+
+    Returns:
+        Dictionary of date -> (t_max, t_min) for the days that are stored
+    """
+    if start_date > end_date:
+        return {}
+    cursor = weather_history_collection.find(
+        {"tile": weather_tile(lat, lon), "date": {"$gte": start_date, "$lte": end_date}},
+        {"_id": 0, "date": 1, "t_max": 1, "t_min": 1}
+    )
+    return {doc["date"]: (doc["t_max"], doc["t_min"]) async for doc in cursor}
+
+
+async def _field_coordinates(field, users: dict) -> Tuple[float, float]:
+    """Same coordinate resolution as the engine: stored, geocoded, then fallback"""
+    farmer_user = users.get(field.farmer_id)
+    lat, lon = stored_user_coordinates(farmer_user)
+    if lat and lon:
+        return lat, lon
+    coords = await geocode_cache.resolve(farmer_user.get("location", "") if farmer_user else "")
+    if coords:
+        return coords["lat"], coords["lon"]
+    return FALLBACK_LAT, FALLBACK_LON
+
+
+async def _fetch_day(tile: str, date_str: str, semaphore: asyncio.Semaphore) -> Optional[dict]:
+    lat, lon = tile_center(tile)
+    async with semaphore:
+        try:
+            summary = await get_day_summary(lat, lon, date_str)
+            temperature = summary.get("temperature", {})
+            return {
+                "tile": tile,
+                "date": date_str,
+                "t_max": float(temperature["max"]),
+                "t_min": float(temperature["min"]),
+                "source": "openweathermap",
+                "fetched_at": get_timestamp()
+            }
+        except Exception as e:
+            print(f"Weather history fetch failed for {tile} {date_str}: {e}")
+            return None
+
+
+async def backfill_weather_history(max_days: int = WEATHER_HISTORY_MAX_DAYS_PER_RUN) -> int:
+    """
+    Fill missing tile/day rows covering every field from sowing up to the
+    engine's 14-day window. Existing rows are never refetched.
+
+    Args:
+        max_days: Cap on API calls for this run; the rest waits for the next
+
+    Returns:
+        Number of days stored
+    """
+    fields = [FieldResponse(**f) for f in load_json("fields.json").get("fields", [])]
+    users = {u.get("user_id"): u for u in load_json("users.json").get("users", [])}
+    window_start = (datetime.now() - timedelta(days=13)).strftime("%Y-%m-%d")
+
+    # tile -> earliest sowing date, and the fields that read it
+    tiles: Dict[str, str] = {}
+    tile_fields: Dict[str, list] = {}
+    for field in fields:
+        try:
+            datetime.strptime(field.sowing_date, "%Y-%m-%d")
+        except ValueError:
+            continue
+        tile = weather_tile(*await _field_coordinates(field, users))
+        tiles[tile] = min(tiles.get(tile, field.sowing_date), field.sowing_date)
+        tile_fields.setdefault(tile, []).append(field.field_id)
+
+    to_fetch = []
+    for tile, first_date in tiles.items():
+        cursor = weather_history_collection.find(
+            {"tile": tile, "date": {"$gte": first_date, "$lt": window_start}},
+            {"_id": 0, "date": 1}
+        )
+        stored = {doc["date"] async for doc in cursor}
+        day = datetime.strptime(first_date, "%Y-%m-%d")
+        while day.strftime("%Y-%m-%d") < window_start and len(to_fetch) < max_days:
+            date_str = day.strftime("%Y-%m-%d")
+            if date_str not in stored:
+                to_fetch.append((tile, date_str))
+            day += timedelta(days=1)
+
+    semaphore = asyncio.Semaphore(WEATHER_HISTORY_CONCURRENCY)
+    rows = await asyncio.gather(*(_fetch_day(tile, d, semaphore) for tile, d in to_fetch))
+    rows = [row for row in rows if row]
+
+    if rows:
+        await weather_history_collection.bulk_write([
+            UpdateOne({"tile": row["tile"], "date": row["date"]}, {"$set": row}, upsert=True)
+            for row in rows
+        ], ordered=False)
+    earliest: Dict[str, str] = {}
+    for row in rows:
+        earliest[row["tile"]] = min(earliest.get(row["tile"], row["date"]), row["date"])
+
+    # GDD checkpoints past a newly filled day were built from fallback temperatures
+    from services.agronomic_engine import invalidate_gdd_checkpoints
+    for tile, from_date in earliest.items():
+        for field_id in tile_fields[tile]:
+            await invalidate_gdd_checkpoints(field_id=field_id, from_date=from_date)
+
+    print(f"Weather history back-fill stored {len(rows)} of {len(to_fetch)} day(s).")
+    return len(rows)
+
+
+def schedule_weather_history_backfill(scheduler):
+    # First run right after startup, then periodically for new fields and new days
+    scheduler.add_job(
+        backfill_weather_history, 'interval', hours=WEATHER_HISTORY_INTERVAL_HOURS,
+        next_run_time=datetime.now()
+    )
+    print(f"Scheduled weather history back-fill every {WEATHER_HISTORY_INTERVAL_HOURS} hours.")
@@ -23,6 +23,45 @@ MAX_RETRIES = 3
 
 
 
+async def lookup_coordinates(location_name: str) -> Optional[Dict[str, float]]:
+    """
+    Look up coordinates (lat, lon) for a location name using OpenWeather Geocoding API.
+    
+    Args:
+        location_name: Name of the location (e.g. "Chennai", "Coimbatore, Tamil Nadu")
+        
+    Returns:
+        Dictionary with 'lat' and 'lon', or None if the API found no match
+    
+    Raises:
+        RuntimeError: If OPENWEATHERMAP_API_KEY is not set
+        httpx.HTTPError: On timeouts, connection failures and HTTP errors
+    """
+    if not OPENWEATHERMAP_API_KEY:
+        raise RuntimeError("OPENWEATHERMAP_API_KEY is not set")
+    
+    # Use direct geocoding API
+    url = "http://api.openweathermap.org/geo/1.0/direct"
+    params = {
+        "q": location_name,
+        "limit": 1,
+        "appid": OPENWEATHERMAP_API_KEY
+    }
+    
+    async with httpx.AsyncClient(timeout=OPENWEATHERMAP_TIMEOUT) as client:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        if data and len(data) > 0:
+            return {
+                "lat": data[0]["lat"],
+                "lon": data[0]["lon"],
+                "name": data[0].get("name", location_name)
+            }
+        return None
+
+
 async def get_coordinates(location_name: str) -> Optional[Dict[str, float]]:
     """
     Get coordinates (lat, lon) for a location name using OpenWeather Geocoding API.
@@ -31,30 +70,10 @@ async def get_coordinates(location_name: str) -> Optional[Dict[str, float]]:
         location_name: Name of the location (e.g. "Chennai", "Coimbatore, Tamil Nadu")
         
     Returns:
-        Dictionary with 'lat' and 'lon', or None if not found
+        Dictionary with 'lat' and 'lon', or None if not found or the lookup failed
     """
     try:
-        # Use direct geocoding API
-        url = "http://api.openweathermap.org/geo/1.0/direct"
-        params = {
-            "q": location_name,
-            "limit": 1,
-            "appid": OPENWEATHERMAP_API_KEY
-        }
-        
-        async with httpx.AsyncClient(timeout=OPENWEATHERMAP_TIMEOUT) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data and len(data) > 0:
-                return {
-                    "lat": data[0]["lat"],
-                    "lon": data[0]["lon"],
-                    "name": data[0].get("name", location_name)
-                }
-            return None
-            
+        return await lookup_coordinates(location_name)
     except Exception as e:
         print(f"Geocoding error for {location_name}: {e}")
         return None
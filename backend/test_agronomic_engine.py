@@ -0,0 +1,114 @@
+"""
+Checks for the read-only agronomic engine split (services/agronomic_engine.py):
+compute_telemetry_history writes nothing, and its pending writes and GDD
+checkpoint round-trip through persist_telemetry_history.
+
+Run with `python test_agronomic_engine.py` (or pytest) from backend/.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import services.agronomic_engine as engine_module
+from services.weather_history import weather_tile
+
+LAT, LON = 11.0, 77.0
+
+
+class _FakeTelemetry:
+    def __init__(self):
+        self.docs = {}
+        self.writes = 0
+
+    def find(self, query, projection=None):
+        docs = [dict(doc) for doc in self.docs.values() if doc["sensor_node_id"] == query["sensor_node_id"]]
+
+        class _Cursor:
+            async def to_list(self, length=None):
+                return docs[:length]
+
+        return _Cursor()
+
+    async def bulk_write(self, requests, ordered=True):
+        self.writes += 1
+        for op in requests:
+            key = (op._filter["sensor_node_id"], op._filter["date"])
+            doc = self.docs.setdefault(key, dict(op._filter))
+            doc.update(op._doc["$set"])
+
+
+class _FakeCheckpoints:
+    def __init__(self):
+        self.docs = []
+        self.writes = 0
+
+    async def find_one(self, query, sort=None):
+        matches = [
+            doc for doc in self.docs
+            if all(doc.get(k) == v for k, v in query.items() if k != "date") and doc["date"] < query["date"]["$lt"]
+        ]
+        return max(matches, key=lambda doc: doc["date"]) if matches else None
+
+    async def update_one(self, query, update, upsert=False):
+        self.writes += 1
+        self.docs = [doc for doc in self.docs if (doc["field_id"], doc["date"]) != (query["field_id"], query["date"])]
+        self.docs.append(dict(update["$set"]))
+
+
+def test_compute_is_read_only_and_persist_round_trips():
+    field = SimpleNamespace(
+        field_id="f1", sensor_node_id="node-1", crop="Rice", area_acres=1.0,
+        sowing_date=(datetime.now() - timedelta(days=40)).strftime("%Y-%m-%d")
+    )
+    telemetry, checkpoints = _FakeTelemetry(), _FakeCheckpoints()
+    weather_requests = []
+
+    async def no_weather(lat, lon, dates):
+        weather_requests.append(list(dates))
+        return {}
+
+    async def no_history(lat, lon, start_date, end_date):
+        return {}
+
+    originals = {name: getattr(engine_module, name) for name in (
+        "daily_telemetry_collection", "gdd_checkpoint_collection", "fetch_missing_weather", "load_tile_temperatures"
+    )}
+    engine_module.daily_telemetry_collection = telemetry
+    engine_module.gdd_checkpoint_collection = checkpoints
+    engine_module.fetch_missing_weather = no_weather
+    engine_module.load_tile_temperatures = no_history
+
+    async def scenario():
+        first = await engine_module.compute_telemetry_history(field, "Salem", LAT, LON)
+        assert telemetry.writes == 0 and checkpoints.writes == 0
+        await engine_module.persist_telemetry_history(field, first)
+        second = await engine_module.compute_telemetry_history(field, "Salem", LAT, LON)
+        return first, second
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        for name, value in originals.items():
+            setattr(engine_module, name, value)
+
+    # Only window days are requested from the weather API
+    assert all(len(dates) == 14 for dates in weather_requests)
+    assert len(first["history"]) == 14 and len(first["pending_writes"]) == 14
+    assert first["checkpoint"]["tile"] == weather_tile(LAT, LON)
+
+    assert telemetry.writes == 1 and len(telemetry.docs) == 14
+    assert checkpoints.docs[0]["date"] == first["checkpoint"]["date"]
+    assert checkpoints.docs[0]["cumulative_gdd"] == first["checkpoint"]["cumulative_gdd"]
+
+    # Resumed from the checkpoint, with nothing left to write
+    assert second["pending_writes"] == [] and second["checkpoint"] is None
+    assert second["cumulative_gdd"] == first["cumulative_gdd"]
+    assert second["history"] == first["history"]
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,87 @@
+"""
+Parity checks: CompiledForest vs scikit-learn predict / predict_proba.
+
+Run with `python test_compiled_forest.py` (or pytest) from backend/.
+"""
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from services.compiled_forest import CompiledForest
+
+MODEL_DIR = Path(__file__).parent / "ml_models"
+
+
+def _inputs(model, scale, n=4000, seed=3):
+    """Random rows plus rows that sit exactly on split thresholds"""
+    rng = np.random.default_rng(seed)
+    X = rng.random((n, len(scale))) * scale
+    estimators = getattr(model, "estimators_", [model])
+    splits = [(f, t) for e in estimators for f, t in zip(e.tree_.feature, e.tree_.threshold) if f >= 0]
+    for row, (feature, threshold) in zip(X, splits[:n // 2]):
+        row[feature] = threshold
+    return X
+
+
+def _assert_parity(model, X):
+    compiled = CompiledForest.from_sklearn(model)
+    expected = model.predict(X)
+    actual = compiled.predict(X)
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual, expected)
+    if hasattr(model, "predict_proba"):
+        assert np.array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    # Single rows take the same path as batches
+    assert np.array_equal(compiled.predict(X[0]), model.predict(X[:1]))
+
+
+def test_pest_forest_parity():
+    model = joblib.load(MODEL_DIR / "pest_rf_model.pkl")
+    X = _inputs(model, [5, 3, 3, 45, 100])
+    X[:, :3] = np.floor(X[:, :3])
+    _assert_parity(model, X)
+
+
+def test_phenology_tree_parity():
+    model = joblib.load(MODEL_DIR / "gdd_stage_model.pkl")
+    X = _inputs(model, [5, 4000])
+    X[:, 0] = np.floor(X[:, 0])
+    _assert_parity(model, X)
+
+
+def test_nutrient_style_regressors():
+    # Multi-output forest like nutrient_rf_model.pkl (N, P, K), plus single-output variants
+    rng = np.random.default_rng(5)
+    X = rng.random((2000, 3)) * [5, 3, 20]
+    Y = np.c_[X @ [3.0, 1.0, 2.0], X[:, 2] ** 2, np.sin(X[:, 0])]
+    for model in (RandomForestRegressor(n_estimators=40, random_state=0).fit(X, Y),
+                  RandomForestRegressor(n_estimators=15, random_state=0).fit(X, Y[:, 0]),
+                  DecisionTreeRegressor(random_state=0).fit(X, Y)):
+        _assert_parity(model, _inputs(model, [5, 3, 20]))
+
+
+def test_string_label_classifier():
+    rng = np.random.default_rng(6)
+    X = rng.random((1500, 4))
+    y = np.where(X[:, 0] + X[:, 1] > 1, "High", np.where(X[:, 2] > 0.5, "Medium", "Low"))
+    model = RandomForestClassifier(n_estimators=25, random_state=0).fit(X, y)
+    _assert_parity(model, _inputs(model, [1, 1, 1, 1]))
+
+
+def test_rejects_other_models():
+    try:
+        CompiledForest.from_sklearn(object())
+    except TypeError:
+        return
+    raise AssertionError("expected TypeError")
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
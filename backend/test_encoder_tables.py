@@ -0,0 +1,61 @@
+"""
+Parity checks: compiled EncoderTable lookups vs the fitted LabelEncoders.
+
+Run with `python test_encoder_tables.py` (or pytest) from backend/.
+"""
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from services.ai_pipeline_service import ai_pipeline
+from services.encoder_tables import EncoderTable
+
+MODEL_DIR = Path(__file__).parent / "ml_models"
+
+
+def _encoders():
+    return {path.name: joblib.load(path) for path in sorted(MODEL_DIR.glob("*_le.pkl"))}
+
+
+def test_encode_decode_parity():
+    for name, encoder in _encoders().items():
+        table = EncoderTable.from_encoder(encoder)
+        for label in encoder.classes_:
+            expected = int(encoder.transform([label])[0])
+            for variant in (label, label.lower(), label.upper(), f" {label} "):
+                assert table.encode(variant) == expected, (name, variant)
+            assert table.decode(expected) == encoder.inverse_transform([expected])[0]
+            assert table.decode(np.int64(expected)) == label
+
+
+def test_unknown_labels():
+    table = EncoderTable(["Cotton", "Rice"])
+    assert table.encode("Barley") is None
+    assert table.encode(None, default=0) == 0
+    assert "barley" not in table and "RICE" in table
+
+
+def test_service_pest_prediction_matches_sklearn_path():
+    encoders = _encoders()
+    for crop in encoders["pest_crop_le.pkl"].classes_:
+        for stage in encoders["pest_stage_le.pkl"].classes_:
+            for season in encoders["pest_season_le.pkl"].classes_:
+                row = [[
+                    encoders["pest_crop_le.pkl"].transform([crop])[0],
+                    encoders["pest_stage_le.pkl"].transform([stage])[0],
+                    encoders["pest_season_le.pkl"].transform([season])[0],
+                    31.0, 78.0
+                ]]
+                expected = encoders["pest_label_le.pkl"].inverse_transform(ai_pipeline.pest_model.predict(np.array(row)))[0]
+                risk, pest_input = ai_pipeline.predict_pests(crop.lower(), stage, season, 31.0, 78.0)
+                assert risk == expected
+                assert np.array_equal(pest_input, row)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,137 @@
+"""
+Checks for the materialized field state store (services/field_state_store.py)
+and the stale-only precompute pass in services/field_state.py.
+
+Run with `python test_field_state_store.py` (or pytest) from backend/.
+"""
+
+import asyncio
+
+import services.field_state as field_state_module
+import services.field_state_store as store_module
+from models.schemas import FieldResponse
+from services.field_state_store import field_state_version, is_fresh
+
+FIELDS = [
+    {"field_id": f"f{i}", "farmer_id": "u1", "name": f"Plot {i}", "crop": "Rice",
+     "sowing_date": "2026-06-01", "area_acres": 2.0, "sensor_node_id": f"node-{i}"}
+    for i in range(3)
+]
+
+
+class _FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = {doc["field_id"]: doc for doc in docs}
+        self.update_calls = []
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["field_id"])
+
+    def find(self, query, projection=None):
+        docs = list(self.docs.values())
+
+        class _Cursor:
+            def __aiter__(self):
+                return self._gen()
+
+            async def _gen(self):
+                for doc in docs:
+                    yield doc
+
+        return _Cursor()
+
+    async def update_many(self, query, update):
+        self.update_calls.append(query["sensor_node_id"])
+
+
+def _swap(module, **replacements):
+    originals = {name: getattr(module, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(module, name, value)
+    return originals
+
+
+def test_is_fresh():
+    doc = {"version": "v1", "computed_at": "2026-10-19T10:00:00+00:00"}
+    assert is_fresh(doc, "v1")
+    assert not is_fresh(doc, "v2") and not is_fresh(None, "v1")
+    assert is_fresh({**doc, "stale_at": "2026-10-19T09:59:00+00:00"}, "v1")
+    assert not is_fresh({**doc, "stale_at": "2026-10-19T10:00:01+00:00"}, "v1")
+
+
+def test_load_fresh_field_state():
+    field = FieldResponse(**FIELDS[0])
+    version = field_state_version(field, 11.6, 78.1)
+    fresh = {"field_id": "f0", "version": version, "computed_at": "2026-10-19T10:00:00+00:00"}
+    collection = _FakeCollection([fresh])
+    originals = _swap(store_module, field_state_collection=collection)
+    try:
+        assert asyncio.run(store_module.load_fresh_field_state(field, 11.6, 78.1)) is fresh
+        # Other coordinates are other settings
+        assert asyncio.run(store_module.load_fresh_field_state(field, 12.0, 78.1)) is None
+        fresh["stale_at"] = "2026-10-19T10:05:00+00:00"
+        assert asyncio.run(store_module.load_fresh_field_state(field, 11.6, 78.1)) is None
+    finally:
+        _swap(store_module, **originals)
+
+
+def test_mark_stale_writes_once_per_precompute_pass():
+    collection = _FakeCollection()
+    originals = _swap(store_module, field_state_collection=collection)
+    try:
+        store_module.reset_stale_marks()
+        for node in ("node-1", "node-1", "node-2", "node-1"):
+            asyncio.run(store_module.mark_field_states_stale(node))
+        assert collection.update_calls == ["node-1", "node-2"]
+        store_module.reset_stale_marks()
+        asyncio.run(store_module.mark_field_states_stale("node-1"))
+        assert collection.update_calls == ["node-1", "node-2", "node-1"]
+    finally:
+        store_module.reset_stale_marks()
+        _swap(store_module, **originals)
+
+
+def test_precompute_only_stale_skips_fresh_fields():
+    versions = {f["field_id"]: field_state_version(FieldResponse(**f)) for f in FIELDS}
+    stored = [
+        # f0: fresh; f1: a reading arrived after it was computed; f2: no state yet
+        {"field_id": "f0", "version": versions["f0"], "computed_at": "2026-10-19T10:00:00+00:00"},
+        {"field_id": "f1", "version": versions["f1"], "computed_at": "2026-10-19T10:00:00+00:00",
+         "stale_at": "2026-10-19T10:01:00+00:00"},
+    ]
+    enriched, saved = [], []
+
+    def fake_load_json(name):
+        return {"fields": FIELDS} if name == "fields.json" else {"users": [{"user_id": "u1", "location": "Salem"}]}
+
+    async def fake_enrich(field, farmer_location, lat=None, lon=None):
+        enriched.append(field.field_id)
+        return [], 0.0, "Vegetative"
+
+    async def fake_save(field, version, computed_at, state):
+        saved.append((field.field_id, version))
+
+    originals = _swap(
+        field_state_module,
+        load_json=fake_load_json,
+        field_state_collection=_FakeCollection(stored),
+        enrich_telemetry_history=fake_enrich,
+        save_field_state=fake_save,
+        build_dashboard_payload=lambda field, farmer_location, state: {}
+    )
+    try:
+        assert asyncio.run(field_state_module.precompute_field_states(only_stale=True)) == 2
+        assert enriched == ["f1", "f2"]
+        assert saved == [("f1", versions["f1"]), ("f2", versions["f2"])]
+        enriched.clear()
+        assert asyncio.run(field_state_module.precompute_field_states()) == 3
+        assert enriched == ["f0", "f1", "f2"]
+    finally:
+        _swap(field_state_module, **originals)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,86 @@
+"""
+Checks for the bounded inference executor (services/inference_executor.py).
+
+Run with `python test_inference_executor.py` (or pytest) from backend/.
+"""
+
+import asyncio
+import threading
+
+from services.inference_executor import (
+    InferenceExecutor,
+    InferenceOverloadedError,
+    InferenceTimeoutError,
+)
+
+
+def test_runs_off_the_event_loop():
+    executor = InferenceExecutor(max_workers=2, max_queue=4)
+    try:
+        main_thread = threading.get_ident()
+        result = asyncio.run(executor.run(lambda a, b=0: (a + b, threading.get_ident()), 1, b=2))
+        assert result[0] == 3 and result[1] != main_thread
+        assert executor.metrics()["completed"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_rejects_when_queue_full():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(executor.run(release.wait, timeout=None)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        try:
+            await executor.run(lambda: None)
+        except InferenceOverloadedError:
+            pass
+        else:
+            raise AssertionError("expected InferenceOverloadedError")
+        release.set()
+        await asyncio.gather(*blocked)
+
+    try:
+        asyncio.run(scenario())
+        metrics = executor.metrics()
+        assert metrics["rejected"] == 1 and metrics["max_pending_seen"] == 2
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_timeout_and_errors():
+    executor = InferenceExecutor(max_workers=1, max_queue=0, timeout_seconds=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        try:
+            await executor.run(release.wait)
+        except InferenceTimeoutError:
+            pass
+        else:
+            raise AssertionError("expected InferenceTimeoutError")
+        release.set()
+        await asyncio.sleep(0.05)
+        try:
+            await executor.run(lambda: 1 / 0)
+        except ZeroDivisionError:
+            pass
+        else:
+            raise AssertionError("expected ZeroDivisionError")
+
+    try:
+        asyncio.run(scenario())
+        metrics = executor.metrics()
+        assert metrics["timeouts"] == 1 and metrics["failed"] == 1 and metrics["pending"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
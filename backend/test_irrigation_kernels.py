@@ -0,0 +1,110 @@
+"""
+Parity checks: NumPy array kernels vs the scalar irrigation_logic functions.
+
+Run with `python test_irrigation_kernels.py` (or pytest) from backend/.
+"""
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from services.crop_registry import crop_registry
+from services.irrigation_logic import (
+    BASE_TEMP, GDD_THRESHOLDS,
+    calculate_daily_gdd, calculate_et0, calculate_etc, estimate_stage,
+    calculate_daily_gdd_array, calculate_et0_array, calculate_etc_array,
+    estimate_stage_array, encode_crops, encode_stages
+)
+
+N = 20000
+CROPS = list(BASE_TEMP) + ["barley"]  # barley: not in the registry, exercises defaults
+STAGES = sorted({stage for bands in GDD_THRESHOLDS.values() for _, _, stage in bands}) + ["unknown"]
+
+
+def _weather(seed=7):
+    rng = np.random.default_rng(seed)
+    temp_avg = rng.uniform(-5, 48, N)
+    return {
+        "temp_avg": temp_avg,
+        "temp_max": temp_avg + rng.uniform(0, 12, N),
+        "temp_min": temp_avg - rng.uniform(0, 12, N),
+        "humidity": rng.uniform(0, 100, N),
+        "wind_speed": rng.uniform(0, 15, N),
+        "solar_radiation": rng.uniform(0, 35, N),
+        "crops": rng.choice(CROPS, N),
+        "stages": rng.choice(STAGES, N)
+    }
+
+
+def test_daily_gdd_parity():
+    w = _weather()
+    expected = [calculate_daily_gdd(tx, tn, c) for tx, tn, c in zip(w["temp_max"], w["temp_min"], w["crops"])]
+    actual = calculate_daily_gdd_array(w["temp_max"], w["temp_min"], encode_crops(w["crops"]))
+    assert np.array_equal(actual, np.array(expected, dtype=np.float64))
+
+
+def test_daily_gdd_single_crop_code():
+    w = _weather(seed=8)
+    expected = [calculate_daily_gdd(tx, tn, "Wheat") for tx, tn in zip(w["temp_max"], w["temp_min"])]
+    actual = calculate_daily_gdd_array(w["temp_max"], w["temp_min"], encode_crops("Wheat")[0])
+    assert np.array_equal(actual, np.array(expected))
+
+
+def test_et0_parity():
+    w = _weather()
+    columns = [w[k] for k in ("temp_avg", "temp_max", "temp_min", "humidity", "wind_speed", "solar_radiation")]
+    expected = [calculate_et0(*row) for row in zip(*columns)]
+    assert np.array_equal(calculate_et0_array(*columns), np.array(expected))
+
+
+def test_et0_missing_values_use_defaults():
+    expected = calculate_et0(None, None, None, None, None, None)
+    actual = calculate_et0_array([None, np.nan], [None, np.nan], [None, np.nan],
+                                 [None, np.nan], [None, np.nan], [None, np.nan])
+    assert np.array_equal(actual, [expected, expected])
+
+
+def test_etc_parity():
+    w = _weather()
+    et0 = calculate_et0_array(w["temp_avg"], w["temp_max"], w["temp_min"],
+                              w["humidity"], w["wind_speed"], w["solar_radiation"])
+    expected = [calculate_etc(c, s, e) for c, s, e in zip(w["crops"], w["stages"], et0)]
+    etc, kc = calculate_etc_array(encode_crops(w["crops"]), encode_stages(w["stages"]), et0)
+    assert np.array_equal(etc, [e for e, _ in expected])
+    assert np.array_equal(kc, [k for _, k in expected])
+
+
+def _stage_by_band_loop(crop, cumulative_gdd):
+    # Reference: linear scan over the (lower, upper, stage) bands
+    for lower, upper, stage in GDD_THRESHOLDS.get(crop, []):
+        if lower <= cumulative_gdd < upper:
+            return stage
+    return "unknown"
+
+
+def test_stage_parity():
+    rng = np.random.default_rng(9)
+    for crop in CROPS:
+        gdd = np.concatenate([rng.uniform(-100, 6500, 2000), [0, 300, 500, 2000, 6000]])
+        expected = [_stage_by_band_loop(crop, g) for g in gdd]
+        codes = estimate_stage_array(encode_crops(crop)[0], gdd)
+        assert [crop_registry.stage_name(c) for c in codes] == expected
+        assert [estimate_stage(crop, g)[0] for g in gdd] == expected
+
+
+def test_crop_codes_match_ml_encoders():
+    model_dir = Path(__file__).parent / "ml_models"
+    for encoder_file in ("crop_le.pkl", "gdd_crop_le.pkl", "pest_crop_le.pkl"):
+        encoder = joblib.load(model_dir / encoder_file)
+        for ml_code, name in enumerate(encoder.classes_):
+            assert crop_registry.crop_code(name) == ml_code, (encoder_file, name)
+    stage_encoder = joblib.load(model_dir / "stage_le.pkl")
+    assert list(stage_encoder.classes_) == crop_registry.ml_stages
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,81 @@
+"""
+Checks for the async micro-batcher (services/micro_batcher.py).
+
+Run with `python test_micro_batcher.py` (or pytest) from backend/.
+"""
+
+import asyncio
+import time
+
+from services.micro_batcher import MicroBatcher
+
+
+def _doubling_batcher(batches, **kwargs):
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+    return MicroBatcher(batch_fn, **kwargs)
+
+
+def test_flushes_at_max_batch_size_with_results_in_order():
+    batches = []
+    # A latency window far longer than the test: only the size limit can flush
+    batcher = _doubling_batcher(batches, max_batch_size=4, max_latency_ms=10_000)
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), 5)
+
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+    assert time.perf_counter() - started < 5
+    assert results == [i * 2 for i in range(8)]
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert batcher.metrics()["batch_size_histogram"] == {4: 2}
+
+
+def test_flushes_after_max_latency():
+    batches = []
+    batcher = _doubling_batcher(batches, max_batch_size=32, max_latency_ms=20)
+
+    async def scenario():
+        started = time.perf_counter()
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == [2, 4] and batches == [[1, 2]]
+    assert 0.015 <= elapsed < 1.0
+
+
+def test_batch_exception_reaches_every_caller_in_the_batch():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        if "bad" in items:
+            raise ValueError("model failed")
+        return [f"ok:{item}" for item in items]
+
+    async def runner(fn, items):
+        # Same contract as inference_executor.run
+        return await asyncio.get_running_loop().run_in_executor(None, fn, items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_latency_ms=10_000, runner=runner)
+
+    async def scenario():
+        first = await asyncio.gather(*(batcher.submit(x) for x in ("a", "bad", "c")), return_exceptions=True)
+        # The worker survives a failed batch
+        second = await asyncio.gather(*(batcher.submit(x) for x in ("d", "e", "f")))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) and str(r) == "model failed" for r in first)
+    assert second == ["ok:d", "ok:e", "ok:f"]
+    assert calls == [["a", "bad", "c"], ["d", "e", "f"]]
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,79 @@
+"""
+Checks for the versioned model registry (services/model_registry.py).
+
+Run with `python test_model_registry.py` (or pytest) from backend/.
+"""
+
+import tempfile
+from pathlib import Path
+
+from services.model_registry import LEGACY_VERSION, ModelRegistry
+
+FEATURES = {"pest_model": ["Crop_Type", "Crop_Stage", "Season", "Temperature", "Humidity"]}
+MODEL_DIR = Path(__file__).parent / "ml_models"
+FILES = ["pest_rf_model.pkl", "pest_crop_le.pkl"]
+
+
+def _registry(tmp: str) -> ModelRegistry:
+    return ModelRegistry(root=Path(tmp) / "registry", legacy_dir=MODEL_DIR)
+
+
+def test_publish_and_verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = _registry(tmp)
+        manifest = registry.publish("v1", MODEL_DIR, FILES, FEATURES, "test")
+        assert set(manifest["files"]) == set(FILES)
+        assert manifest["encoders"]["pest_crop_le.pkl"][0] == "Cotton"
+        assert registry.verify("v1", FEATURES) == manifest
+        assert [v["version"] for v in registry.versions()] == [LEGACY_VERSION, "v1"]
+
+        for bad in (lambda: registry.publish("v1", MODEL_DIR, FILES, FEATURES),
+                    lambda: registry.publish("../escape", MODEL_DIR, FILES, FEATURES),
+                    lambda: registry.publish("v2", MODEL_DIR, ["missing.pkl"], FEATURES)):
+            try:
+                bad()
+            except ValueError:
+                continue
+            raise AssertionError("expected ValueError")
+
+
+def test_verify_rejects_tampering_and_feature_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = _registry(tmp)
+        registry.publish("v1", MODEL_DIR, FILES, FEATURES)
+        reordered = {"pest_model": list(reversed(FEATURES["pest_model"]))}
+        for expected_features, corrupt in ((reordered, False), (FEATURES, True)):
+            if corrupt:
+                with open(registry.version_dir("v1") / "pest_crop_le.pkl", "ab") as f:
+                    f.write(b"\0")
+            try:
+                registry.verify("v1", expected_features)
+            except ValueError as e:
+                assert ("checksum" if corrupt else "feature order") in str(e)
+                continue
+            raise AssertionError("expected ValueError")
+
+
+def test_active_pointer_and_rollback():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = _registry(tmp)
+        assert registry.active_version() == LEGACY_VERSION
+        assert registry.previous_version() is None
+        registry.publish("v1", MODEL_DIR, FILES, FEATURES)
+        registry.publish("v2", MODEL_DIR, FILES, FEATURES)
+
+        registry.set_active("v1")
+        registry.set_active("v2")
+        assert registry.active_version() == "v2"
+        assert registry.history() == [LEGACY_VERSION, "v1"]
+
+        registry.set_active(registry.previous_version(), rollback=True)
+        assert registry.active_version() == "v1"
+        assert registry.previous_version() == LEGACY_VERSION
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,70 @@
+"""
+Checks for the ML prediction cache (services/prediction_cache.py).
+
+Run with `python test_prediction_cache.py` (or pytest) from backend/.
+"""
+
+import time
+
+import numpy as np
+
+from services.prediction_cache import PredictionCache, input_digest
+
+
+def test_quantized_inputs_share_entries():
+    row = np.array([[3.0, 1.0, 31.2, 78.5]])
+    assert input_digest(row) == input_digest(row + 1e-7)
+    assert input_digest(row) != input_digest(row + 1e-3)
+    assert input_digest(np.zeros(4)) == input_digest(-np.zeros(4))
+    # Same values, different shape: different model input
+    assert input_digest(row) != input_digest(row.ravel())
+
+
+def test_hits_misses_and_versions():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60)
+    calls = []
+    compute = lambda: calls.append(1) or "High_Risk_Whitefly"
+
+    row = np.array([[4, 1, 0, 33.0, 71.0]])
+    assert cache.get_or_compute("pest_model", "v1", row, compute) == "High_Risk_Whitefly"
+    assert cache.get_or_compute("pest_model", "v1", row, compute) == "High_Risk_Whitefly"
+    assert len(calls) == 1
+    # A reloaded model file changes the version and misses
+    cache.get_or_compute("pest_model", "v2", row, compute)
+    assert len(calls) == 2
+
+    metrics = cache.metrics()["models"]["pest_model"]
+    assert (metrics["hits"], metrics["misses"], metrics["hit_rate"]) == (1, 2, 0.333)
+
+
+def test_lru_eviction_and_ttl():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    keys = [cache.key("gdd_model", "v1", np.array([[0, g]])) for g in (100, 200, 300)]
+    cache.put(keys[0], "Vegetative")
+    cache.put(keys[1], "Vegetative")
+    assert cache.get(keys[0])[0]  # keys[0] is now most recent
+    cache.put(keys[2], "Flowering")
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[0]) == (True, "Vegetative")
+    assert cache.metrics()["evictions"] == 1
+
+    short = PredictionCache(ttl_seconds=0.01)
+    short.put(keys[0], "Vegetative")
+    time.sleep(0.02)
+    assert short.get(keys[0]) == (False, None)
+    assert short.metrics()["expirations"] == 1
+
+
+def test_cached_arrays_are_read_only():
+    cache = PredictionCache()
+    key = cache.key("nutrient_model", "v1", np.array([[3, 1, 2.5]]))
+    cache.put(key, np.array([120.0, 60.0, 40.0]))
+    _, value = cache.get(key)
+    assert not value.flags.writeable
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,69 @@
+"""
+Checks for the rolling sensor aggregates (services/rolling_aggregates.py).
+
+Run with `python test_rolling_aggregates.py` (or pytest) from backend/.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import services.rolling_aggregates as rolling_module
+from services.rolling_aggregates import RollingAggregates
+
+
+class _GatedCollection:
+    """Stands in for sensor_raw_collection; aggregate() waits for release"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.release = asyncio.Event()
+        self.aggregate_calls = 0
+
+    def aggregate(self, pipeline):
+        self.aggregate_calls += 1
+        collection = self
+
+        class _Cursor:
+            async def to_list(self, length=None):
+                await collection.release.wait()
+                return list(collection.rows)
+
+        return _Cursor()
+
+
+def test_concurrent_first_reads_keep_buffered_readings():
+    now = datetime.now(timezone.utc)
+    hour = (now - timedelta(hours=2)).strftime("%Y-%m-%dT%H")
+    row = {
+        "_id": hour, "last_ts": datetime.strptime(f"{hour}:30", "%Y-%m-%dT%H:%M"),
+        "air_temp_sum": 60.0, "air_temp_count": 2, "air_temp_min": 20.0, "air_temp_max": 40.0
+    }
+
+    async def scenario():
+        collection = _GatedCollection([row])
+        original = rolling_module.sensor_raw_collection
+        rolling_module.sensor_raw_collection = collection
+        try:
+            aggregates = RollingAggregates()
+            first = asyncio.ensure_future(aggregates.get_window("node-1", "24h"))
+            second = asyncio.ensure_future(aggregates.get_window("node-1", "24h"))
+            # Ingest while the hydration aggregate is in flight
+            await asyncio.sleep(0.01)
+            aggregates.add_reading({"sensor_node_id": "node-1", "timestamp": now.isoformat(), "air_temp": 90.0})
+            collection.release.set()
+            results = await asyncio.gather(first, second)
+            return collection.aggregate_calls, results
+        finally:
+            rolling_module.sensor_raw_collection = original
+
+    aggregate_calls, results = asyncio.run(scenario())
+    assert aggregate_calls == 1
+    for stats in results:
+        assert stats["air_temp"] == {"min": 20.0, "max": 90.0, "avg": 50.0}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,101 @@
+"""
+Checks for request coalescing (services/single_flight.py) and its use in
+services/field_state.get_field_state.
+
+Run with `python test_single_flight.py` (or pytest) from backend/.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import services.field_state as field_state_module
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    runs = []
+
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute(key):
+            runs.append(key)
+            await release.wait()
+            return {"key": key}
+
+        waiters = [asyncio.ensure_future(flight.do("a", lambda: compute("a"))) for _ in range(5)]
+        other = asyncio.ensure_future(flight.do("b", lambda: compute("b")))
+        await asyncio.sleep(0)
+        assert flight.inflight_count() == 2
+        release.set()
+        results = await asyncio.gather(*waiters, other)
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+    assert sorted(runs) == ["a", "b"]
+    assert all(r is results[0] for r in results[:5]) and results[5] == {"key": "b"}
+    assert flight.inflight_count() == 0
+
+
+def test_failure_reaches_every_waiter_and_releases_the_key():
+    runs = []
+
+    async def scenario():
+        flight = SingleFlight()
+
+        async def failing():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("engine down")
+
+        outcomes = await asyncio.gather(
+            *(flight.do("a", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert flight.inflight_count() == 0
+
+        async def succeeding():
+            runs.append(2)
+            return "ok"
+
+        return outcomes, await flight.do("a", succeeding)
+
+    outcomes, retried = asyncio.run(scenario())
+    assert all(isinstance(o, RuntimeError) and str(o) == "engine down" for o in outcomes)
+    assert runs == [1, 2] and retried == "ok"
+
+
+def test_get_field_state_coalesces_on_data_version():
+    field = SimpleNamespace(
+        field_id="f1", crop="Rice", sowing_date="2026-06-01", area_acres=2.0, sensor_node_id="node-1"
+    )
+    calls = []
+
+    async def fake_compute(field, farmer_location, lat=None, lon=None):
+        calls.append((field.field_id, lat, lon))
+        await asyncio.sleep(0.01)
+        return {"history": [], "lat": lat}
+
+    async def scenario():
+        original = field_state_module.compute_field_state
+        field_state_module.compute_field_state = fake_compute
+        try:
+            same = await asyncio.gather(
+                *(field_state_module.get_field_state(field, "Salem", 11.6, 78.1) for _ in range(4))
+            )
+            moved = await field_state_module.get_field_state(field, "Salem", 12.0, 78.1)
+            return same, moved
+        finally:
+            field_state_module.compute_field_state = original
+
+    same, moved = asyncio.run(scenario())
+    assert all(s is same[0] for s in same) and moved["lat"] == 12.0
+    assert calls == [("f1", 11.6, 78.1), ("f1", 12.0, 78.1)]
+    assert field_state_module.field_state_flight.inflight_count() == 0
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -0,0 +1,47 @@
+"""
+Checks for the historical sensor query window (utils/helpers.parse_time_window).
+
+Run with `python test_time_window.py` (or pytest) from backend/.
+"""
+
+from datetime import datetime, timezone
+
+from utils.helpers import parse_time_window
+
+
+def test_offset_bounds_are_normalized_to_utc():
+    start, end = parse_time_window("24h", "2026-10-19T05:30:00+05:30", "2026-10-19T11:00:00+05:30")
+    assert start == datetime(2026, 10, 19, 0, 0, tzinfo=timezone.utc)
+    assert start.isoformat() == "2026-10-19T00:00:00+00:00"
+    assert end.isoformat() == "2026-10-19T05:30:00+00:00"
+
+
+def test_naive_and_zulu_bounds_are_utc():
+    start, end = parse_time_window("24h", "2026-10-18", "2026-10-19T00:00:00Z")
+    assert start.isoformat() == "2026-10-18T00:00:00+00:00"
+    assert end.isoformat() == "2026-10-19T00:00:00+00:00"
+
+
+def test_date_only_end_includes_the_whole_day():
+    start, end = parse_time_window("24h", "2026-10-19", "2026-10-19")
+    assert start.isoformat() == "2026-10-19T00:00:00+00:00"
+    assert end.isoformat() == "2026-10-19T23:59:59.999999+00:00"
+    assert start.isoformat() <= "2026-10-19T18:45:00+00:00" <= end.isoformat()
+
+
+def test_preset_and_invalid_bounds():
+    start, end = parse_time_window("7d", end="2026-10-19T05:30:00+05:30")
+    assert (end - start).days == 7 and start.utcoffset().total_seconds() == 0
+    for bad in (("24h", "yesterday", None), ("24h", "2026-10-19", "2026-10-18")):
+        try:
+            parse_time_window(*bad)
+        except ValueError:
+            continue
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
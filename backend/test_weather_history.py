@@ -0,0 +1,151 @@
+"""
+Checks for the historical daily weather store (services/weather_history.py)
+and the tile-scoped GDD checkpoints that read it.
+
+Run with `python test_weather_history.py` (or pytest) from backend/.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import services.agronomic_engine as engine_module
+import services.weather_history as history_module
+from services.weather_history import tile_center, weather_tile
+
+
+def _day(offset: int) -> str:
+    return (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+class _FakeHistoryCollection:
+    def __init__(self, rows=()):
+        self.rows = {(row["tile"], row["date"]): row for row in rows}
+        self.bulk_writes = []
+
+    def find(self, query, projection=None):
+        rows = [
+            row for (tile, date), row in self.rows.items()
+            if tile == query["tile"] and query["date"]["$gte"] <= date < query["date"]["$lt"]
+        ]
+
+        class _Cursor:
+            def __aiter__(self):
+                return self._gen()
+
+            async def _gen(self):
+                for row in rows:
+                    yield row
+
+        return _Cursor()
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes.append(len(requests))
+        for op in requests:
+            self.rows[(op._filter["tile"], op._filter["date"])] = op._doc["$set"]
+
+
+def _field(field_id, sowing_date, farmer_id):
+    return {"field_id": field_id, "farmer_id": farmer_id, "name": field_id, "crop": "Rice",
+            "sowing_date": sowing_date, "area_acres": 1.0, "sensor_node_id": f"node-{field_id}"}
+
+
+def _user(user_id, lat, lon):
+    return {"user_id": user_id, "location": "x", "geocoded_location": "x", "latitude": lat, "longitude": lon}
+
+
+def test_weather_tile_bucketing():
+    assert weather_tile(11.01, 76.96) == weather_tile(11.2, 76.9) == "11.00_76.75"
+    assert weather_tile(11.26, 76.96) == "11.25_76.75"
+    assert weather_tile(-0.1, -0.1) == "-0.25_-0.25"
+    assert tile_center("11.00_76.75") == (11.125, 76.875)
+
+
+def _run_backfill(collection, fields, users, max_days):
+    fetched, invalidated = [], []
+
+    def fake_load_json(name):
+        return {"fields": fields} if name == "fields.json" else {"users": users}
+
+    async def fake_day_summary(lat, lon, date_str):
+        fetched.append((weather_tile(lat, lon), date_str))
+        return {"temperature": {"max": 33.0, "min": 21.0}}
+
+    async def fake_invalidate(field_id=None, sensor_node_id=None, from_date=None):
+        invalidated.append((field_id, from_date))
+
+    originals = {
+        "load_json": history_module.load_json,
+        "weather_history_collection": history_module.weather_history_collection,
+        "get_day_summary": history_module.get_day_summary,
+    }
+    original_invalidate = engine_module.invalidate_gdd_checkpoints
+    history_module.load_json = fake_load_json
+    history_module.weather_history_collection = collection
+    history_module.get_day_summary = fake_day_summary
+    engine_module.invalidate_gdd_checkpoints = fake_invalidate
+    try:
+        stored = asyncio.run(history_module.backfill_weather_history(max_days=max_days))
+    finally:
+        for name, value in originals.items():
+            setattr(history_module, name, value)
+        engine_module.invalidate_gdd_checkpoints = original_invalidate
+    return stored, fetched, invalidated
+
+
+def test_backfill_shares_tiles_and_skips_stored_days():
+    tile = weather_tile(11.01, 76.96)
+    # Window starts 13 days ago: days 20..14 ago are pre-window; 17 ago is already stored
+    collection = _FakeHistoryCollection([{"tile": tile, "date": _day(17), "t_max": 30.0, "t_min": 20.0}])
+    fields = [_field("a", _day(18), "u1"), _field("b", _day(20), "u2"), _field("c", "not-a-date", "u1")]
+    users = [_user("u1", 11.01, 76.96), _user("u2", 11.2, 76.9)]
+
+    stored, fetched, invalidated = _run_backfill(collection, fields, users, max_days=500)
+
+    expected = [_day(d) for d in (20, 19, 18, 16, 15, 14)]
+    assert stored == 6 and sorted(d for _, d in fetched) == sorted(expected)
+    assert {t for t, _ in fetched} == {tile}
+    assert collection.bulk_writes == [6]
+    # Both fields read the tile; their checkpoints go from the earliest filled day
+    assert sorted(invalidated) == [("a", _day(20)), ("b", _day(20))]
+
+
+def test_backfill_respects_max_days():
+    collection = _FakeHistoryCollection()
+    fields = [_field("a", _day(40), "u1")]
+    stored, fetched, invalidated = _run_backfill(collection, fields, [_user("u1", 11.0, 77.0)], max_days=5)
+    assert stored == 5 and sorted(d for _, d in fetched) == [_day(d) for d in range(40, 35, -1)]
+    assert invalidated == [("a", _day(40))]
+
+    # Nothing missing: no fetch, no write, no invalidation
+    tile = weather_tile(11.0, 77.0)
+    complete = _FakeHistoryCollection([{"tile": tile, "date": _day(d)} for d in range(38, 13, -1)])
+    stored, fetched, invalidated = _run_backfill(
+        complete, [_field("a", _day(38), "u1")], [_user("u1", 11.0, 77.0)], max_days=3
+    )
+    assert stored == 0 and fetched == [] and invalidated == []
+
+
+def test_gdd_checkpoints_are_scoped_to_the_weather_tile():
+    queries = []
+
+    class _FakeCheckpoints:
+        async def find_one(self, query, sort=None):
+            queries.append(query)
+            return None
+
+    field = SimpleNamespace(field_id="a", crop="Rice", sowing_date="2026-06-01")
+    original = engine_module.gdd_checkpoint_collection
+    engine_module.gdd_checkpoint_collection = _FakeCheckpoints()
+    try:
+        asyncio.run(engine_module.load_gdd_checkpoint(field, "2026-10-01", "11.00_76.75"))
+    finally:
+        engine_module.gdd_checkpoint_collection = original
+    assert queries[0]["tile"] == "11.00_76.75"
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
@@ -32,6 +32,54 @@ def parse_time_range(range_str: str) -> tuple[datetime, datetime]:
     return start_time, end_time
 
 
+def parse_time_window(
+    range_str: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None
+) -> tuple[datetime, datetime]:
+    """
+    Resolve a query time window from explicit bounds or a range preset
+    
+    Args:
+        range_str: Fallback preset ("24h", "7d", "30d") when start is not given
+        start: Optional ISO start datetime or YYYY-MM-DD date
+        end: Optional ISO end datetime or YYYY-MM-DD date (defaults to now);
+            a date includes that whole day
+    
+    Returns:
+        Tuple of UTC (start_datetime, end_datetime)
+    
+    Raises:
+        ValueError: If a bound cannot be parsed or start is after end
+    """
+    preset_start, preset_end = parse_time_range(range_str)
+    
+    def _parse_bound(value: Optional[str], default: datetime, end_of_day: bool = False) -> datetime:
+        if not value:
+            return default
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"Invalid datetime: {value}")
+        if end_of_day and len(value.strip()) == 10:
+            # Date only: last instant of that day
+            parsed += timedelta(days=1, microseconds=-1)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        # Stored timestamps are UTC ISO strings compared lexically
+        return parsed.astimezone(timezone.utc)
+    
+    end_time = _parse_bound(end, preset_end, end_of_day=True)
+    if start:
+        start_time = _parse_bound(start, preset_start)
+    else:
+        start_time = end_time - (preset_end - preset_start)
+    
+    if start_time > end_time:
+        raise ValueError("start must be before end")
+    
+    return start_time, end_time
+
+
 def filter_by_date_range(data: list[dict], start: datetime, end: datetime) -> list[dict]:
     """
     Filter data by date range
@@ -5,6 +5,9 @@ import { TIME_RANGES } from '../../utils/constants';
 import LineChart from '../field/LineChart';
 import LoadingSpinner from '../common/LoadingSpinner';
 
+// Server-side downsampling keeps long ranges to a few hundred chart points
+const CHART_RESOLUTION = { resolution: 'bucket', max_points: 300 };
+
 const GraphsTab = ({ fieldId }) => {
   const { t } = useLanguage();
   const [timeRange, setTimeRange] = useState(TIME_RANGES.LAST_24H);
@@ -58,7 +61,7 @@ const GraphsTab = ({ fieldId }) => {
       let transformedData = [];
       
       try {
-        response = await sensorService.getHistoricalData(fieldId, timeRange);
+        response = await sensorService.getHistoricalData(fieldId, timeRange, CHART_RESOLUTION);
         transformedData = transformSensorData(response.data, timeRange);
       } catch (err) {
         console.error('Error fetching data for requested range:', err);
@@ -69,7 +72,7 @@ const GraphsTab = ({ fieldId }) => {
         const fallbackRanges = [TIME_RANGES.LAST_7D, TIME_RANGES.LAST_30D];
         for (const fallbackRange of fallbackRanges) {
           try {
-            const fallbackResponse = await sensorService.getHistoricalData(fieldId, fallbackRange);
+            const fallbackResponse = await sensorService.getHistoricalData(fieldId, fallbackRange, CHART_RESOLUTION);
             const fallbackData = transformSensorData(fallbackResponse.data, fallbackRange);
             if (fallbackData.length > 0) {
               transformedData = fallbackData;
@@ -16,11 +16,28 @@ const SensorDataTab = ({ fieldId, sensorNodeId }) => {
 
   useEffect(() => {
     fetchSensorData();
-    // Refresh data every 30 seconds
-    const interval = setInterval(fetchSensorData, 30000);
-    return () => clearInterval(interval);
+    // Live updates are pushed over SSE; slow polling is only a fallback
+    const unsubscribe = sensorService.subscribeToReadings(fieldId, applyReading);
+    const interval = setInterval(fetchSensorData, 120000);
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+    };
   }, [fieldId]);
 
+  const applyReading = (backendData) => {
+    setSensorData({
+      airTemperature: backendData.air_temp,
+      relativeHumidity: backendData.air_humidity,
+      soilMoisture: backendData.soil_moisture,
+      soilTemperature: backendData.soil_temp,
+      lightIntensity: backendData.light_lux,
+      windSpeed: backendData.wind_speed || null,
+    });
+    setLastUpdated(new Date(backendData.timestamp || Date.now()));
+    setLoading(false);
+  };
+
   const fetchSensorData = async () => {
     try {
       setError('');
@@ -30,18 +47,7 @@ const SensorDataTab = ({ fieldId, sensorNodeId }) => {
       }
       
       const response = await sensorService.getCurrentReadings(fieldId);
-      const backendData = response.data;
-      
-      setSensorData({
-        airTemperature: backendData.air_temp,
-        relativeHumidity: backendData.air_humidity,
-        soilMoisture: backendData.soil_moisture,
-        soilTemperature: backendData.soil_temp,
-        lightIntensity: backendData.light_lux,
-        windSpeed: backendData.wind_speed || null,
-      });
-      
-      setLastUpdated(new Date(backendData.timestamp || Date.now()));
+      applyReading(response.data);
     } catch (err) {
       // Only show error if we don't have existing data
       if (!sensorData) {
@@ -136,22 +136,35 @@ const DashboardPage = ({ demoMode = false }) => {
     }
   };
 
+  const mapSensorReading = (backendData) => {
+    // If we get an empty response or error, backendData might be null/empty
+    if (!backendData) return null;
+
+    return {
+      airTemperature: backendData.air_temp,
+      relativeHumidity: backendData.air_humidity,
+      soilMoisture: backendData.soil_moisture,
+      soilTemperature: backendData.soil_temp,
+      lightIntensity: backendData.light_lux,
+      windSpeed: backendData.wind_speed || null,
+    };
+  };
+
+  // One request for every field's latest readings instead of one per field
+  const fetchAllSensorData = async () => {
+    try {
+      const response = await sensorService.getAllCurrentReadings();
+      return response.data || {};
+    } catch (err) {
+      console.error('Failed to fetch sensor data:', err);
+      return {};
+    }
+  };
+
   const fetchSensorData = async (fieldId) => {
     try {
       const response = await sensorService.getCurrentReadings(fieldId);
-      const backendData = response.data;
-
-      // If we get an empty response or error, backendData might be null/empty
-      if (!backendData) return null;
-
-      return {
-        airTemperature: backendData.air_temp,
-        relativeHumidity: backendData.air_humidity,
-        soilMoisture: backendData.soil_moisture,
-        soilTemperature: backendData.soil_temp,
-        lightIntensity: backendData.light_lux,
-        windSpeed: backendData.wind_speed || null,
-      };
+      return mapSensorReading(response.data);
     } catch (err) {
       // If 404 (no data found), simply return null so UI shows "No Data"
       if (err.response && err.response.status === 404) {
@@ -270,14 +283,16 @@ const DashboardPage = ({ demoMode = false }) => {
         sensor_node_id: field.sensor_node_id, // Include sensor node ID from backend
       }));
 
-      // Fetch recommendations, weather alerts, and sensor data for each field
+      const readingsByField = await fetchAllSensorData();
+
+      // Fetch recommendations and weather alerts for each field
       const enrichedFields = await Promise.all(
         fieldsData.map(async (field) => {
-          const [recommendations, weatherAlerts, sensorData] = await Promise.all([
+          const [recommendations, weatherAlerts] = await Promise.all([
             fetchRecommendations(field.id),
             fetchWeatherAlerts(field.location || 'Tamil Nadu, India'),
-            fetchSensorData(field.id),
           ]);
+          const sensorData = mapSensorReading(readingsByField[field.id]);
 
           // Sort recommendations by priority (DO_NOW first, then WAIT, then MONITOR)
           const sortedRecommendations = recommendations.sort((a, b) => {
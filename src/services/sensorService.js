@@ -1,4 +1,5 @@
 import api from './api';
+import { API_BASE_URL } from '../utils/constants';
 
 export const sensorService = {
   getCurrentReadings: async (fieldId) => {
@@ -6,12 +7,29 @@ export const sensorService = {
     return api.get(`/fields/${fieldId}/sensors/current`);
   },
 
-  getHistoricalData: async (fieldId, timeRange) => {
-    // Placeholder API call
+  // Latest readings for all of the farmer's fields: { [fieldId]: reading | null }
+  getAllCurrentReadings: async () => {
+    return api.get('/fields/sensors/current');
+  },
+
+  getHistoricalData: async (fieldId, timeRange, options = {}) => {
+    // options: { resolution: 'raw' | 'bucket' | 'lttb', max_points, start, end }
     return api.get(`/fields/${fieldId}/sensors/historical`, {
-      params: { range: timeRange },
+      params: { range: timeRange, ...options },
     });
   },
+
+  // Live readings over Server-Sent Events. Returns a function that closes the stream.
+  subscribeToReadings: (fieldId, onReading, onError) => {
+    const token = localStorage.getItem('token');
+    const url = `${API_BASE_URL}/fields/${fieldId}/sensors/stream?token=${encodeURIComponent(token || '')}`;
+    const source = new EventSource(url);
+    source.addEventListener('reading', (event) => onReading(JSON.parse(event.data)));
+    if (onError) {
+      source.onerror = onError;
+    }
+    return () => source.close();
+  },
 };
 
 